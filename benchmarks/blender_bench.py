@@ -0,0 +1,255 @@
+"""
+Headless export benchmark. Runs inside Blender:
+
+    blender --factory-startup -b --python benchmarks/blender_bench.py -- --name small --results results.jsonl
+
+Generates a synthetic scene (unique meshes split between the main file and linked
+libraries, instances, materials, textures and lights), exports it with
+mavhod_tool.export_execute and mavhod_tool.export_light_execute, and appends one
+JSON line with throughput and peak RSS to the results file.
+"""
+import bpy
+import bmesh
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import resource
+import platform
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+import mavhod_blender_addon
+from mavhod_blender_addon import export_scene, godot_variant
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Mavhod export benchmark (run inside Blender)")
+    parser.add_argument("--name", default="default", help="Scenario name stored with the results")
+    parser.add_argument("--unique-meshes", type=int, default=50)
+    parser.add_argument("--instances", type=int, default=2000)
+    parser.add_argument("--libraries", type=int, default=2, help="Linked .blend files holding part of the unique meshes")
+    parser.add_argument("--linked-fraction", type=float, default=0.5, help="Share of unique meshes stored in libraries")
+    parser.add_argument("--materials", type=int, default=10)
+    parser.add_argument("--textures", type=int, default=10)
+    parser.add_argument("--texture-size", type=int, default=256)
+    parser.add_argument("--lights", type=int, default=100)
+    parser.add_argument("--subdivisions", type=int, default=2, help="Icosphere subdivisions of every unique mesh")
+    parser.add_argument("--object-ext", default=".gltf")
+    parser.add_argument("--scene-ext", default=".json")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--passes", type=int, default=2, help="Export passes; later passes measure the incremental path")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--work-dir", help="Directory for the generated scene and output (default: temporary)")
+    parser.add_argument("--results", default=os.path.join(REPO_ROOT, "benchmarks", "results.jsonl"))
+    return parser.parse_args(argv)
+
+def make_textures(args, texture_dir):
+    os.makedirs(texture_dir, exist_ok=True)
+    rng = random.Random(args.seed)
+    images = []
+    for i in range(args.textures):
+        img = bpy.data.images.new(f"bench_tex_{i}", args.texture_size, args.texture_size)
+        img.generated_color = (rng.random(), rng.random(), rng.random(), 1.0)
+        img.filepath_raw = os.path.join(texture_dir, f"bench_tex_{i}.png")
+        img.file_format = 'PNG'
+        img.save()
+        images.append(img)
+    return images
+
+def make_materials(args, images):
+    materials = []
+    for i in range(args.materials):
+        mat = bpy.data.materials.new(f"bench_mat_{i}")
+        mat.use_nodes = True
+        if images:
+            nodes = mat.node_tree.nodes
+            tex = nodes.new('ShaderNodeTexImage')
+            tex.image = images[i % len(images)]
+            bsdf = nodes.get("Principled BSDF")
+            if bsdf:
+                mat.node_tree.links.new(tex.outputs['Color'], bsdf.inputs['Base Color'])
+        materials.append(mat)
+    return materials
+
+def make_mesh(name, args, material):
+    mesh = bpy.data.meshes.new(name)
+    bm = bmesh.new()
+    bmesh.ops.create_icosphere(bm, subdivisions=args.subdivisions, radius=1.0)
+    bm.to_mesh(mesh)
+    bm.free()
+    if material:
+        mesh.materials.append(material)
+    return mesh
+
+def make_libraries(args, materials, lib_dir):
+    """
+    Write libraries/lib_<n>.blend with the linked share of the unique meshes, then link the meshes.
+    Each mesh gets an object in the library scene: the export workers open the library and
+    select the object using the mesh.
+    """
+    os.makedirs(lib_dir, exist_ok=True)
+    linked_count = int(args.unique_meshes * args.linked_fraction) if args.libraries > 0 else 0
+    meshes = []
+    for lib_index in range(args.libraries):
+        names = [f"bench_lib{lib_index}_mesh_{i}" for i in range(lib_index, linked_count, args.libraries)]
+        if not names: continue
+        lib_meshes = {
+            make_mesh(name, args, materials[i % len(materials)] if materials else None)
+            for i, name in enumerate(names)
+        }
+        lib_scene = bpy.data.scenes.new(f"bench_lib{lib_index}")
+        lib_objects = [bpy.data.objects.new(mesh.name, mesh) for mesh in lib_meshes]
+        for obj in lib_objects:
+            lib_scene.collection.objects.link(obj)
+        lib_path = os.path.join(lib_dir, f"lib_{lib_index}.blend")
+        bpy.data.libraries.write(lib_path, {lib_scene}, fake_user=True)
+        bpy.data.scenes.remove(lib_scene)
+        for obj in lib_objects:
+            bpy.data.objects.remove(obj)
+        for mesh in lib_meshes:
+            bpy.data.meshes.remove(mesh)
+        with bpy.data.libraries.load(lib_path, link=True) as (data_from, data_to):
+            data_to.meshes = [name for name in data_from.meshes if name in names]
+        meshes.extend(data_to.meshes)
+    return meshes, linked_count
+
+def make_scene(args, work_dir):
+    images = make_textures(args, os.path.join(work_dir, "textures"))
+    materials = make_materials(args, images)
+    linked_meshes, linked_count = make_libraries(args, materials, os.path.join(work_dir, "libs"))
+    local_meshes = [
+        make_mesh(f"bench_mesh_{i}", args, materials[i % len(materials)] if materials else None)
+        for i in range(args.unique_meshes - linked_count)
+    ]
+    meshes = linked_meshes + local_meshes
+    rng = random.Random(args.seed)
+    collection = bpy.context.scene.collection
+    for i in range(args.instances):
+        obj = bpy.data.objects.new(f"bench_obj_{i}", meshes[i % len(meshes)])
+        obj.location = (rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(0, 20))
+        obj.rotation_euler = (0.0, 0.0, rng.uniform(0, 6.283))
+        obj.scale = (rng.uniform(0.5, 2.0),) * 3
+        collection.objects.link(obj)
+    for i in range(args.lights):
+        light = bpy.data.lights.new(f"bench_light_{i}", rng.choice(['POINT', 'SPOT', 'SUN', 'AREA']))
+        light.energy = rng.uniform(10, 1000)
+        obj = bpy.data.objects.new(f"bench_light_{i}", light)
+        obj.location = (rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(2, 30))
+        collection.objects.link(obj)
+    blend_path = os.path.join(work_dir, "scene.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=blend_path)
+    return blend_path
+
+def configure(args):
+    props = bpy.context.scene.MavhodToolProps
+    props.object_extension = args.object_ext
+    props.scene_extension = args.scene_ext
+    props.export_worker_count = args.workers
+    props.export_local_shards = args.shards
+    props.path_pairs.clear()
+    pair = props.path_pairs.add()
+    pair.source_path = "libs"
+    pair.dest_path = "model"
+
+def select(object_type):
+    for obj in bpy.context.scene.objects:
+        obj.select_set(obj.type == object_type)
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+def check_export(result, scene_path):
+    """Exit with an error if the export did not finish or an instance points at a missing asset"""
+    if result != {'FINISHED'}:
+        sys.exit(f"Export of {scene_path} returned {sorted(result)}")
+    if scene_path.endswith(".dbin"):
+        with open(scene_path, 'rb') as f:
+            scene = godot_variant.bytes_to_var(f.read())
+    else:
+        with open(scene_path, 'r', encoding='utf-8') as f:
+            scene = json.load(f)
+    scene_dir = os.path.dirname(scene_path)
+    missing = sorted({
+        instance["asset_path"] for instance in scene["instances"]
+        if not os.path.isfile(os.path.join(scene_dir, instance["asset_path"]))
+    })
+    if missing:
+        sys.exit(f"{len(missing)} asset(s) failed to export, e.g. {missing[0]}")
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "-C", REPO_ROOT, "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    args = parse_args()
+    mavhod_blender_addon.register()
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="mavhod_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    make_scene(args, work_dir)
+    generate_seconds = time.perf_counter() - start
+    configure(args)
+
+    out_dir = os.path.join(work_dir, "out")
+    passes = []
+    for pass_index in range(args.passes):
+        select('MESH')
+        before = directory_size(out_dir) if os.path.isdir(out_dir) else 0
+        start = time.perf_counter()
+        scene_path = os.path.join(out_dir, "level" + args.scene_ext)
+        result = bpy.ops.mavhod_tool.export_execute('EXEC_DEFAULT', filepath=scene_path)
+        seconds = time.perf_counter() - start
+        check_export(result, scene_path)
+        written = max(directory_size(out_dir) - before, 0) if pass_index else directory_size(out_dir)
+        passes.append({
+            "pass": pass_index + 1,
+            "result": sorted(result),
+            "seconds": round(seconds, 4),
+            "instances_per_s": round(args.instances / seconds, 1) if seconds else None,
+            "output_mb": round(directory_size(out_dir) / (1024 * 1024), 3),
+            "mb_per_s": round(written / (1024 * 1024) / seconds, 3) if seconds else None
+        })
+        print(f"Pass {pass_index + 1}: {seconds:.2f} s, {passes[-1]['instances_per_s']} instances/s")
+
+    select('LIGHT')
+    start = time.perf_counter()
+    bpy.ops.mavhod_tool.export_light_execute('EXEC_DEFAULT', filepath=os.path.join(out_dir, "lights" + args.scene_ext))
+    light_seconds = time.perf_counter() - start
+
+    # Close the background workers so their peak RSS is included in RUSAGE_CHILDREN
+    export_scene.shutdown_worker_pool()
+    record = {
+        "name": args.name,
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "blender": bpy.app.version_string,
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key not in {"results", "work_dir"}},
+        "generate_seconds": round(generate_seconds, 3),
+        "passes": passes,
+        "light_seconds": round(light_seconds, 4),
+        "lights_per_s": round(args.lights / light_seconds, 1) if light_seconds else None,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+    with open(args.results, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Results appended to {args.results}")
+
+if __name__ == "__main__":
+    main()
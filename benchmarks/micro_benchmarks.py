@@ -0,0 +1,228 @@
+"""
+Micro-benchmarks of the export helpers that run without Blender:
+patch_gltf_output, get_robust_relpath (with and without PathResolver), the path-pair
+mapping behind _get_dst_path (PathMapper) and the glTF geometry pass (needs numpy).
+With the bpy module installed (pip install bpy), it also compares the batched Z-up to
+Y-up transform conversion with the per-object one for 10k and 100k matrices.
+
+    python benchmarks/micro_benchmarks.py [--nodes 20000] [--results results.jsonl]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import copy
+import random
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "mavhod_blender_addon"))
+import export_core
+import export_geometry
+try:
+    import mathutils
+    import export_utils
+except ImportError:
+    # export_utils imports Blender
+    export_utils = None
+
+def best_of(func, repeat):
+    """Best wall time of repeat calls (seconds)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def make_gltf(node_count):
+    """Synthetic glTF JSON with transformed nodes, hashed material names and extras"""
+    return {
+        "asset": {"version": "2.0"},
+        "scenes": [{"nodes": list(range(node_count)), "extras": {"level": 1}}],
+        "nodes": [
+            {"name": f"node_{i}", "mesh": i % 100, "translation": [i, 0, 0], "rotation": [0, 0, 0, 1], "extras": {"id": i}}
+            for i in range(node_count)
+        ],
+        "meshes": [{"name": f"mesh_{i}", "primitives": [{"attributes": {"POSITION": 0}, "material": i}], "extras": {"lod": 0}} for i in range(100)],
+        "materials": [{"name": f"mat_{i}_hashed", "extras": {"rough": 0.5}} for i in range(100)],
+    }
+
+def bench_patch(work_dir, node_count, repeat):
+    metadata = {'node': False, 'mesh': False, 'material': False, 'scene': False}
+    source = json.dumps(make_gltf(node_count), indent=4)
+    path = os.path.join(work_dir, "asset.gltf")
+    results = {}
+    for compact in (False, True):
+        label = "compact" if compact else "indented"
+        def fresh():
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(source)
+            export_core.patch_gltf_output(path, metadata, {}, ".gltf", compact=compact)
+        results[f"patch_gltf_output ({label}, changed)"] = best_of(fresh, repeat)
+        # The file is now patched: a second run finds nothing to change
+        results[f"patch_gltf_output ({label}, unchanged)"] = best_of(
+            lambda: export_core.patch_gltf_output(path, metadata, {}, ".gltf", compact=compact), repeat
+        )
+    return results
+
+def bench_paths(work_dir, path_count, pair_count, repeat):
+    sources = []
+    for i in range(pair_count):
+        source = os.path.join(work_dir, "src", f"theme_{i:03d}")
+        os.makedirs(source, exist_ok=True)
+        sources.append(source)
+    path_pairs = sorted(
+        ({'source_path': source, 'dest_path': f"model/theme_{i:03d}"} for i, source in enumerate(sources)),
+        key=lambda pair: pair['source_path'], reverse=True
+    )
+    targets = [os.path.join(sources[i % pair_count], f"asset_{i}.gltf") for i in range(path_count)]
+    scene_dir = os.path.join(work_dir, "level")
+    return {
+        f"get_robust_relpath x{path_count}": best_of(
+            lambda: [export_core.get_robust_relpath(target, scene_dir) for target in targets], repeat
+        ),
+        f"PathMapper.map x{path_count} ({pair_count} pairs, cold)": best_of(
+            lambda: [mapper.map(target) for mapper in [export_core.PathMapper(path_pairs, scene_dir)] for target in targets],
+            repeat
+        ),
+        # Instances share assets: every asset path is looked up 10 times per run
+        f"get_robust_relpath x{path_count} (PathResolver, 10% distinct)": best_of(
+            lambda: resolve_with_resolver(targets[:max(1, path_count // 10)] * 10, scene_dir), repeat
+        ),
+    }
+
+def resolve_with_resolver(targets, scene_dir):
+    export_core.set_active_resolver(export_core.PathResolver())
+    try:
+        return [export_core.get_robust_relpath(target, scene_dir) for target in targets]
+    finally:
+        export_core.set_active_resolver(None)
+
+def make_grid_gltf(triangle_count):
+    """Synthetic glTF of a grid exported without shared vertices (one vertex per corner), triangles shuffled"""
+    size = max(1, int((triangle_count / 2) ** 0.5))
+    grid = np.arange((size + 1) ** 2).reshape(size + 1, size + 1)
+    quads = np.stack([grid[:-1, :-1], grid[1:, :-1], grid[:-1, 1:], grid[1:, 1:]], axis=-1).reshape(-1, 4)
+    triangles = np.concatenate([quads[:, [0, 1, 2]], quads[:, [2, 1, 3]]])
+    triangles = triangles[np.random.default_rng(0).permutation(len(triangles))]
+    corners = triangles.ravel()
+    xs, zs = np.meshgrid(np.linspace(0, 1, size + 1), np.linspace(0, 1, size + 1))
+    uvs = np.stack([xs.ravel(), zs.ravel()], axis=1).astype(np.float32)[corners]
+    positions = np.stack([xs.ravel() * 10, np.zeros(xs.size), zs.ravel() * 10], axis=1).astype(np.float32)[corners]
+    normals = np.tile(np.array([0, 1, 0], np.float32), (len(corners), 1))
+    indices = np.arange(len(corners), dtype=np.uint32)
+    arrays = [positions, normals, uvs, indices]
+    views, offset = [], 0
+    for values in arrays:
+        views.append({"buffer": 0, "byteOffset": offset, "byteLength": values.nbytes})
+        offset += values.nbytes
+    gltf = {
+        "asset": {"version": "2.0"},
+        "nodes": [{"name": "grid", "mesh": 0}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0, "NORMAL": 1, "TEXCOORD_0": 2}, "indices": 3}]}],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": len(corners), "type": "VEC3"},
+            {"bufferView": 1, "componentType": 5126, "count": len(corners), "type": "VEC3"},
+            {"bufferView": 2, "componentType": 5126, "count": len(corners), "type": "VEC2"},
+            {"bufferView": 3, "componentType": 5125, "count": len(corners), "type": "SCALAR"},
+        ],
+        "bufferViews": views,
+        "buffers": [{"byteLength": offset}],
+    }
+    return gltf, b"".join(values.tobytes() for values in arrays)
+
+def bench_geometry(triangle_count, repeat):
+    gltf, binary = make_grid_gltf(triangle_count)
+    results = {}
+    for quantize in (False, True):
+        label = "quantized" if quantize else "float"
+        results[f"optimize_gltf_data x{triangle_count} triangles ({label})"] = best_of(
+            lambda: export_geometry.optimize_gltf_data(copy.deepcopy(gltf), binary, quantize), repeat
+        )
+    return results
+
+def make_world_matrices(count):
+    """Random world matrices (some mirrored) as mathutils matrices and as an (n, 4, 4) array"""
+    rng = random.Random(0)
+    matrices = []
+    for i in range(count):
+        loc = mathutils.Vector([rng.uniform(-100, 100) for _ in range(3)])
+        rot = mathutils.Euler([rng.uniform(-3.14, 3.14) for _ in range(3)]).to_quaternion()
+        scale = mathutils.Vector([rng.uniform(0.5, 2.0) * (-1 if i % 10 == 0 and axis == 0 else 1) for axis in range(3)])
+        matrices.append(mathutils.Matrix.LocRotScale(loc, rot, scale))
+    return matrices, np.array([[list(row) for row in matrix] for matrix in matrices])
+
+def convert_per_object(matrices):
+    """The per-object path: decompose, convert and build the record of every matrix"""
+    records = []
+    for matrix in matrices:
+        loc, quat, scale = export_utils.convert_zup_to_yup(*matrix.decompose())
+        records.append({
+            "location": {"x": loc.x, "y": loc.y, "z": loc.z},
+            "rotation": {"x": quat.x, "y": quat.y, "z": quat.z, "w": quat.w},
+            "scale": {"x": scale.x, "y": scale.y, "z": scale.z}
+        })
+    return records
+
+def convert_batched(array, records=True):
+    converted = export_utils.decompose_matrices(export_utils.world_matrices_to_yup(array))
+    return export_utils.transform_records(*converted) if records else converted
+
+def bench_transforms(counts, repeat):
+    results = {}
+    for count in counts:
+        matrices, array = make_world_matrices(count)
+        results[f"convert_zup_to_yup x{count} (per object)"] = best_of(lambda: convert_per_object(matrices), repeat)
+        results[f"convert_zup_to_yup x{count} (batched)"] = best_of(lambda: convert_batched(array, False), repeat)
+        results[f"convert_zup_to_yup x{count} (batched, with records)"] = best_of(lambda: convert_batched(array), repeat)
+    return results
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "-C", REPO_ROOT, "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Export helper micro-benchmarks (no Blender needed)")
+    parser.add_argument("--nodes", type=int, default=20000, help="Nodes in the synthetic glTF")
+    parser.add_argument("--paths", type=int, default=10000, help="Paths resolved per path benchmark")
+    parser.add_argument("--pairs", type=int, default=50, help="Path pairs for PathMapper")
+    parser.add_argument("--triangles", type=int, default=50000, help="Triangles of the geometry pass benchmark")
+    parser.add_argument("--transforms", type=int, nargs="+", default=[10000, 100000], help="Matrix counts of the transform benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--results", help="Append a JSON line with the timings to this file")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="mavhod_micro_")
+    try:
+        timings = bench_patch(work_dir, args.nodes, args.repeat)
+        timings.update(bench_paths(work_dir, args.paths, args.pairs, args.repeat))
+        timings.update(bench_geometry(args.triangles, args.repeat))
+        if export_utils is not None:
+            timings.update(bench_transforms(args.transforms, args.repeat))
+        else:
+            print("Skipping the transform benchmark: bpy is not importable")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for name, seconds in timings.items():
+        print(f"{name:<52} {seconds * 1000:>10.2f} ms")
+    if args.results:
+        with open(args.results, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                "name": "micro",
+                "commit": git_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "config": vars(args),
+                "timings_ms": {name: round(seconds * 1000, 3) for name, seconds in timings.items()}
+            }) + "\n")
+
+if __name__ == "__main__":
+    main()
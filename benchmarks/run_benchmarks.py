@@ -0,0 +1,92 @@
+"""
+Run the headless export benchmark scenarios and compare results across commits.
+
+    python benchmarks/run_benchmarks.py --blender /path/to/blender            # run all scenarios
+    python benchmarks/run_benchmarks.py --scenarios small --results out.jsonl
+    python benchmarks/run_benchmarks.py --compare old.jsonl new.jsonl          # compare two result files
+
+Every scenario starts a fresh `blender --factory-startup -b --python blender_bench.py`,
+which appends one JSON line per run to the results file.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scenario name -> blender_bench.py arguments
+SCENARIOS = {
+    "small": ["--unique-meshes", "20", "--instances", "1000", "--libraries", "1", "--materials", "5", "--textures", "5", "--lights", "50"],
+    "medium": ["--unique-meshes", "200", "--instances", "10000", "--libraries", "4", "--materials", "40", "--textures", "40", "--lights", "500"],
+    "large": ["--unique-meshes", "1000", "--instances", "100000", "--libraries", "8", "--materials", "100", "--textures", "100", "--lights", "2000"],
+    "glb": ["--unique-meshes", "200", "--instances", "10000", "--libraries", "4", "--materials", "40", "--textures", "40", "--object-ext", ".glb"],
+}
+
+def run_scenarios(args):
+    for name in args.scenarios:
+        cmd = [
+            args.blender, "--factory-startup", "-b",
+            "--python", os.path.join(BENCH_DIR, "blender_bench.py"),
+            "--", "--name", name, "--results", args.results, *SCENARIOS[name], *args.extra
+        ]
+        print(f"Running scenario '{name}': {' '.join(cmd)}")
+        completed = subprocess.run(cmd)
+        if completed.returncode != 0:
+            print(f"Scenario '{name}' failed with code {completed.returncode}")
+            return completed.returncode
+    return 0
+
+def load_results(path):
+    """Last record per scenario name in a results file"""
+    records = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records[record["name"]] = record
+    return records
+
+def _metrics(record):
+    if "timings_ms" in record:
+        # micro_benchmarks.py record
+        return record["timings_ms"]
+    first = record["passes"][0] if record["passes"] else {}
+    last = record["passes"][-1] if record["passes"] else {}
+    return {
+        "first pass s": first.get("seconds"),
+        "instances/s": first.get("instances_per_s"),
+        "MB/s": first.get("mb_per_s"),
+        "incremental s": last.get("seconds") if len(record["passes"]) > 1 else None,
+        "lights/s": record.get("lights_per_s"),
+        "peak RSS MB": record.get("peak_rss_mb"),
+    }
+
+def compare(old_path, new_path):
+    old, new = load_results(old_path), load_results(new_path)
+    for name in sorted(set(old) & set(new)):
+        print(f"\n{name}: {(old[name].get('commit') or '?')[:10]} -> {(new[name].get('commit') or '?')[:10]}")
+        old_metrics, new_metrics = _metrics(old[name]), _metrics(new[name])
+        for key, old_value in old_metrics.items():
+            new_value = new_metrics.get(key)
+            change = ""
+            if old_value and new_value is not None:
+                change = f"{(new_value - old_value) / old_value * 100:+.1f}%"
+            print(f"  {key:<44} {str(old_value):>12} {str(new_value):>12} {change:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mavhod export benchmark driver")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable (or $BLENDER)")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=["small", "medium"])
+    parser.add_argument("--results", default=os.path.join(BENCH_DIR, "results.jsonl"))
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two results files instead of running")
+    parser.add_argument("extra", nargs="*", help="Extra blender_bench.py arguments (after --)")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    return run_scenarios(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,6 +22,7 @@ if "bpy" in locals():
 	from . import export_setting
 	from . import export_scene
 	from . import export_light
+	from . import export_watch
 	imp.reload(import_fbx)
 	imp.reload(import_gltf)
 	imp.reload(arrange_meshes)
@@ -29,6 +30,7 @@ if "bpy" in locals():
 	imp.reload(export_setting)
 	imp.reload(export_scene)
 	imp.reload(export_light)
+	imp.reload(export_watch)
 else:
 	from . import import_fbx
 	from . import import_gltf
@@ -37,6 +39,7 @@ else:
 	from . import export_setting
 	from . import export_scene
 	from . import export_light
+	from . import export_watch
 
 import bpy
 
@@ -87,19 +90,135 @@ class MavhodToolSceneProps(bpy.types.PropertyGroup):
 	export_metadata_light: bpy.props.BoolProperty(name="Light (JSON)", default=True)
 	scene_extension: bpy.props.StringProperty(
 		name="Scene Extension",
-		description="File extension for the exported scene data",
+		description="File extension for the exported scene data (.dbin writes Godot binary Variant data)",
 		default=".json"
 	)
 	object_extension: bpy.props.StringProperty(
 		name="Object Extension",
-		description="File extension for exported objects",
+		description="File extension for exported objects (.glb exports binary glTF with embedded buffers and textures)",
 		default=".gltf"
 	)
 	light_extension: bpy.props.StringProperty(
 		name="Light Extension",
-		description="File extension for exported light data",
+		description="File extension for exported light data (.dbin writes Godot binary Variant data)",
 		default=".json"
 	)
+	export_worker_count: bpy.props.IntProperty(
+		name="Background Workers",
+		description="Maximum number of background Blender processes kept open for linked library exports",
+		default=4,
+		min=1,
+		max=64
+	)
+	export_local_shards: bpy.props.IntProperty(
+		name="Local Export Processes",
+		description="Export local meshes of large selections in this many parallel background processes (1 = export in the UI)",
+		default=1,
+		min=1,
+		max=64
+	)
+	export_frame_budget_ms: bpy.props.IntProperty(
+		name="Frame Budget (ms)",
+		description="Time the export may spend per UI update before yielding",
+		default=30,
+		min=1,
+		max=1000
+	)
+	export_compact_json: bpy.props.BoolProperty(
+		name="Compact JSON",
+		description="Write exported JSON without indentation (smaller files, faster writes)",
+		default=False
+	)
+	export_incremental: bpy.props.BoolProperty(
+		name="Incremental Export",
+		description="Skip assets whose mesh, materials, textures and settings are unchanged since the last export",
+		default=True
+	)
+	export_multimesh_threshold: bpy.props.IntProperty(
+		name="MultiMesh Threshold",
+		description="Write assets with at least this many instances as one packed MultiMesh transform array (0 disables)",
+		default=0,
+		min=0
+	)
+	export_chunk_size: bpy.props.FloatProperty(
+		name="Chunk Size",
+		description="Split scene and light exports into square grid cells of this size on the ground plane, with one file per cell plus an index file (0 disables)",
+		default=0.0,
+		min=0.0,
+		subtype='DISTANCE'
+	)
+	export_lod_ratios: bpy.props.StringProperty(
+		name="LOD Ratios",
+		description="Comma-separated face ratios of extra LOD files written next to each exported mesh, e.g. 0.5, 0.25, 0.1 (empty disables)",
+		default=""
+	)
+	export_profile: bpy.props.BoolProperty(
+		name="Profile Export",
+		description="Record per-stage timings, bytes written and subprocesses, and write a summary and a Chrome trace next to the scene file",
+		default=False
+	)
+	export_light_cell_size: bpy.props.FloatProperty(
+		name="Light Cell Size",
+		description="Write a table of the most important lights per grid cell of this size next to the light file (0 disables)",
+		default=0.0,
+		min=0.0,
+		subtype='DISTANCE'
+	)
+	export_light_cell_limit: bpy.props.IntProperty(
+		name="Lights per Cell",
+		description="Maximum number of lights listed per cell in the light table, most important first",
+		default=8,
+		min=1
+	)
+	export_light_threshold: bpy.props.FloatProperty(
+		name="Light Threshold",
+		description="Irradiance (W/m²) at which a light's influence radius ends",
+		default=0.05,
+		min=0.0001,
+		precision=4
+	)
+	export_watch_interval: bpy.props.FloatProperty(
+		name="Watch Interval",
+		description="Seconds between checks of the watched library .blend files and textures",
+		default=1.0,
+		min=0.1,
+		subtype='TIME_ABSOLUTE'
+	)
+	export_watch_debounce: bpy.props.FloatProperty(
+		name="Watch Debounce",
+		description="Seconds without further changes before changed sources are re-exported in one batch",
+		default=2.0,
+		min=0.0,
+		subtype='TIME_ABSOLUTE'
+	)
+	export_texture_processing: bpy.props.BoolProperty(
+		name="Process Textures",
+		description="Resize and convert textures by rule (needs Pillow in Blender's Python), caching the results in the scene folder",
+		default=False
+	)
+	export_texture_max_size: bpy.props.IntProperty(
+		name="Max Texture Size",
+		description="Largest texture width/height in pixels for rules without their own max_size (0 keeps the size)",
+		default=0,
+		min=0,
+		max=16384
+	)
+	export_texture_rules: bpy.props.StringProperty(
+		name="Texture Rules",
+		description="JSON file with the texture rules (empty: lossless PNG normal maps, WebP albedo, other textures keep their format)",
+		default="",
+		subtype='FILE_PATH'
+	)
+	export_optimize_geometry: bpy.props.BoolProperty(
+		name="Optimize Geometry",
+		description="Weld duplicate vertices and reorder indices and vertices for the GPU caches in the exported glTF buffers",
+		default=False
+	)
+	export_quantize_geometry: bpy.props.BoolProperty(
+		name="Quantize Geometry",
+		description="Store positions, normals, tangents and UVs as 8/16-bit integers (KHR_mesh_quantization) when optimizing geometry",
+		default=False
+	)
 	fbx_files: bpy.props.CollectionProperty(type=FBXFileItem)
 	path_pairs: bpy.props.CollectionProperty(type=MavhodPathPair)
 
@@ -129,6 +248,10 @@ class MavhodToolPanel(bpy.types.Panel):
 		col.operator("mavhod_tool.export_setting", text="Setting", icon="PRESET")
 		col.operator("mavhod_tool.export_settings", text="Export Scene", icon="EXPORT")
 		col.operator("mavhod_tool.export_light_settings", text="Export Light", icon="LIGHT_DATA")
+		if export_watch.MavhodWatchSources.is_running:
+			col.operator("mavhod_tool.stop_watch", text="Stop Watching", icon="PAUSE")
+		else:
+			col.operator("mavhod_tool.watch_settings", text="Watch Sources", icon="VIEWZOOM")
 
 		# ========== MESH TOOLS SECTION ==========
 		box = layout.box()
@@ -155,6 +278,9 @@ classes = (
 	export_light.MavhodExportLightExecute,
 	export_scene.MavhodExportSettings,
 	export_scene.MavhodExportExecute,
+	export_watch.MavhodWatchSettings,
+	export_watch.MavhodWatchSources,
+	export_watch.MavhodStopWatch,
 	MavhodToolPanel,
 )
 
@@ -163,6 +289,7 @@ def register():
 	bpy.types.Scene.MavhodToolProps = bpy.props.PointerProperty(type=MavhodToolSceneProps)
 
 def unregister():
+	export_scene.shutdown_worker_pool()
 	for cls in classes: bpy.utils.unregister_class(cls);
 
 if __name__ == "__main__":
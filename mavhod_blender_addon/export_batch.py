@@ -0,0 +1,153 @@
+"""
+Batch export driver (plain Python, no Blender needed to run it):
+
+    python mavhod_blender_addon/export_batch.py --blender /path/to/blender \
+        --settings settings.json --out-dir build levels/
+
+Runs export_cli.py in one background Blender per .blend file found under the given
+files/folders, at most --jobs at a time, and prints a per-level status/timing summary.
+Every level is exported to its own folder under --out-dir (mirroring its path below the
+input folder), so parallel levels never share an export cache or scene file.
+Each level's Blender also starts its own library workers and local export processes
+(Background Workers and Local Export Processes settings), so by default --jobs is the CPU
+count divided by the processes a level can run at once.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from .export_worker import RESULT_PREFIX
+except ImportError:
+    # Run as a script
+    from export_worker import RESULT_PREFIX
+
+CLI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "export_cli.py")
+# Defaults of export_worker_count and export_local_shards (MavhodToolProps in __init__.py)
+DEFAULT_WORKER_COUNT = 4
+DEFAULT_LOCAL_SHARDS = 1
+
+def get_level_processes(settings_path=None):
+    """Blender processes one level can keep busy: its library workers plus its local export processes"""
+    settings = {}
+    if settings_path:
+        with open(settings_path, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+    workers = settings.get("export_worker_count", DEFAULT_WORKER_COUNT)
+    shards = settings.get("export_local_shards", DEFAULT_LOCAL_SHARDS)
+    return max(1, workers) + max(1, shards)
+
+def get_default_jobs(settings_path=None):
+    """Levels to export at once without oversubscribing the CPUs"""
+    return max(1, (os.cpu_count() or 1) // get_level_processes(settings_path))
+
+def find_levels(inputs, recursive=False):
+    """(blend path, output subfolder) of every .blend file among inputs (files or folders)"""
+    levels = []
+    for path in inputs:
+        if os.path.isfile(path):
+            levels.append((path, os.path.splitext(os.path.basename(path))[0]))
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            if not recursive:
+                dirs.clear()
+            for filename in sorted(files):
+                if not filename.endswith(".blend"): continue # also skips .blend1 backups
+                blend_path = os.path.join(root, filename)
+                levels.append((blend_path, os.path.splitext(os.path.relpath(blend_path, path))[0]))
+    return levels
+
+def export_level(args, blend_path, out_dir):
+    """Export one level in a background Blender. Returns its summary record."""
+    cmd = [args.blender, "--factory-startup", "-b", blend_path, "-P", CLI_SCRIPT, "--", "--out-dir", out_dir]
+    if args.settings: cmd += ["--settings", os.path.abspath(args.settings)]
+    if args.no_lights: cmd.append("--no-lights")
+    if args.include_hidden: cmd.append("--include-hidden")
+    record = {'level': blend_path, 'out_dir': out_dir, 'status': 'failed'}
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    log_path = os.path.join(out_dir, "export.log")
+    try:
+        # Blender's output goes straight to the log, so it is kept even when the level times out
+        with open(log_path, 'wb') as log:
+            completed = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT, timeout=args.timeout)
+        reported = False
+        with open(log_path, 'r', encoding='utf-8', errors='replace') as log:
+            for line in log:
+                if line.startswith(RESULT_PREFIX):
+                    record.update(json.loads(line[len(RESULT_PREFIX):]))
+                    reported = True
+        # Without a result line Blender failed before or while running export_cli.py
+        record['status'] = 'ok' if completed.returncode == 0 and reported else 'failed'
+        record['returncode'] = completed.returncode
+    except subprocess.TimeoutExpired:
+        record['status'] = 'timeout'
+    except OSError as e:
+        record['error'] = str(e)
+    record['wall_seconds'] = round(time.perf_counter() - start, 3)
+    record['log'] = log_path
+    return record
+
+def format_part(part):
+    if not part: return "-"
+    if part['status'] != 'ok': return part['status']
+    return f"{part['seconds']:.1f} s ({part['objects']})"
+
+def print_summary(records, wall_seconds):
+    print(f"\n{'Level':<40} {'Status':<8} {'Scene':>16} {'Lights':>16} {'Total s':>8}")
+    for record in records:
+        print(
+            f"{os.path.basename(record['level']):<40} {record['status']:<8} "
+            f"{format_part(record.get('scene')):>16} {format_part(record.get('lights')):>16} {record['wall_seconds']:>8.1f}"
+        )
+    ok = sum(1 for record in records if record['status'] == 'ok')
+    print(f"\n{ok}/{len(records)} level(s) exported in {wall_seconds:.1f} s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Export many .blend levels in parallel background Blender processes")
+    parser.add_argument("inputs", nargs="+", help=".blend files or folders holding them")
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--settings", help="Settings JSON written by Save Settings")
+    parser.add_argument("--out-dir", required=True, help="Output folder, one subfolder per level")
+    parser.add_argument("--jobs", "-j", type=int,
+                        help="Levels exported at the same time (default: CPU count / Blender processes per level)")
+    parser.add_argument("--recursive", "-r", action="store_true", help="Also search subfolders for .blend files")
+    parser.add_argument("--timeout", type=float, help="Seconds before a level's Blender process is killed")
+    parser.add_argument("--no-lights", action="store_true", help="Skip the light export")
+    parser.add_argument("--include-hidden", action="store_true", help="Also export objects hidden in the viewport")
+    parser.add_argument("--summary", help="Write the per-level records to this JSON file")
+    args = parser.parse_args()
+
+    levels = find_levels(args.inputs, args.recursive)
+    if not levels:
+        parser.error("no .blend files found")
+    jobs = args.jobs if args.jobs else get_default_jobs(args.settings)
+    jobs = max(1, min(jobs, len(levels)))
+    print(f"Exporting {len(levels)} level(s), {jobs} at a time")
+    start = time.perf_counter()
+    records = []
+    # Threads only wait on the Blender processes, which do the work in parallel
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(export_level, args, blend_path, os.path.join(args.out_dir, subfolder))
+            for blend_path, subfolder in levels
+        ]
+        for future in as_completed(futures):
+            record = future.result()
+            print(f"[{record['status']}] {record['level']} ({record['wall_seconds']:.1f} s)")
+            records.append(record)
+    records.sort(key=lambda record: record['level'])
+    wall_seconds = time.perf_counter() - start
+    print_summary(records, wall_seconds)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump({'wall_seconds': round(wall_seconds, 3), 'levels': records}, f, indent=4)
+    sys.exit(0 if all(record['status'] == 'ok' for record in records) else 1)
+
+if __name__ == "__main__":
+    main()
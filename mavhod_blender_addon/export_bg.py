@@ -2,11 +2,171 @@ import bpy
 import sys
 import argparse
 import os
+import json
+import shutil
+import tempfile
+import traceback
 
 # Add current directory to sys.path to allow importing export_utils
 sys.path.append(os.path.dirname(__file__))
 import export_utils
-from export_utils import copy_and_hash_images, rebind_materials_to_hashed_images
+from export_utils import copy_and_hash_images, rebind_materials_to_hashed_images, build_material_image_index
+from export_utils import MaterialRebindCache, get_gltf_export_format, export_lod_chain
+from export_utils import PathResolver, set_active_resolver
+from export_worker import RESULT_PREFIX
+
+def select_objects(mesh_name=None, object_name=None):
+    """
+    Select the local object named object_name, else the object using mesh_name
+    (or every Mesh object). Returns False if nothing matched.
+    """
+    bpy.ops.object.select_all(action='DESELECT')
+    if object_name:
+        for obj in bpy.data.objects:
+            if obj.type == 'MESH' and obj.library is None and obj.name == object_name:
+                obj.select_set(True)
+                bpy.context.view_layer.objects.active = obj
+                return True
+        print(f"Warning: Object '{object_name}' not found in the scene.")
+        return False
+
+    if not mesh_name:
+        # If no mesh is specified, select all Mesh objects in the Scene
+        for obj in bpy.data.objects:
+            if obj.type == 'MESH':
+                obj.select_set(True)
+        return True
+
+    print(f"Filtering for mesh data: {mesh_name}")
+    # Select objects using the specified mesh data
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH' and obj.data and obj.data.name == mesh_name:
+            obj.select_set(True)
+            bpy.context.view_layer.objects.active = obj
+            return True
+
+    print(f"Warning: Mesh data '{mesh_name}' not found in the scene.")
+    return False
+
+def export_job(job, material_index=None, rebind_cache=None, staging_dir=None):
+    """
+    Export a single job: { output, mesh, object, apply_modifiers, lod_ratios, metadata: {node, mesh, material, scene} }.
+    Images are staged in staging_dir (default: next to the output) and rebound materials
+    are shared through rebind_cache. Original materials are restored afterwards so the
+    open file can serve further jobs.
+    """
+    if not select_objects(job.get('mesh'), job.get('object')):
+        return False
+
+    # 1. Copy and Rename Images
+    output_dir = staging_dir or os.path.dirname(job['output'])
+    print(f"Processing images to: {output_dir}")
+    image_mapping = copy_and_hash_images(output_dir, bpy.context.selected_objects, material_index)
+
+    # Keep original materials to restore after export
+    original_materials = {
+        obj.data: list(obj.data.materials)
+        for obj in bpy.context.selected_objects if obj.type == 'MESH' and obj.data
+    }
+    try:
+        # 2. Duplicate Materials and Re-bind Images
+        print("Re-binding materials to hashed images...")
+        rebind_materials_to_hashed_images(image_mapping, rebind_cache)
+
+        print(f"Exporting to: {job['output']}")
+
+        # 3. Export as GLTF (or binary GLB when the output ends in .glb)
+        metadata = job.get('metadata', {})
+        use_extras = metadata.get('node', False) or metadata.get('mesh', False) or \
+                     metadata.get('material', False) or metadata.get('scene', False)
+
+        apply_modifiers = job.get('apply_modifiers', False)
+        bpy.ops.export_scene.gltf(
+            filepath=job['output'],
+            export_format=get_gltf_export_format(os.path.splitext(job['output'])[1]),
+            export_image_format='AUTO',
+            use_selection=True,
+            export_apply=apply_modifiers,
+            export_extras=use_extras
+        )
+
+        # 4. Decimated LOD files next to the output, sharing the rebound materials
+        if job.get('lod_ratios'):
+            export_lod_chain(bpy.context.view_layer.objects.active, job['output'], job['lod_ratios'], use_extras,
+                             apply_modifiers)
+    finally:
+        for mesh, materials in original_materials.items():
+            for i, mat in enumerate(materials):
+                mesh.materials[i] = mat
+
+    # 5. Post-processing is handled by the main process in export_scene.py
+    # to ensure texture metadata is correctly applied.
+    return True
+
+def export_jobs(jobs, staging_root=None):
+    """
+    Export a job manifest (list of jobs) from the open file.
+    Image content hashes are memoized in export_utils, so each image is hashed once
+    for the lifetime of the process, and material node trees are indexed once per manifest.
+    Images are staged once per manifest and every temporary material and image is
+    purged afterwards, so a long-lived worker does not accumulate datablocks.
+    Image paths are resolved once per manifest (the file may be reloaded between manifests).
+    Images are staged below staging_root, which the main process places on the output volume.
+    Returns one result dict per job.
+    """
+    material_index = build_material_image_index(bpy.data.objects)
+    rebind_cache = MaterialRebindCache()
+    if staging_root:
+        os.makedirs(staging_root, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix="mavhod_images_", dir=staging_root)
+    resolver = PathResolver()
+    set_active_resolver(resolver)
+    results = []
+    try:
+        for job in jobs:
+            result = {'ok': False}
+            try:
+                result['ok'] = export_job(job, material_index, rebind_cache, staging_dir)
+                if not result['ok']:
+                    result['error'] = f"'{job.get('object') or job.get('mesh')}' not found"
+            except Exception as e:
+                traceback.print_exc()
+                result['error'] = str(e)
+            results.append(result)
+    finally:
+        print(f"Reclaimed {rebind_cache.purge()} temporary datablock(s)")
+        set_active_resolver(None)
+        print(resolver.report())
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    return results
+
+def serve():
+    """
+    Worker mode: keep the .blend open and export job manifests received as JSON lines
+    ({"jobs": [...]}) on stdin. Every manifest is answered with a single RESULT_PREFIX
+    line ({"results": [...]}) on stdout.
+    """
+    blend_filepath = bpy.data.filepath
+    blend_mtime = os.path.getmtime(blend_filepath) if blend_filepath else None
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        reply = {'results': []}
+        try:
+            message = json.loads(line)
+            # Reload the library if it was saved since the worker opened it
+            if blend_filepath and os.path.getmtime(blend_filepath) != blend_mtime:
+                print(f"Reloading changed file: {blend_filepath}")
+                bpy.ops.wm.open_mainfile(filepath=blend_filepath)
+                blend_mtime = os.path.getmtime(blend_filepath)
+            reply['results'] = export_jobs(message.get('jobs', []), message.get('staging_dir'))
+        except Exception as e:
+            traceback.print_exc()
+            reply['error'] = str(e)
+        sys.stdout.write(RESULT_PREFIX + json.dumps(reply) + "\n")
+        sys.stdout.flush()
 
 def main():
     # Get arguments passed after "--"
@@ -17,7 +177,11 @@ def main():
         argv = []
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("--output", "-o", required=True, help="Path for the output .gltf file")
+    parser.add_argument("--serve", action="store_true", help="Run as a worker reading export jobs from stdin")
+    parser.add_argument("--manifest", help="JSON file holding a list of export jobs")
+    parser.add_argument("--results", help="JSON file receiving one result per manifest job")
+    parser.add_argument("--staging-dir", help="Folder receiving the staged images of a manifest (default: system temp)")
+    parser.add_argument("--output", "-o", help="Path for the output .gltf file")
     parser.add_argument("--mesh", "-m", help="Name of the mesh data to export")
     parser.add_argument("--metadata_node", action="store_true", help="Export node metadata")
     parser.add_argument("--metadata_mesh", action="store_true", help="Export mesh metadata")
@@ -26,55 +190,36 @@ def main():
     parser.add_argument("--object_ext", default=".gltf", help="Final object extension")
     args = parser.parse_args(argv)
 
-    if args.mesh:
-        print(f"Filtering for mesh data: {args.mesh}")
-        # Deselect all objects
-        bpy.ops.object.select_all(action='DESELECT')
-        
-        # Select objects using the specified mesh data
-        found = False
-        for obj in bpy.data.objects:
-            if obj.type == 'MESH' and obj.data and obj.data.name == args.mesh:
-                obj.select_set(True)
-                bpy.context.view_layer.objects.active = obj
-                found = True
-                break
-        
-        if not found:
-            print(f"Warning: Mesh data '{args.mesh}' not found in the scene.")
-            return
-    else:
-        # If no mesh is specified, select all Mesh objects in the Scene
-        bpy.ops.object.select_all(action='DESELECT')
-        for obj in bpy.data.objects:
-            if obj.type == 'MESH':
-                obj.select_set(True)
+    if args.serve:
+        serve()
+        return
 
-    # 1. Copy and Rename Images
-    output_dir = os.path.dirname(args.output)
-    print(f"Processing images to: {output_dir}")
-    image_mapping = copy_and_hash_images(output_dir)
-
-    # 2. Duplicate Materials and Re-bind Images
-    print("Re-binding materials to hashed images...")
-    rebind_materials_to_hashed_images(image_mapping)
-
-    print(f"Exporting to: {args.output}")
-
-    # 3. Export as GLTF
-    use_extras = args.metadata_node or args.metadata_mesh or \
-                 args.metadata_material or args.metadata_scene
-                 
-    bpy.ops.export_scene.gltf(
-        filepath=args.output,
-        export_format='GLTF_SEPARATE',
-        export_image_format='AUTO',
-        use_selection=True,
-        export_extras=use_extras
-    )
-
-    # 4. Post-processing is now handled by the main process in export_scene.py
-    # to ensure texture metadata is correctly applied.
+    if args.manifest:
+        with open(args.manifest, 'r', encoding='utf-8') as f:
+            jobs = json.load(f)
+        results = export_jobs(jobs, args.staging_dir)
+        if args.results:
+            with open(args.results, 'w', encoding='utf-8') as f:
+                json.dump(results, f)
+        failed = [job['output'] for job, result in zip(jobs, results) if not result['ok']]
+        print(f"Exported {len(jobs) - len(failed)}/{len(jobs)} job(s) from manifest")
+        if failed:
+            sys.exit(1)
+        return
+
+    if not args.output:
+        parser.error("--output is required unless --serve or --manifest is given")
+
+    export_job({
+        'output': args.output,
+        'mesh': args.mesh,
+        'metadata': {
+            'node': args.metadata_node,
+            'mesh': args.metadata_mesh,
+            'material': args.metadata_material,
+            'scene': args.metadata_scene
+        }
+    })
 
 if __name__ == "__main__":
     main()
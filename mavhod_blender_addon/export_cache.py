@@ -0,0 +1,231 @@
+import os
+import json
+import hashlib
+from array import array
+
+CACHE_FILENAME = ".mavhod_export_cache.json"
+CACHE_VERSION = 1
+
+# Writable properties that only hold editor state, not exported content
+_UI_PROPERTIES = {'preview_render_type', 'use_preview_world', 'paint_active_slot'}
+# Properties of the root base classes (ID, Node, Modifier) that change the export: a muted node passes its input through
+_CONTENT_BASE_PROPERTIES = {'mute'}
+_content_properties = {} # RNA struct identifier -> properties fed into fingerprints
+
+def _get_content_properties(rna):
+	"""
+	Properties of an RNA struct that describe its content. Read-only properties (session_uid,
+	users, dimensions, ...) and the properties of its root base class (ID bookkeeping, node
+	editor layout, modifier display flags) are skipped, so fingerprints are stable across
+	sessions and file reloads.
+	"""
+	props = _content_properties.get(rna.identifier)
+	if props is not None: return props
+	root = rna
+	while root.base is not None:
+		root = root.base
+	base_identifiers = {prop.identifier for prop in root.properties} - _CONTENT_BASE_PROPERTIES
+	props = [
+		prop for prop in rna.properties
+		if not prop.is_readonly and prop.identifier not in base_identifiers and prop.identifier not in _UI_PROPERTIES
+	]
+	_content_properties[rna.identifier] = props
+	return props
+
+class _Uncacheable(Exception):
+	"""Raised while fingerprinting an asset whose export depends on data that is not hashed"""
+
+class _References:
+	"""
+	IDs reached from an asset through pointers (modifier objects, node groups, Geometry Nodes
+	inputs) while fingerprinting it. Every ID is hashed once; objects are hashed with their
+	transform relative to owner, the exported object, since applied modifiers depend on it.
+	"""
+
+	def __init__(self, owner):
+		self.owner = owner
+		self.visited = {('OBJECT', owner.name_full)} if owner is not None else set()
+
+	def hash_id(self, h, value):
+		id_type = getattr(value, 'id_type', None)
+		h.update(f"ref:{id_type}:{value.name};".encode('utf-8'))
+		key = (id_type, value.name_full)
+		if key in self.visited: return
+		self.visited.add(key)
+		if id_type == 'NODETREE':
+			_hash_node_tree(h, value, self)
+		elif id_type == 'MATERIAL':
+			_hash_material(h, value, self)
+		elif id_type == 'MESH':
+			_hash_mesh(h, value)
+		elif id_type == 'COLLECTION':
+			for obj in sorted(value.all_objects, key=lambda o: o.name_full):
+				self.hash_id(h, obj)
+		elif id_type == 'OBJECT':
+			self._hash_object(h, value)
+
+	def _hash_object(self, h, obj):
+		if obj.type not in {'MESH', 'EMPTY'}:
+			# Curves, text, ... would need their own geometry hash
+			raise _Uncacheable(f"{obj.type} object {obj.name}")
+		relative = self.owner.matrix_world.inverted_safe() @ obj.matrix_world
+		h.update(f"matrix:{[round(v, 6) for row in relative for v in row]};".encode('utf-8'))
+		if obj.type == 'MESH':
+			_hash_mesh(h, obj.data)
+			_hash_modifiers(h, obj, self)
+
+def _hash_rna(h, struct, refs=None):
+	"""
+	Feed the simple content properties of a struct (modifier, node, material) into hash h.
+	Pointers are hashed by name, or with the content of the target when refs is given.
+	"""
+	for prop in _get_content_properties(struct.bl_rna):
+		try:
+			value = getattr(struct, prop.identifier)
+		except AttributeError:
+			continue
+		if prop.type in {'BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM'}:
+			if getattr(prop, 'is_array', False) or getattr(prop, 'array_length', 0):
+				value = tuple(value)
+			elif isinstance(value, set):
+				# Enum flags: set order follows the per-process string hash seed
+				value = tuple(sorted(value))
+			h.update(f"{prop.identifier}={value!r};".encode('utf-8'))
+		elif prop.type == 'POINTER' and value is not None and hasattr(value, 'name'):
+			h.update(f"{prop.identifier}->{value.name};".encode('utf-8'))
+			if refs is not None and hasattr(value, 'id_type'):
+				refs.hash_id(h, value)
+
+def _hash_id_properties(h, struct, refs):
+	"""Custom (ID) properties of a struct, e.g. the input values of a Geometry Nodes modifier"""
+	try:
+		keys = sorted(struct.keys())
+	except TypeError:
+		# Most modifier types do not support ID properties
+		return
+	for key in keys:
+		value = struct[key]
+		if hasattr(value, 'id_type'):
+			h.update(f"[{key}]".encode('utf-8'))
+			refs.hash_id(h, value)
+			continue
+		if hasattr(value, 'to_dict'):
+			value = value.to_dict()
+		elif hasattr(value, 'to_list'):
+			value = value.to_list()
+		h.update(f"[{key}]={value!r};".encode('utf-8'))
+
+def _hash_modifiers(h, obj, refs):
+	for mod in obj.modifiers:
+		h.update(f"modifier:{mod.name}:{mod.type};".encode('utf-8'))
+		_hash_rna(h, mod, refs)
+		_hash_id_properties(h, mod, refs)
+
+def _hash_foreach(h, collection, attr, typecode, size):
+	buffer = array(typecode, [0]) * (len(collection) * size)
+	collection.foreach_get(attr, buffer)
+	h.update(buffer.tobytes())
+
+def _hash_mesh(h, mesh):
+	_hash_foreach(h, mesh.vertices, 'co', 'f', 3)
+	_hash_foreach(h, mesh.loops, 'vertex_index', 'i', 1)
+	_hash_foreach(h, mesh.corner_normals, 'vector', 'f', 3)
+	_hash_foreach(h, mesh.polygons, 'loop_total', 'i', 1)
+	_hash_foreach(h, mesh.polygons, 'material_index', 'i', 1)
+	for uv_layer in mesh.uv_layers:
+		h.update(uv_layer.name.encode('utf-8'))
+		_hash_foreach(h, uv_layer.data, 'uv', 'f', 2)
+	for mat in mesh.materials:
+		h.update(f"mat:{mat.name if mat else ''};".encode('utf-8'))
+
+def _hash_node_tree(h, tree, refs=None):
+	"""Nodes, unlinked input values and links of a node tree; group nodes pull in their tree through refs"""
+	for node in tree.nodes:
+		h.update(f"node:{node.name}:{node.bl_idname};".encode('utf-8'))
+		_hash_rna(h, node, refs)
+		for socket in node.inputs:
+			if hasattr(socket, 'default_value'):
+				value = socket.default_value
+				if hasattr(value, '__len__') and not isinstance(value, str):
+					value = tuple(value)
+				h.update(f"in:{socket.identifier}={value!r};".encode('utf-8'))
+		if node.type == 'TEX_IMAGE' and node.image:
+			h.update(f"image:{node.image.filepath};".encode('utf-8'))
+	for link in tree.links:
+		h.update(f"link:{link.from_node.name}.{link.from_socket.identifier}>{link.to_node.name}.{link.to_socket.identifier};".encode('utf-8'))
+
+def _hash_material(h, mat, refs=None):
+	h.update(f"material:{mat.name};".encode('utf-8'))
+	_hash_rna(h, mat)
+	if not (mat.use_nodes and mat.node_tree): return
+	_hash_node_tree(h, mat.node_tree, refs)
+
+def _hash_file_stat(h, path):
+	try:
+		st = os.stat(path)
+		h.update(f"file:{path}:{st.st_size}:{st.st_mtime_ns};".encode('utf-8'))
+	except OSError:
+		h.update(f"file:{path}:missing;".encode('utf-8'))
+
+def compute_fingerprint(obj, path_info, image_metadata, settings):
+	"""
+	Content fingerprint of one exported asset: mesh geometry, modifiers (with the objects,
+	node groups and input values they use), material node settings (node groups included),
+	referenced image sizes/mtimes, library file stat and export settings.
+	Returns None if the asset uses data that is not fingerprinted, so it is always exported.
+	"""
+	h = hashlib.sha256()
+	h.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+	refs = _References(obj)
+	try:
+		if path_info['is_linked']:
+			_hash_file_stat(h, path_info['blend_filepath'])
+		else:
+			_hash_modifiers(h, obj, refs)
+		_hash_mesh(h, obj.data)
+		for mat in obj.data.materials:
+			if mat: _hash_material(h, mat, refs)
+	except _Uncacheable as e:
+		print(f"Not caching {obj.name}: its modifiers use a {str(e)}")
+		return None
+	for meta in sorted(image_metadata.values(), key=lambda m: m['src_path'] or ''):
+		if meta['src_path']: _hash_file_stat(h, meta['src_path'])
+	return h.hexdigest()
+
+class ExportCache:
+	"""On-disk manifest of exported assets, stored in the scene destination folder"""
+
+	def __init__(self, scene_dir):
+		self.path = os.path.join(scene_dir, CACHE_FILENAME)
+		self.scene_dir = scene_dir
+		self.assets = {}
+		if os.path.isfile(self.path):
+			try:
+				with open(self.path, 'r', encoding='utf-8') as f:
+					data = json.load(f)
+				if data.get('version') == CACHE_VERSION:
+					self.assets = data.get('assets', {})
+			except (OSError, ValueError) as e:
+				print(f"Ignoring unreadable export cache {self.path}: {str(e)}")
+
+	def _key(self, final_path):
+		return os.path.relpath(final_path, self.scene_dir).replace("\\", "/")
+
+	def is_fresh(self, final_path, fingerprint):
+		"""True if final_path was exported with the same fingerprint and still exists"""
+		if fingerprint is None: return False
+		entry = self.assets.get(self._key(final_path))
+		return bool(entry) and entry.get('fingerprint') == fingerprint and os.path.isfile(final_path)
+
+	def record(self, final_path, fingerprint, **info):
+		self.assets[self._key(final_path)] = dict(info, fingerprint=fingerprint)
+
+	def forget(self, final_path):
+		self.assets.pop(self._key(final_path), None)
+
+	def save(self):
+		os.makedirs(self.scene_dir, exist_ok=True)
+		tmp_path = self.path + ".tmp"
+		with open(tmp_path, 'w', encoding='utf-8') as f:
+			json.dump({'version': CACHE_VERSION, 'assets': self.assets}, f, indent=4)
+		os.replace(tmp_path, self.path)
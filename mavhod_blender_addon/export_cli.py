@@ -0,0 +1,121 @@
+"""
+Headless export of one level, run inside Blender:
+
+    blender --factory-startup -b level.blend -P mavhod_blender_addon/export_cli.py -- \
+        --settings settings.json --out-dir build/level
+
+Loads the settings written by "Save Settings" (MavhodSaveSettingsJSON), selects the
+visible meshes and lights of the view layer and runs mavhod_tool.export_execute and
+mavhod_tool.export_light_execute synchronously (their execute() path, no window needed).
+A RESULT_PREFIX line with the status and timings is printed for export_batch.py.
+With --watch the process then keeps running and re-exports the assets whose library
+.blend files or textures change (see export_watch.py), until interrupted.
+"""
+import bpy
+import sys
+import os
+import json
+import time
+import argparse
+import importlib
+import traceback
+
+# Import the addon as a package from the repository (or the addons folder it is installed in)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mavhod_blender_addon
+from mavhod_blender_addon.export_setting import apply_settings
+from mavhod_blender_addon.export_worker import RESULT_PREFIX
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Export the open .blend level without the UI")
+    parser.add_argument("--settings", help="Settings JSON written by Save Settings (default: keep the file's settings)")
+    parser.add_argument("--out-dir", required=True, help="Folder receiving the scene and light files")
+    parser.add_argument("--name", help="Base name of the scene and light files (default: the .blend name)")
+    parser.add_argument("--no-scene", action="store_true", help="Skip the scene export")
+    parser.add_argument("--no-lights", action="store_true", help="Skip the light export")
+    parser.add_argument("--include-hidden", action="store_true", help="Also export objects hidden in the viewport")
+    parser.add_argument("--watch", action="store_true", help="After exporting, keep re-exporting assets whose sources change")
+    return parser.parse_args(argv)
+
+def get_addon_module(name):
+    """
+    Submodule of the registered copy of the addon. An installed copy may be registered
+    instead of this repository's package: its operators keep their state (e.g. the worker
+    pool) in their own modules.
+    """
+    operator = bpy.types.Operator.bl_rna_get_subclass_py("MAVHOD_TOOL_OT_export_execute")
+    package = operator.__module__.rpartition(".")[0] if operator else mavhod_blender_addon.__name__
+    return importlib.import_module(f"{package}.{name}")
+
+def get_extension(ext):
+    return ext if ext.startswith(".") else "." + ext
+
+def select(object_type, include_hidden=False):
+    """Select the objects of object_type in the view layer, like a user would before exporting"""
+    view_layer = bpy.context.view_layer
+    selected = 0
+    for obj in view_layer.objects:
+        wanted = obj.type == object_type and (include_hidden or obj.visible_get())
+        obj.select_set(wanted)
+        if wanted:
+            selected += 1
+            view_layer.objects.active = obj
+    return selected
+
+def run_export(operator, filepath):
+    """Run an export operator synchronously. Returns its status record."""
+    start = time.perf_counter()
+    try:
+        result = operator('EXEC_DEFAULT', filepath=filepath)
+        status = 'ok' if 'FINISHED' in result else 'failed'
+    except Exception as e:
+        traceback.print_exc()
+        status = 'failed'
+        print(f"Export to {filepath} failed: {str(e)}")
+    return {'status': status, 'path': filepath, 'seconds': round(time.perf_counter() - start, 3)}
+
+def main():
+    args = parse_args()
+    # An installed copy of the addon may already be registered (no --factory-startup)
+    if not hasattr(bpy.types.Scene, "MavhodToolProps"):
+        mavhod_blender_addon.register()
+    props = bpy.context.scene.MavhodToolProps
+    if args.settings:
+        with open(args.settings, 'r', encoding='utf-8') as f:
+            apply_settings(props, json.load(f))
+
+    name = args.name or os.path.splitext(os.path.basename(bpy.data.filepath))[0] or "level"
+    os.makedirs(args.out_dir, exist_ok=True)
+    report = {'level': bpy.data.filepath, 'scene': None, 'lights': None}
+    scene_path = os.path.join(args.out_dir, name + get_extension(props.scene_extension))
+    start = time.perf_counter()
+    try:
+        if not args.no_scene:
+            count = select('MESH', args.include_hidden)
+            if count:
+                report['scene'] = dict(run_export(bpy.ops.mavhod_tool.export_execute, scene_path), objects=count)
+            else:
+                report['scene'] = {'status': 'skipped', 'objects': 0}
+        if not args.no_lights:
+            count = select('LIGHT', args.include_hidden)
+            if count:
+                light_path = os.path.join(args.out_dir, name + "_lights" + get_extension(props.light_extension))
+                report['lights'] = dict(run_export(bpy.ops.mavhod_tool.export_light_execute, light_path), objects=count)
+            else:
+                report['lights'] = {'status': 'skipped', 'objects': 0}
+        report['seconds'] = round(time.perf_counter() - start, 3)
+        sys.stdout.write(RESULT_PREFIX + json.dumps(report) + "\n")
+        sys.stdout.flush()
+        if args.watch:
+            # Reuses the export cache just written, and the library workers kept alive
+            watch_loop = get_addon_module("export_watch").watch_loop
+            watch_loop(bpy.context, scene_path, props.export_watch_interval, props.export_watch_debounce)
+    finally:
+        # Background workers would otherwise keep this Blender process from exiting
+        get_addon_module("export_scene").shutdown_worker_pool()
+    failed = any(part and part['status'] == 'failed' for part in (report['scene'], report['lights']))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
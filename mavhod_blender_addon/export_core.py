@@ -0,0 +1,639 @@
+import os
+import shutil
+import hashlib
+import json
+import re
+import struct
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from .export_profiler import profiled, profile_bytes
+except ImportError:
+    # Imported as a top-level module by export_bg.py in background Blender and by the benchmarks
+    from export_profiler import profiled, profile_bytes
+
+# Export helpers that do not need Blender: path mapping, glTF/GLB patching, scene file
+# writing, the texture hash store and source file polling. export_utils re-exports them
+# for the addon; benchmarks/micro_benchmarks.py imports this module directly with plain Python.
+try:
+    import bpy
+    _abspath = bpy.path.abspath
+except ImportError:
+    # Outside Blender there are no blend-relative "//" paths to resolve
+    def _abspath(path, start=None):
+        return os.path.abspath(os.path.join(start, path) if start else path)
+
+# Trie node key marking the end of a pair's source path (never equal to a path component)
+_PAIR_END = object()
+
+def _split_path(path):
+    return path.replace("\\", "/").split("/")
+
+class PathMapper:
+    """
+    Maps source paths to destination paths with the path pairs of the export settings.
+    Pair sources are stored in a path-component trie, so a lookup walks the components
+    of the path once and uses the longest matching source prefix. Results are memoized
+    per source path for the lifetime of the mapper (one export run).
+    """
+
+    def __init__(self, path_pairs, export_scene_path):
+        self._root = {}
+        self._memo = {}
+        for pair in path_pairs:
+            dest_path = pair['dest_path']
+            # Resolve Blender-relative paths or ensure absolute paths are clean
+            if dest_path.startswith("//") or dest_path.startswith("/"):
+                dest_path = _abspath(dest_path)
+            dest_dir = os.path.join(export_scene_path, dest_path)
+            # Sources are matched as given and symlink-resolved, like the paths looked up
+            for source in {os.path.normpath(pair['source_path']), os.path.realpath(pair['source_path'])}:
+                node = self._root
+                for part in _split_path(source):
+                    node = node.setdefault(part, {})
+                # The first pair wins when two pairs share a source
+                node.setdefault(_PAIR_END, dest_dir)
+
+    def map(self, src_path):
+        """Destination of src_path, or None if no pair source is a prefix of it"""
+        try:
+            return self._memo[src_path]
+        except KeyError:
+            pass
+        parts = _split_path(os.path.normpath(src_path))
+        node = self._root
+        match = None
+        for depth, part in enumerate(parts):
+            node = node.get(part)
+            if node is None: break
+            if _PAIR_END in node:
+                match = (depth + 1, node[_PAIR_END])
+        dst_path = None
+        if match:
+            depth, dest_dir = match
+            dst_path = os.path.realpath(os.path.join(dest_dir, *parts[depth:]))
+        self._memo[src_path] = dst_path
+        return dst_path
+
+class PathResolver:
+    """
+    Per-run cache of path resolution. abspath/realpath/relpath results are memoized per
+    distinct input, so every library, texture and asset path is resolved (and lstat'ed)
+    once per export instead of once per instance. Only valid while the files on disk and
+    the open .blend do not move, so a resolver is created per export run.
+    """
+
+    def __init__(self):
+        self._real = {}
+        self._rel = {}
+        self.hits = 0
+        self.misses = 0
+
+    def realpath(self, path, start=None):
+        """os.path.realpath of the Blender-absolute path ("//" relative to start or the .blend)"""
+        key = (path, start)
+        try:
+            result = self._real[key]
+            self.hits += 1
+            return result
+        except KeyError:
+            pass
+        self.misses += 1
+        result = os.path.realpath(_abspath(path, start=start))
+        self._real[key] = result
+        return result
+
+    def relpath(self, target_path, base_path):
+        """Relative path from base_path to target_path, or the resolved target on another drive"""
+        key = (target_path, base_path)
+        try:
+            result = self._rel[key]
+            self.hits += 1
+            return result
+        except KeyError:
+            pass
+        self.misses += 1
+        abs_target = self.realpath(target_path)
+        abs_base = self.realpath(base_path)
+        try:
+            result = os.path.relpath(abs_target, abs_base)
+        except ValueError:
+            # Paths on different drives (Windows)
+            result = abs_target
+        self._rel[key] = result
+        return result
+
+    def report(self):
+        """One line summary of the cache counters"""
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0.0
+        return (
+            f"Path resolver: {total} lookups, {self.hits} hits ({ratio:.0%}), "
+            f"{len(self._real)} distinct paths, {len(self._rel)} relative paths"
+        )
+
+# Resolver of the export run in progress (None between runs). Module level, like the
+# active profiler, so helpers share one cache without having it passed around.
+_active_resolver = None
+
+def set_active_resolver(resolver):
+    global _active_resolver
+    _active_resolver = resolver
+
+def get_active_resolver():
+    return _active_resolver
+
+def resolve_path(path, start=None):
+    """Resolved absolute path, memoized by the active resolver if there is one"""
+    if _active_resolver is not None: return _active_resolver.realpath(path, start)
+    return os.path.realpath(_abspath(path, start=start))
+
+def get_robust_relpath(target_path, base_path):
+    """
+    Calculate relative path from base_path to target_path.
+    Ensures both paths are absolute and resolves symlinks before calculation.
+    """
+    if not target_path or not base_path: return target_path
+    if _active_resolver is not None: return _active_resolver.relpath(target_path, base_path)
+    abs_target = os.path.realpath(_abspath(target_path))
+    abs_base = os.path.realpath(_abspath(base_path))
+    try:
+        return os.path.relpath(abs_target, abs_base)
+    except (ValueError, Exception):
+        return abs_target
+
+_HASHED_SUFFIX_RE = re.compile(r'_hashed(\.\d+)?$')
+_NODE_TRANSFORM_KEYS = ('translation', 'rotation', 'scale', 'matrix')
+
+def _relocate_image(img, gltf_dir, image_metadata):
+    """
+    Move an exported image to its final destination and point the image URI at it.
+    Returns True if the image entry was changed.
+    """
+    uri = img.get('uri')
+    if not uri: return False
+    hash_name = os.path.splitext(os.path.basename(uri))[0]
+    meta = image_metadata.get(hash_name)
+    final_image_dst = meta.get('dst_path') if meta else None
+    if not final_image_dst: return False
+    current_image_path = os.path.join(gltf_dir, uri)
+    if not os.path.exists(current_image_path): return False
+    if meta.get('processed_path'):
+        # Processed by the texture stage and already placed: drop the exporter's copy
+        final_image_dst = meta['processed_path']
+        os.remove(current_image_path)
+    elif os.path.isfile(final_image_dst) and hash_image_file(final_image_dst) == hash_name:
+        # Texture unchanged: keep the existing file untouched
+        os.remove(current_image_path)
+    else:
+        os.makedirs(os.path.dirname(final_image_dst), exist_ok=True)
+        shutil.move(current_image_path, final_image_dst)
+    rel_uri = get_robust_relpath(final_image_dst, gltf_dir)
+    img['uri'] = rel_uri.replace("\\", "/")
+    img['name'] = os.path.splitext(os.path.basename(final_image_dst))[0]
+    return True
+
+def _use_webp_extension(gltf_data):
+    """
+    Reference WebP images (from the texture stage) through EXT_texture_webp, since core
+    glTF only allows PNG and JPEG texture sources. Returns True if anything was changed.
+    """
+    images = gltf_data.get('images', ())
+    changed = False
+    for texture in gltf_data.get('textures', ()):
+        source = texture.get('source')
+        if source is None or not images[source].get('uri', '').lower().endswith(".webp"): continue
+        texture.setdefault('extensions', {})['EXT_texture_webp'] = {'source': source}
+        del texture['source']
+        changed = True
+    if changed:
+        # No PNG/JPEG fallback is kept, so loaders must support the extension
+        for key in ('extensionsUsed', 'extensionsRequired'):
+            extensions = gltf_data.setdefault(key, [])
+            if 'EXT_texture_webp' not in extensions:
+                extensions.append('EXT_texture_webp')
+    return changed
+
+def patch_gltf_data(gltf_data, gltf_dir, metadata_settings, image_metadata=None):
+    """
+    Apply every patch step to parsed glTF JSON in a single walk:
+    strip node transformations, rewrite image URIs, clean material names and
+    filter metadata (extras) from nodes, meshes, materials and scenes.
+    Returns True if anything was modified.
+    """
+    modified = False
+    strip_node_extras = not metadata_settings.get('node', True)
+    for node in gltf_data.get('nodes', ()):
+        for key in _NODE_TRANSFORM_KEYS:
+            if key in node:
+                del node[key]
+                modified = True
+        if strip_node_extras and 'extras' in node:
+            del node['extras']
+            modified = True
+
+    if image_metadata:
+        for img in gltf_data.get('images', ()):
+            if _relocate_image(img, gltf_dir, image_metadata):
+                modified = True
+        if _use_webp_extension(gltf_data):
+            modified = True
+
+    strip_material_extras = not metadata_settings.get('material', True)
+    for mat in gltf_data.get('materials', ()):
+        if strip_material_extras and 'extras' in mat:
+            del mat['extras']
+            modified = True
+        name = mat.get('name')
+        if name and name.find('_hashed') != -1:
+            clean = _HASHED_SUFFIX_RE.sub('', name)
+            if clean != name:
+                mat['name'] = clean
+                modified = True
+
+    if not metadata_settings.get('mesh', True):
+        for mesh in gltf_data.get('meshes', ()):
+            if 'extras' in mesh:
+                del mesh['extras']
+                modified = True
+            for primitive in mesh.get('primitives', ()):
+                if 'extras' in primitive:
+                    del primitive['extras']
+                    modified = True
+
+    if not metadata_settings.get('scene', True):
+        for scene in gltf_data.get('scenes', ()):
+            if 'extras' in scene:
+                del scene['extras']
+                modified = True
+
+    return modified
+
+def dump_json_bytes(data, compact=False):
+    """Serialize JSON to UTF-8 bytes, either compact (no whitespace) or indented like before."""
+    if compact:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, indent=4).encode('utf-8')
+
+_GLB_MAGIC = b'glTF'
+_GLB_CHUNK_JSON = 0x4E4F534A
+_GLB_CHUNK_BIN = 0x004E4942
+_GLB_HEADER = struct.Struct('<4sII') # magic, version, total length
+_GLB_CHUNK_HEADER = struct.Struct('<II') # chunk length, chunk type
+
+def get_gltf_export_format(object_ext):
+    """glTF exporter format for an object extension: binary GLB for .glb, separate files otherwise."""
+    return 'GLB' if object_ext.lower() == '.glb' else 'GLTF_SEPARATE'
+
+def parse_lod_ratios(text):
+    """Parse the "LOD Ratios" setting ("0.5, 0.25, 0.1") into face ratios in (0, 1), highest first."""
+    ratios = set()
+    for token in (text or "").replace(";", ",").split(","):
+        try:
+            ratio = float(token)
+        except ValueError:
+            continue
+        if 0.0 < ratio < 1.0:
+            ratios.add(ratio)
+    return sorted(ratios, reverse=True)
+
+def get_lod_path(path, level):
+    """Sibling file of an exported asset holding LOD level: rock.gltf -> rock_lod1.gltf"""
+    base, ext = os.path.splitext(path)
+    return f"{base}_lod{level}{ext}"
+
+def is_glb_file(path):
+    with open(path, 'rb') as f:
+        return f.read(4) == _GLB_MAGIC
+
+def read_glb_json(path):
+    """Return (parsed JSON chunk, JSON chunk length) of a GLB file."""
+    with open(path, 'rb') as f:
+        magic, version, total_length = _GLB_HEADER.unpack(f.read(_GLB_HEADER.size))
+        chunk_length, chunk_type = _GLB_CHUNK_HEADER.unpack(f.read(_GLB_CHUNK_HEADER.size))
+        if magic != _GLB_MAGIC or chunk_type != _GLB_CHUNK_JSON:
+            raise ValueError(f"Not a GLB file with a leading JSON chunk: {path}")
+        return json.loads(f.read(chunk_length)), chunk_length
+
+def write_glb_json(path, data, old_chunk_length):
+    """
+    Replace the JSON chunk of a GLB file, leaving the binary chunk untouched.
+    If the new JSON fits in the old chunk it is space-padded to the same length and
+    written in place; otherwise the header is rewritten and the binary chunk streamed over.
+    """
+    json_bytes = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if len(json_bytes) <= old_chunk_length:
+        with open(path, 'r+b') as f:
+            f.seek(_GLB_HEADER.size + _GLB_CHUNK_HEADER.size)
+            f.write(json_bytes.ljust(old_chunk_length, b' '))
+        profile_bytes(old_chunk_length)
+        return
+    json_bytes += b' ' * (-len(json_bytes) % 4)
+    tmp_path = path + ".tmp"
+    with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        _, version, total_length = _GLB_HEADER.unpack(src.read(_GLB_HEADER.size))
+        rest_offset = _GLB_HEADER.size + _GLB_CHUNK_HEADER.size + old_chunk_length
+        new_total = total_length - old_chunk_length + len(json_bytes)
+        dst.write(_GLB_HEADER.pack(_GLB_MAGIC, version, new_total))
+        dst.write(_GLB_CHUNK_HEADER.pack(len(json_bytes), _GLB_CHUNK_JSON))
+        dst.write(json_bytes)
+        src.seek(rest_offset)
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+        profile_bytes(dst.tell())
+    os.replace(tmp_path, path)
+
+def read_glb(path):
+    """Return (parsed JSON chunk, binary chunk bytes) of a GLB file. The binary chunk is b'' when absent."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, total_length = _GLB_HEADER.unpack_from(data, 0)
+    offset = _GLB_HEADER.size
+    chunk_length, chunk_type = _GLB_CHUNK_HEADER.unpack_from(data, offset)
+    if magic != _GLB_MAGIC or chunk_type != _GLB_CHUNK_JSON:
+        raise ValueError(f"Not a GLB file with a leading JSON chunk: {path}")
+    offset += _GLB_CHUNK_HEADER.size
+    gltf_data = json.loads(data[offset:offset + chunk_length])
+    offset += chunk_length
+    if offset + _GLB_CHUNK_HEADER.size <= len(data):
+        chunk_length, chunk_type = _GLB_CHUNK_HEADER.unpack_from(data, offset)
+        if chunk_type == _GLB_CHUNK_BIN:
+            offset += _GLB_CHUNK_HEADER.size
+            return gltf_data, data[offset:offset + chunk_length]
+    return gltf_data, b''
+
+def write_glb(path, data, binary):
+    """Write a whole GLB file (JSON chunk and binary chunk) through a temporary file."""
+    json_bytes = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    json_bytes += b' ' * (-len(json_bytes) % 4)
+    binary = bytes(binary) + b'\0' * (-len(binary) % 4)
+    total_length = _GLB_HEADER.size + _GLB_CHUNK_HEADER.size + len(json_bytes)
+    if binary:
+        total_length += _GLB_CHUNK_HEADER.size + len(binary)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_GLB_HEADER.pack(_GLB_MAGIC, 2, total_length))
+        f.write(_GLB_CHUNK_HEADER.pack(len(json_bytes), _GLB_CHUNK_JSON))
+        f.write(json_bytes)
+        if binary:
+            f.write(_GLB_CHUNK_HEADER.pack(len(binary), _GLB_CHUNK_BIN))
+            f.write(binary)
+    profile_bytes(total_length)
+    os.replace(tmp_path, path)
+
+def patch_glb_output(dst_path, metadata_settings):
+    """
+    Post-process GLB output: patch the JSON chunk directly (images are embedded,
+    so no URIs are rewritten) and leave the binary chunk as written by the exporter.
+    """
+    gltf_data, chunk_length = read_glb_json(dst_path)
+    if patch_gltf_data(gltf_data, os.path.dirname(dst_path), metadata_settings):
+        write_glb_json(dst_path, gltf_data, chunk_length)
+    return dst_path
+
+@profiled("patch_gltf_output")
+def patch_gltf_output(dst_path, metadata_settings, image_metadata=None, object_ext=".gltf", compact=False):
+    """
+    Post-process GLTF output:
+    1. Strip node transformations (identity).
+    2. Patch image URIs using image_metadata.
+    3. Remove hashed suffixes from material names.
+    4. Filter metadata (extras) from nodes, meshes, materials, and scenes.
+    5. Handle file extension renaming.
+    All steps run in one walk (patch_gltf_data). With compact=True the JSON is written
+    without indentation. The file is left untouched when nothing changed or when the
+    patched bytes are identical to the existing ones.
+    Binary GLB files are handled by patch_glb_output.
+    Returns the final path, or None if the file could not be patched.
+    """
+    if not os.path.isfile(dst_path):
+        return None
+
+    try:
+        if is_glb_file(dst_path):
+            return patch_glb_output(dst_path, metadata_settings)
+
+        with open(dst_path, 'rb') as f:
+            original = f.read()
+        gltf_data = json.loads(original)
+
+        modified = patch_gltf_data(gltf_data, os.path.dirname(dst_path), metadata_settings, image_metadata)
+
+        # Determine final output path
+        dst_ext = os.path.splitext(dst_path)[1]
+        if dst_ext.lower() != object_ext.lower():
+            final_path = os.path.splitext(dst_path)[0] + object_ext
+        else:
+            final_path = dst_path
+
+        if not modified and final_path == dst_path:
+            return final_path
+        patched = dump_json_bytes(gltf_data, compact)
+        if final_path != dst_path or patched != original:
+            with open(final_path, 'wb') as f:
+                f.write(patched)
+            profile_bytes(len(patched))
+            if final_path != dst_path and os.path.isfile(dst_path):
+                os.remove(dst_path)
+        return final_path
+
+    except Exception as e:
+        print(f"Error patching GLTF {dst_path}: {str(e)}")
+        return None
+
+class SceneJsonWriter:
+    """
+    Streaming writer for the aggregate scene file: {"instances": [...], <other sections>}.
+    Instance records are appended as they are produced instead of being kept in memory.
+    Output goes to a temporary file that commit() renames over the target, so a crashed
+    or cancelled export never leaves a truncated scene file behind.
+    """
+
+    def __init__(self, filepath, compact=False):
+        self.filepath = filepath
+        self.compact = compact
+        self.count = 0
+        self._tmp_path = filepath + ".tmp"
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._file.write('{"instances":[' if compact else '{\n    "instances": [')
+
+    @staticmethod
+    def _default(value):
+        # Packed arrays (e.g. MultiMesh transforms) are written as plain JSON lists
+        if isinstance(value, array):
+            return value.tolist()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def _encode(self, value, depth):
+        if self.compact:
+            return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=self._default)
+        # Match json.dump(indent=4) output for a value nested `depth` levels deep
+        return json.dumps(value, indent=4, default=self._default).replace("\n", "\n" + "    " * depth)
+
+    def write_instance(self, record):
+        if self.compact:
+            self._file.write(("," if self.count else "") + self._encode(record, 2))
+        else:
+            self._file.write(("," if self.count else "") + "\n        " + self._encode(record, 2))
+        self.count += 1
+
+    def commit(self, sections=None, publish=True):
+        """
+        Close the instances array, write the remaining top-level sections and publish the file.
+        With publish=False the finished file stays under its temporary name until publish().
+        """
+        if self.compact:
+            self._file.write("]")
+            for key, value in (sections or {}).items():
+                self._file.write("," + json.dumps(key) + ":" + self._encode(value, 1))
+            self._file.write("}")
+        else:
+            self._file.write("\n    ]" if self.count else "]")
+            for key, value in (sections or {}).items():
+                self._file.write(",\n    " + json.dumps(key) + ": " + self._encode(value, 1))
+            self._file.write("\n}")
+        self._file.close()
+        if publish:
+            self.publish()
+
+    def publish(self):
+        """Rename the finished temporary file over the target."""
+        os.replace(self._tmp_path, self.filepath)
+
+    def abort(self):
+        """Drop the partial output, leaving any previous scene file untouched."""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.isfile(self._tmp_path):
+            os.remove(self._tmp_path)
+
+def write_json_file(filepath, data, compact=False):
+    """Write a whole JSON document (compact or indent=4) through a temporary file"""
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if compact:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False, default=SceneJsonWriter._default)
+        else:
+            json.dump(data, f, indent=4, default=SceneJsonWriter._default)
+    os.replace(tmp_path, filepath)
+
+# Content hashes of image files: { real_path: (size, mtime_ns, sha256 hex) }.
+# Kept for the lifetime of the process, so unchanged textures are only stat'ed.
+_image_hashes = {}
+
+# Files at least this large are hashed on the thread pool by hash_image_files
+_LARGE_IMAGE_SIZE = 4 * 1024 * 1024
+
+# Linux FICLONE ioctl: copy-on-write clone of a whole file (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+def hash_image_file(real_path):
+    """
+    Return the SHA-256 of the file content.
+    The result is memoized by (size, mtime), so an unchanged file costs one stat.
+    """
+    st = os.stat(real_path)
+    cached = _image_hashes.get(real_path)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    hash_obj = hashlib.sha256()
+    with open(real_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hash_obj.update(chunk)
+    digest = hash_obj.hexdigest()
+    _image_hashes[real_path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+def hash_image_files(real_paths, max_workers=None):
+    """
+    Hash many image files up front: small files inline, large ones on a thread pool
+    (hashlib releases the GIL). Returns { real_path: sha256 hex } for readable files.
+    """
+    hashes = {}
+    large_paths = []
+    for real_path in set(real_paths):
+        try:
+            if os.path.getsize(real_path) >= _LARGE_IMAGE_SIZE:
+                large_paths.append(real_path)
+            else:
+                hashes[real_path] = hash_image_file(real_path)
+        except OSError as e:
+            print(f"Warning: Could not hash image {real_path}: {str(e)}")
+    if large_paths:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for real_path, digest in zip(large_paths, executor.map(hash_image_file, large_paths)):
+                hashes[real_path] = digest
+    return hashes
+
+def load_image_hash_index(index_path):
+    """Merge a saved { real_path: [size, mtime_ns, digest] } index into the in-memory hashes."""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for real_path, entry in json.load(f).items():
+                _image_hashes.setdefault(real_path, tuple(entry))
+    except (OSError, ValueError):
+        pass
+
+def save_image_hash_index(index_path):
+    try:
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(_image_hashes, f)
+    except OSError as e:
+        print(f"Warning: Could not save image hash index {index_path}: {str(e)}")
+
+def clone_or_copy(src_path, dst_path):
+    """
+    Put a copy of src_path at dst_path, using a copy-on-write reflink when the filesystem
+    supports it and a regular copy otherwise. Hardlinks are not used because the glTF
+    exporter rewrites the staged image in place, which would modify the source texture.
+    """
+    try:
+        import fcntl
+        with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        shutil.copystat(src_path, dst_path)
+        return
+    except (ImportError, OSError):
+        pass
+    shutil.copy2(src_path, dst_path)
+
+def _stat_signature(path):
+    try:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    except OSError:
+        return None
+
+class SourceWatcher:
+    """
+    Polls the size and mtime of a set of source files. Changes are collected until no
+    watched file has changed for `debounce` seconds, then poll() returns them as one
+    batch, so a burst of saves (or a file still being written) triggers a single export.
+    """
+
+    def __init__(self, debounce=2.0):
+        self.debounce = debounce
+        self._signatures = {}
+        self._pending = set()
+        self._last_change = 0.0
+
+    def watch(self, paths):
+        """Set the watched files. Files new to the set start from their current state."""
+        self._signatures = {
+            path: self._signatures[path] if path in self._signatures else _stat_signature(path)
+            for path in paths
+        }
+
+    def poll(self, now=None):
+        """Stat every watched file. Returns the changed paths once they have settled, else an empty set."""
+        now = time.monotonic() if now is None else now
+        for path, signature in self._signatures.items():
+            current = _stat_signature(path)
+            if current != signature:
+                self._signatures[path] = current
+                self._pending.add(path)
+                self._last_change = now
+        if not self._pending or now - self._last_change < self.debounce:
+            return set()
+        changed, self._pending = self._pending, set()
+        return changed
@@ -0,0 +1,443 @@
+import os
+import json
+import numpy as np
+from urllib.parse import unquote
+try:
+    from .export_core import dump_json_bytes, is_glb_file, read_glb, write_glb
+    from .export_profiler import profiled, profile_bytes
+except ImportError:
+    # Imported as a top-level module by the benchmarks
+    from export_core import dump_json_bytes, is_glb_file, read_glb, write_glb
+    from export_profiler import profiled, profile_bytes
+
+# Post-export geometry pass on the glTF binary buffers (does not import Blender):
+# weld duplicate vertices, order triangles for the post-transform vertex cache, order
+# vertices by first use for fetch locality and optionally quantize attributes
+# (KHR_mesh_quantization). Every triangle primitive is rewritten as one bufferView per
+# accessor; other accessors (animations, skins, morph targets) are copied unchanged.
+
+_COMPONENT_DTYPES = {
+    5120: np.dtype('i1'), 5121: np.dtype('u1'), 5122: np.dtype('<i2'),
+    5123: np.dtype('<u2'), 5125: np.dtype('<u4'), 5126: np.dtype('<f4'),
+}
+_DTYPE_COMPONENTS = {(dtype.kind, dtype.itemsize): component for component, dtype in _COMPONENT_DTYPES.items()}
+_TYPE_COMPONENTS = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4}
+_COMPONENT_TYPES = {count: name for name, count in _TYPE_COMPONENTS.items()}
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+_TRIANGLES = 4
+
+# Files using these are left untouched: they compress or reference geometry themselves
+# (KHR_mesh_quantization: already optimized)
+_UNSUPPORTED_EXTENSIONS = {
+    'KHR_draco_mesh_compression', 'EXT_meshopt_compression', 'EXT_mesh_gpu_instancing', 'KHR_mesh_quantization'
+}
+_NODE_TRANSFORM_KEYS = ('translation', 'rotation', 'scale', 'matrix')
+
+# Entries of the simulated FIFO post-transform cache; 16 suits current GPUs
+VERTEX_CACHE_SIZE = 16
+
+def read_accessor(gltf_data, binary, index):
+    """Values of accessor index as a (count, components) array. Raises ValueError for sparse or empty accessors."""
+    accessor = gltf_data['accessors'][index]
+    if 'sparse' in accessor or 'bufferView' not in accessor or accessor['type'] not in _TYPE_COMPONENTS:
+        raise ValueError(f"unsupported accessor {index}")
+    view = gltf_data['bufferViews'][accessor['bufferView']]
+    dtype = _COMPONENT_DTYPES[accessor['componentType']]
+    components = _TYPE_COMPONENTS[accessor['type']]
+    count = accessor['count']
+    element_size = dtype.itemsize * components
+    stride = view.get('byteStride', element_size)
+    offset = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    if count == 0:
+        return np.zeros((0, components), dtype)
+    raw = np.frombuffer(binary, np.uint8, stride * (count - 1) + element_size, offset)
+    rows = np.lib.stride_tricks.as_strided(raw, (count, element_size), (stride, 1))
+    return np.ascontiguousarray(rows).view(dtype).reshape(count, components)
+
+def weld_vertices(attributes, indices):
+    """
+    Merge vertices whose attributes are bitwise identical (after quantization this also
+    merges near duplicates). attributes is { name: (array, normalized) }.
+    Returns (attributes, indices) with the unique vertices in first-seen order.
+    """
+    columns = []
+    for values, _ in attributes.values():
+        if values.dtype.kind == 'f':
+            values = np.where(values == 0, 0, values).astype(values.dtype) # -0.0 == 0.0
+        columns.append(np.ascontiguousarray(values).view(np.uint8).reshape(len(values), -1))
+    rows = np.ascontiguousarray(np.concatenate(columns, axis=1))
+    keys = rows.view(np.dtype((np.void, rows.shape[1]))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    if len(first) == len(keys):
+        return attributes, indices
+    welded = {name: (values[first], normalized) for name, (values, normalized) in attributes.items()}
+    return welded, inverse.ravel()[indices].astype(np.uint32)
+
+def remove_degenerate_triangles(indices):
+    """Drop triangles using a vertex twice (welding can create them)"""
+    triangles = indices.reshape(-1, 3)
+    keep = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    return triangles[keep].ravel()
+
+def optimize_vertex_cache(indices, vertex_count, cache_size=VERTEX_CACHE_SIZE):
+    """
+    Reorder triangles for the post-transform vertex cache (Tipsify, Sander et al. 2007):
+    fan around a vertex, then continue with the emitted vertex most likely to still be
+    cached, falling back to recently emitted and then to unvisited vertices. Runs in
+    linear time; triangle winding is kept.
+    """
+    triangle_count = len(indices) // 3
+    if triangle_count == 0: return indices
+    # Triangles of each vertex, from a stable sort of the corner list
+    counts = np.bincount(indices, minlength=vertex_count)
+    offsets = np.zeros(vertex_count + 1, np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    adjacency = (np.argsort(indices, kind='stable') // 3).tolist()
+    offsets = offsets.tolist()
+    live = counts.tolist()
+    corners = indices.tolist()
+    cache_time = [0] * vertex_count
+    emitted = bytearray(triangle_count)
+    dead_end = []
+    order = []
+    time_stamp = cache_size + 1
+    cursor = 0
+    fan = 0
+    while fan >= 0:
+        candidates = []
+        for triangle in adjacency[offsets[fan]:offsets[fan + 1]]:
+            if emitted[triangle]: continue
+            emitted[triangle] = 1
+            order.append(triangle)
+            for vertex in corners[3 * triangle:3 * triangle + 3]:
+                dead_end.append(vertex)
+                candidates.append(vertex)
+                live[vertex] -= 1
+                if time_stamp - cache_time[vertex] > cache_size:
+                    cache_time[vertex] = time_stamp
+                    time_stamp += 1
+        # Next fan: the candidate with live triangles that stays in cache the longest
+        fan = -1
+        best = -1
+        for vertex in candidates:
+            if live[vertex] <= 0: continue
+            age = time_stamp - cache_time[vertex]
+            priority = age if age + 2 * live[vertex] <= cache_size else 0
+            if priority > best:
+                best = priority
+                fan = vertex
+        while fan < 0 and dead_end:
+            vertex = dead_end.pop()
+            if live[vertex] > 0: fan = vertex
+        if fan < 0:
+            while cursor < vertex_count and live[cursor] <= 0:
+                cursor += 1
+            if cursor < vertex_count: fan = cursor
+    return indices.reshape(-1, 3)[order].ravel()
+
+def optimize_vertex_fetch(attributes, indices):
+    """Renumber vertices in the order the index buffer first uses them, dropping unused ones"""
+    used, first = np.unique(indices, return_index=True)
+    order = used[np.argsort(first, kind='stable')]
+    remap = np.zeros(int(indices.max()) + 1 if len(indices) else 0, np.uint32)
+    remap[order] = np.arange(len(order), dtype=np.uint32)
+    fetched = {name: (values[order], normalized) for name, (values, normalized) in attributes.items()}
+    return fetched, remap[indices]
+
+def get_acmr(indices, cache_size=VERTEX_CACHE_SIZE):
+    """Average cache miss ratio (vertex shader runs per triangle) of a FIFO cache, for reports and benchmarks"""
+    cache = [-1] * cache_size
+    cached = set()
+    head = 0
+    misses = 0
+    for vertex in indices.tolist():
+        if vertex in cached: continue
+        misses += 1
+        cached.discard(cache[head])
+        cache[head] = vertex
+        cached.add(vertex)
+        head = (head + 1) % cache_size
+    return misses / max(1, len(indices) // 3)
+
+def _quantize_snorm(values, bits):
+    scale = (1 << (bits - 1)) - 1
+    return np.round(np.clip(values, -1.0, 1.0) * scale).astype(np.int8 if bits == 8 else np.int16)
+
+def _quantize_unorm(values, bits):
+    scale = (1 << bits) - 1
+    return np.round(np.clip(values, 0.0, 1.0) * scale).astype(np.uint8 if bits == 8 else np.uint16)
+
+def quantize_attributes(attributes, position_transform=None):
+    """
+    KHR_mesh_quantization storage: normals and tangents as normalized bytes, UVs inside
+    [0, 1] as normalized unsigned shorts, positions as normalized shorts relative to
+    position_transform ((center, extent), undone by the node transform) when given.
+    Other attributes, and float attributes out of range, are kept as they are.
+    """
+    quantized = {}
+    for name, (values, normalized) in attributes.items():
+        if values.dtype.kind != 'f':
+            quantized[name] = (values, normalized)
+        elif name == 'POSITION' and position_transform:
+            center, extent = position_transform
+            quantized[name] = (_quantize_snorm((values - center) / extent, 16), True)
+        elif name in ('NORMAL', 'TANGENT'):
+            quantized[name] = (_quantize_snorm(values, 8), True)
+        elif name.startswith('TEXCOORD_') and len(values) and values.min() >= 0.0 and values.max() <= 1.0:
+            quantized[name] = (_quantize_unorm(values, 16), True)
+        else:
+            quantized[name] = (values, normalized)
+    return quantized
+
+def _get_mesh_nodes(gltf_data):
+    mesh_nodes = {}
+    for node_index, node in enumerate(gltf_data.get('nodes', ())):
+        if 'mesh' in node:
+            mesh_nodes.setdefault(node['mesh'], []).append(node_index)
+    return mesh_nodes
+
+def _can_quantize_positions(gltf_data, node_indices):
+    """
+    Quantized positions are dequantized by the transform of the nodes using the mesh, so
+    these must be untransformed leaf nodes without skin or animation
+    (patch_gltf_data strips the node transforms of exported assets).
+    """
+    animated = {
+        channel['target'].get('node')
+        for animation in gltf_data.get('animations', ()) for channel in animation.get('channels', ())
+    }
+    for node_index in node_indices:
+        node = gltf_data['nodes'][node_index]
+        if node.get('children') or 'skin' in node or node_index in animated: return False
+        if any(key in node for key in _NODE_TRANSFORM_KEYS): return False
+    return bool(node_indices)
+
+def _read_primitive(gltf_data, binary, primitive):
+    attributes = {}
+    for name, index in primitive['attributes'].items():
+        attributes[name] = (read_accessor(gltf_data, binary, index), gltf_data['accessors'][index].get('normalized', False))
+    counts = {len(values) for values, _ in attributes.values()}
+    if len(counts) != 1:
+        raise ValueError("attribute counts differ")
+    if 'indices' in primitive:
+        indices = read_accessor(gltf_data, binary, primitive['indices'])[:, 0].astype(np.uint32)
+    else:
+        indices = np.arange(counts.pop(), dtype=np.uint32)
+    if len(indices) % 3:
+        raise ValueError("index count is not a multiple of 3")
+    return attributes, indices
+
+def _get_vertex_count(attributes):
+    return len(next(iter(attributes.values()))[0])
+
+def _add_accessor(gltf_data, pending, values, normalized, target, bounds=False):
+    """Append an accessor for values; its data is laid out by _rebuild_buffer. Returns its index."""
+    accessor = {
+        'componentType': _DTYPE_COMPONENTS[(values.dtype.kind, values.dtype.itemsize)],
+        'count': len(values),
+        'type': _COMPONENT_TYPES[values.shape[1]] if target == _ARRAY_BUFFER else 'SCALAR',
+    }
+    if normalized: accessor['normalized'] = True
+    if bounds and len(values):
+        cast = float if values.dtype.kind == 'f' else int
+        accessor['min'] = [cast(value) for value in values.min(axis=0)]
+        accessor['max'] = [cast(value) for value in values.max(axis=0)]
+    index = len(gltf_data['accessors'])
+    gltf_data['accessors'].append(accessor)
+    data = np.ascontiguousarray(values.astype(values.dtype.newbyteorder('<'))).view(np.uint8).reshape(len(values), -1)
+    stride = None
+    if target == _ARRAY_BUFFER and data.shape[1] % 4:
+        # Vertex attribute elements must start on 4-byte boundaries
+        stride = data.shape[1] + (-data.shape[1] % 4)
+        padded = np.zeros((len(values), stride), np.uint8)
+        padded[:, :data.shape[1]] = data
+        data = padded
+    pending[index] = (data.tobytes(), target, stride)
+    return index
+
+def _get_used_accessors(gltf_data):
+    used = set()
+    for mesh in gltf_data.get('meshes', ()):
+        for primitive in mesh.get('primitives', ()):
+            used.update(primitive.get('attributes', {}).values())
+            if 'indices' in primitive: used.add(primitive['indices'])
+            for target in primitive.get('targets', ()):
+                used.update(target.values())
+    for skin in gltf_data.get('skins', ()):
+        if 'inverseBindMatrices' in skin: used.add(skin['inverseBindMatrices'])
+    for animation in gltf_data.get('animations', ()):
+        for sampler in animation.get('samplers', ()):
+            used.update((sampler['input'], sampler['output']))
+    return sorted(used)
+
+def _remap_accessors(gltf_data, remap):
+    for mesh in gltf_data.get('meshes', ()):
+        for primitive in mesh.get('primitives', ()):
+            attributes = primitive.get('attributes', {})
+            for name in attributes: attributes[name] = remap[attributes[name]]
+            if 'indices' in primitive: primitive['indices'] = remap[primitive['indices']]
+            for target in primitive.get('targets', ()):
+                for name in target: target[name] = remap[target[name]]
+    for skin in gltf_data.get('skins', ()):
+        if 'inverseBindMatrices' in skin: skin['inverseBindMatrices'] = remap[skin['inverseBindMatrices']]
+    for animation in gltf_data.get('animations', ()):
+        for sampler in animation.get('samplers', ()):
+            sampler['input'] = remap[sampler['input']]
+            sampler['output'] = remap[sampler['output']]
+
+def _rebuild_buffer(gltf_data, binary, pending):
+    """
+    Drop the accessors and bufferViews no longer referenced, copy the remaining views and
+    append the pending accessor data, all 4-byte aligned. Returns the new buffer bytes.
+    """
+    used = _get_used_accessors(gltf_data)
+    _remap_accessors(gltf_data, {old: new for new, old in enumerate(used)})
+    accessors = [gltf_data['accessors'][old] for old in used]
+    old_views = gltf_data.get('bufferViews', [])
+    # Views still referenced by kept accessors (including sparse ones) and embedded images
+    view_refs = []
+    for old, accessor in zip(used, accessors):
+        if old in pending: continue
+        if 'bufferView' in accessor: view_refs.append(accessor)
+        sparse = accessor.get('sparse')
+        if sparse:
+            view_refs += [sparse['indices'], sparse['values']]
+    view_refs += [image for image in gltf_data.get('images', ()) if 'bufferView' in image]
+    out = bytearray()
+    views = []
+    view_remap = {}
+
+    def append_view(data, view):
+        out.extend(b'\0' * (-len(out) % 4))
+        view['buffer'] = 0
+        view['byteOffset'] = len(out)
+        view['byteLength'] = len(data)
+        out.extend(data)
+        views.append(view)
+        return len(views) - 1
+
+    for old_view in sorted({ref['bufferView'] for ref in view_refs}):
+        view = dict(old_views[old_view])
+        offset = view.get('byteOffset', 0)
+        view_remap[old_view] = append_view(binary[offset:offset + view['byteLength']], view)
+    for ref in view_refs:
+        ref['bufferView'] = view_remap[ref['bufferView']]
+    for old, accessor in zip(used, accessors):
+        if old not in pending: continue
+        data, target, stride = pending[old]
+        view = {'target': target}
+        if stride: view['byteStride'] = stride
+        accessor['bufferView'] = append_view(data, view)
+    out.extend(b'\0' * (-len(out) % 4))
+    gltf_data['accessors'] = accessors
+    gltf_data['bufferViews'] = views
+    gltf_data['buffers'][0]['byteLength'] = len(out)
+    return bytes(out)
+
+def optimize_gltf_data(gltf_data, binary, quantize=False, cache_size=VERTEX_CACHE_SIZE):
+    """
+    Optimize every indexable triangle primitive of parsed glTF JSON backed by binary (its
+    only buffer). Modifies gltf_data in place and returns (new buffer bytes, vertices
+    before, vertices after), or None when the file holds nothing this pass can rewrite.
+    """
+    if len(gltf_data.get('buffers', ())) != 1: return None
+    if _UNSUPPORTED_EXTENSIONS & set(gltf_data.get('extensionsUsed', ())): return None
+    mesh_nodes = _get_mesh_nodes(gltf_data)
+    pending = {} # new accessor index -> (bytes, target, byteStride)
+    vertices_before = vertices_after = 0
+    quantized = False
+    for mesh_index, mesh in enumerate(gltf_data.get('meshes', ())):
+        primitives = []
+        for primitive in mesh.get('primitives', ()):
+            if primitive.get('mode', _TRIANGLES) != _TRIANGLES or 'targets' in primitive: continue
+            if 'POSITION' not in primitive.get('attributes', {}): continue
+            try:
+                primitives.append((primitive,) + _read_primitive(gltf_data, binary, primitive))
+            except (ValueError, KeyError):
+                continue
+        if not primitives: continue
+        position_transform = None
+        node_indices = mesh_nodes.get(mesh_index, [])
+        if quantize and len(primitives) == len(mesh['primitives']) and _can_quantize_positions(gltf_data, node_indices):
+            positions = np.concatenate([attributes['POSITION'][0] for _, attributes, _ in primitives])
+            if positions.dtype.kind == 'f' and len(positions):
+                low, high = positions.min(axis=0).astype(np.float64), positions.max(axis=0).astype(np.float64)
+                # Uniform scale: a non-uniform node scale would skew the normals
+                position_transform = ((low + high) / 2, max(float((high - low).max()) / 2, 1e-6))
+        for primitive, attributes, indices in primitives:
+            vertices_before += _get_vertex_count(attributes)
+            if quantize:
+                stored = quantize_attributes(attributes, position_transform)
+                quantized = quantized or any(stored[name][0] is not attributes[name][0] for name in attributes)
+                attributes = stored
+            attributes, indices = weld_vertices(attributes, indices)
+            indices = remove_degenerate_triangles(indices)
+            indices = optimize_vertex_cache(indices, _get_vertex_count(attributes), cache_size)
+            attributes, indices = optimize_vertex_fetch(attributes, indices)
+            vertex_count = _get_vertex_count(attributes)
+            vertices_after += vertex_count
+            primitive['attributes'] = {
+                name: _add_accessor(gltf_data, pending, values, normalized, _ARRAY_BUFFER, bounds=(name == 'POSITION'))
+                for name, (values, normalized) in attributes.items()
+            }
+            # The largest value of an index type is reserved for primitive restart
+            index_dtype = np.uint16 if vertex_count < 0xFFFF else np.uint32
+            primitive['indices'] = _add_accessor(gltf_data, pending, indices.astype(index_dtype).reshape(-1, 1), False, _ELEMENT_ARRAY_BUFFER)
+        if position_transform:
+            center, extent = position_transform
+            for node_index in node_indices:
+                gltf_data['nodes'][node_index]['translation'] = [float(value) for value in center]
+                gltf_data['nodes'][node_index]['scale'] = [extent] * 3
+    if not pending: return None
+    if quantized:
+        # Integer positions/normals/UVs are only valid glTF with the extension
+        for key in ('extensionsUsed', 'extensionsRequired'):
+            extensions = gltf_data.setdefault(key, [])
+            if 'KHR_mesh_quantization' not in extensions:
+                extensions.append('KHR_mesh_quantization')
+    return _rebuild_buffer(gltf_data, binary, pending), vertices_before, vertices_after
+
+@profiled("optimize_geometry")
+def optimize_gltf_file(path, quantize=False, compact=False, cache_size=VERTEX_CACHE_SIZE):
+    """
+    Run the geometry pass on an exported .gltf (with its .bin) or .glb file.
+    Returns { before, after (file bytes), vertices_before, vertices_after }, or None
+    when the file was left unchanged.
+    """
+    if is_glb_file(path):
+        gltf_data, binary = read_glb(path)
+        bin_path = None
+        size_before = os.path.getsize(path)
+    else:
+        with open(path, 'rb') as f:
+            original = f.read()
+        gltf_data = json.loads(original)
+        buffers = gltf_data.get('buffers', ())
+        uri = buffers[0].get('uri', '') if len(buffers) == 1 else ''
+        # Embedded (data:) buffers are not rewritten
+        if not uri or uri.startswith('data:'): return None
+        bin_path = os.path.join(os.path.dirname(path), unquote(uri))
+        with open(bin_path, 'rb') as f:
+            binary = f.read()
+        size_before = len(original) + len(binary)
+    result = optimize_gltf_data(gltf_data, binary, quantize, cache_size)
+    if result is None: return None
+    binary, vertices_before, vertices_after = result
+    if bin_path is None:
+        write_glb(path, gltf_data, binary)
+        size_after = os.path.getsize(path)
+    else:
+        tmp_path = bin_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(binary)
+        os.replace(tmp_path, bin_path)
+        patched = dump_json_bytes(gltf_data, compact)
+        with open(path, 'wb') as f:
+            f.write(patched)
+        size_after = len(patched) + len(binary)
+        profile_bytes(size_after)
+    return {
+        'before': size_before, 'after': size_after,
+        'vertices_before': vertices_before, 'vertices_after': vertices_after,
+    }
@@ -1,7 +1,9 @@
 import bpy
-import json
 import os
-from .export_utils import convert_zup_to_yup
+from .export_utils import batch_convert_zup_to_yup, transform_records
+from .export_utils import get_chunk_cell, get_chunk_filepath, get_chunk_bounds, write_json_file
+from .export_utils import get_light_range, get_light_bounding_sphere, build_light_cell_table, get_light_table_path
+from .godot_variant import write_variant_file
 from bpy_extras.io_utils import ExportHelper
 
 
@@ -37,19 +39,20 @@ class MavhodExportLightExecute(bpy.types.Operator):
 
 	@staticmethod
 	def _collect_light_data(context):
-		"""Collect selected light objects and prepare data for JSON export"""
+		"""
+		Collect selected light objects and prepare data for JSON export.
+		Returns (lights_data, influences): influences holds the input of
+		build_light_cell_table for every light (None for sun lights).
+		"""
 		props = context.scene.MavhodToolProps
 
 		lights_data = []
-		for obj in context.selected_objects:
-			if obj.type != 'LIGHT':
-				continue
-
+		influences = []
+		light_objects = [obj for obj in context.selected_objects if obj.type == 'LIGHT']
+		# Convert all world transforms to Y-up in one vectorized pass
+		yup_matrices, *yup_transform = batch_convert_zup_to_yup(light_objects)
+		for obj, transform, matrix in zip(light_objects, transform_records(*yup_transform), yup_matrices):
 			light = obj.data
-			world_matrix = obj.matrix_world
-			loc, rot_quat, scale = world_matrix.decompose()
-
-			loc_G, rot_quat_G, scale_G = convert_zup_to_yup(loc, rot_quat, scale)
 			# Map Blender light types to common names
 			light_type_map = {
 				'POINT': 'point',
@@ -65,9 +68,7 @@ class MavhodExportLightExecute(bpy.types.Operator):
 				"type": game_type,
 				"color": {"r": light.color.r, "g": light.color.g, "b": light.color.b},
 				"energy": light.energy,
-				"location": {"x": loc_G.x, "y": loc_G.y, "z": loc_G.z},
-				"rotation": {"x": rot_quat_G.x, "y": rot_quat_G.y, "z": rot_quat_G.z, "w": rot_quat_G.w},
-				"scale": {"x": scale_G.x, "y": scale_G.y, "z": scale_G.z}
+				**transform
 			}
 
 			# Type-specific properties
@@ -83,6 +84,26 @@ class MavhodExportLightExecute(bpy.types.Operator):
 
 			if bl_type == 'SUN':
 				light_entry["angle"] = light.angle
+				influences.append(None)
+			else:
+				# Influence radius (Godot omni_range / spot_range)
+				cutoff = light.cutoff_distance if getattr(light, "use_custom_distance", False) else 0.0
+				radius = get_light_range(light.energy, light.color, props.export_light_threshold, cutoff)
+				light_entry["range"] = radius
+				# Blender lights shine along local -Z, which is the Y-up matrix's -Y column
+				position = matrix[:3, 3].tolist()
+				direction = -matrix[:3, 1]
+				direction = (direction / max(float((direction ** 2).sum()) ** 0.5, 1e-12)).tolist()
+				center, sphere_radius = get_light_bounding_sphere(
+					position, direction, radius, light.spot_size if bl_type == 'SPOT' else None
+				)
+				influences.append({
+					"position": position,
+					"range": radius,
+					"center": center,
+					"radius": sphere_radius,
+					"intensity": light.energy * max(light.color)
+				})
 
 			# Optional metadata
 			if props.export_metadata_light:
@@ -107,7 +128,45 @@ class MavhodExportLightExecute(bpy.types.Operator):
 
 			lights_data.append(light_entry)
 
-		return lights_data
+		return lights_data, influences
+
+	@staticmethod
+	def _write_light_file(filepath, data):
+		if filepath.lower().endswith(".dbin"):
+			write_variant_file(filepath, data)
+		else:
+			write_json_file(filepath, data)
+
+	def _write_cell_table(self, light_data, influences, props):
+		"""Write the per-cell top-K light table next to the light file. Returns (path, cell count, dropped)."""
+		cell_size = props.export_light_cell_size
+		table, dropped = build_light_cell_table(
+			[light_entry["name"] for light_entry in light_data], influences, cell_size, props.export_light_cell_limit
+		)
+		table_path = get_light_table_path(self.filepath)
+		MavhodExportLightExecute._write_light_file(table_path, table)
+		return table_path, len(table["cells"]) // 4, dropped
+
+	def _write_chunks(self, light_data, chunk_size, sections):
+		"""Write one light file per grid cell (same grid as the scene export) plus an index at self.filepath"""
+		cells = {}
+		for light_entry in light_data:
+			location = light_entry["location"]
+			cells.setdefault(get_chunk_cell(location["x"], location["z"], chunk_size), []).append(light_entry)
+		index = []
+		for cell in sorted(cells):
+			lights = cells[cell]
+			cell_path = get_chunk_filepath(self.filepath, cell)
+			MavhodExportLightExecute._write_light_file(cell_path, {"lights": lights})
+			heights = [light_entry["location"]["y"] for light_entry in lights]
+			index.append({
+				"cell": list(cell),
+				"path": os.path.basename(cell_path),
+				"bounds": get_chunk_bounds(cell, chunk_size, min(heights), max(heights)),
+				"light_count": len(lights)
+			})
+		MavhodExportLightExecute._write_light_file(self.filepath, {"chunk_size": chunk_size, "cells": index, **sections})
+		return len(index)
 
 	def execute(self, context):
 		if not self.filepath:
@@ -119,19 +178,33 @@ class MavhodExportLightExecute(bpy.types.Operator):
 		try:
 			os.makedirs(export_scene_path, exist_ok=True)
 
-			light_data = MavhodExportLightExecute._collect_light_data(context)
+			light_data, influences = MavhodExportLightExecute._collect_light_data(context)
 
 			if not light_data:
 				self.report({'WARNING'}, "No selected lights found!")
 				return {'CANCELLED'}
 
-			light_json_data = {"lights": light_data}
-			with open(self.filepath, 'w', encoding='utf-8') as f:
-				json.dump(light_json_data, f, indent=4)
-
-			self.report({'INFO'}, f"Exported {len(light_data)} light(s) to {self.filepath}")
+			props = context.scene.MavhodToolProps
+			table_msg = ""
+			sections = {}
+			if props.export_light_cell_size > 0:
+				table_path, table_cells, dropped = self._write_cell_table(light_data, influences, props)
+				# The light file names its table so the runtime can find it
+				sections["cell_table"] = os.path.basename(table_path)
+				table_msg = f", light table for {table_cells} cell(s) ({dropped} over the limit) in {os.path.basename(table_path)}"
+
+			chunk_size = props.export_chunk_size
+			if chunk_size > 0:
+				cell_count = self._write_chunks(light_data, chunk_size, sections)
+				self.report({'INFO'}, f"Exported {len(light_data)} light(s) in {cell_count} cell(s) to {self.filepath}{table_msg}")
+				return {'FINISHED'}
+
+			light_json_data = {"lights": light_data, **sections}
+			MavhodExportLightExecute._write_light_file(self.filepath, light_json_data)
+
+			self.report({'INFO'}, f"Exported {len(light_data)} light(s) to {self.filepath}{table_msg}")
 		except Exception as e:
-			self.report({'ERROR'}, f"Could not save light JSON file: {str(e)}")
+			self.report({'ERROR'}, f"Could not save light file: {str(e)}")
 			return {'CANCELLED'}
 
 		return {'FINISHED'}
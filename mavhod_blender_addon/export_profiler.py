@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import threading
+import functools
+
+class _NullStage:
+	"""Stand-in for ExportProfiler.stage() while profiling is off"""
+
+	def __enter__(self):
+		return {'bytes': 0, 'subprocesses': 0}
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+	def __init__(self, profiler, name, asset):
+		self._profiler = profiler
+		self._name = name
+		self._asset = asset
+		self.record = {'bytes': 0, 'subprocesses': 0}
+
+	def __enter__(self):
+		self._start = time.perf_counter()
+		self._profiler._stack.append(self.record)
+		return self.record
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self._profiler._stack.pop()
+		self._profiler.record(
+			self._name, self._start, time.perf_counter(), self._asset,
+			self.record['bytes'], self.record['subprocesses']
+		)
+		return False
+
+class ExportProfiler:
+	"""
+	Wall time, bytes written, subprocesses started and bpy.data datablock counts of the
+	stages of one export run. Stages nest; every stage becomes a Chrome trace "complete"
+	event (chrome://tracing, Perfetto) and is aggregated per stage name and per asset.
+	counters is an optional callable returning the datablock counts recorded after each stage.
+	"""
+
+	def __init__(self, counters=None):
+		self._counters = counters
+		self._origin = time.perf_counter()
+		self._stack = []
+		self.events = []
+		self.stages = {} # name -> {'calls', 'seconds', 'max_seconds', 'bytes', 'subprocesses'}
+		self.assets = {} # asset -> seconds spent in stages tagged with it
+
+	def stage(self, name, asset=None):
+		"""Context manager timing one stage; yields a dict whose 'bytes'/'subprocesses' may be increased"""
+		return _Stage(self, name, asset)
+
+	def add_bytes(self, count):
+		"""Attribute bytes written to the innermost running stage"""
+		if self._stack:
+			self._stack[-1]['bytes'] += count
+
+	def record(self, name, start, end, asset=None, bytes_written=0, subprocesses=0):
+		"""Add a stage measured elsewhere (perf_counter start/end)"""
+		seconds = end - start
+		args = {}
+		if asset: args['asset'] = asset
+		if bytes_written: args['bytes'] = bytes_written
+		if subprocesses: args['subprocesses'] = subprocesses
+		if self._counters: args['datablocks'] = self._counters()
+		self.events.append({
+			"name": name,
+			"cat": "export",
+			"ph": "X",
+			"ts": (start - self._origin) * 1e6,
+			"dur": seconds * 1e6,
+			"pid": os.getpid(),
+			"tid": threading.get_ident(),
+			"args": args
+		})
+		totals = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes': 0, 'subprocesses': 0})
+		totals['calls'] += 1
+		totals['seconds'] += seconds
+		totals['max_seconds'] = max(totals['max_seconds'], seconds)
+		totals['bytes'] += bytes_written
+		totals['subprocesses'] += subprocesses
+		if asset and not self._stack:
+			# Only top-level stages count towards an asset, nested ones are already included
+			self.assets[asset] = self.assets.get(asset, 0.0) + seconds
+
+	def summary(self, slowest_assets=10):
+		"""Plain text table of the stage totals followed by the slowest assets"""
+		total = time.perf_counter() - self._origin
+		lines = [
+			f"Export profile: {total:.3f} s wall time",
+			"",
+			f"{'Stage':<28} {'Calls':>7} {'Total s':>10} {'Mean ms':>10} {'Max ms':>10} {'MB':>10} {'Procs':>6}",
+		]
+		for name, totals in sorted(self.stages.items(), key=lambda item: -item[1]['seconds']):
+			lines.append(
+				f"{name:<28} {totals['calls']:>7} {totals['seconds']:>10.3f} "
+				f"{totals['seconds'] * 1000 / totals['calls']:>10.2f} {totals['max_seconds'] * 1000:>10.2f} "
+				f"{totals['bytes'] / (1024 * 1024):>10.2f} {totals['subprocesses']:>6}"
+			)
+		if self.assets:
+			lines += ["", f"Slowest assets (of {len(self.assets)}):"]
+			for asset, seconds in sorted(self.assets.items(), key=lambda item: -item[1])[:slowest_assets]:
+				lines.append(f"  {seconds:>10.3f} s  {asset}")
+		if self._counters:
+			lines += ["", "Datablocks at end: " + ", ".join(f"{key}={value}" for key, value in self._counters().items())]
+		return "\n".join(lines) + "\n"
+
+	def write(self, base_path):
+		"""Write <base_path>_trace.json (Chrome trace) and <base_path>_profile.txt. Returns both paths."""
+		trace_path = base_path + "_trace.json"
+		summary_path = base_path + "_profile.txt"
+		with open(trace_path, 'w', encoding='utf-8') as f:
+			json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+		with open(summary_path, 'w', encoding='utf-8') as f:
+			f.write(self.summary())
+		return trace_path, summary_path
+
+# Profiler of the export run in progress (None while profiling is off). Module level so
+# export_utils helpers can report stages without having the profiler passed around.
+_active = None
+
+def set_active_profiler(profiler):
+	global _active
+	_active = profiler
+
+def get_active_profiler():
+	return _active
+
+def profile_stage(name, asset=None):
+	"""Stage of the active profiler, or a no-op context manager when profiling is off"""
+	if _active is None: return _NULL_STAGE
+	return _active.stage(name, asset)
+
+def profile_bytes(count):
+	"""Attribute bytes written to the innermost stage of the active profiler"""
+	if _active is not None: _active.add_bytes(count)
+
+def profiled(name):
+	"""Decorator timing every call of a function as a stage of the active profiler"""
+	def decorator(func):
+		@functools.wraps(func)
+		def wrapper(*args, **kwargs):
+			if _active is None: return func(*args, **kwargs)
+			with _active.stage(name):
+				return func(*args, **kwargs)
+		return wrapper
+	return decorator
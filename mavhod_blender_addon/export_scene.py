@@ -1,29 +1,63 @@
 import bpy
-import re
 import json
 import os
 import shutil
-import hashlib
+import tempfile
+import time
 import subprocess
-from .export_utils import copy_and_hash_images, rebind_materials_to_hashed_images, convert_zup_to_yup
+from array import array
+from .export_utils import copy_and_hash_images, rebind_materials_to_hashed_images, patch_gltf_output
+from .export_utils import hash_image_file, hash_image_files, load_image_hash_index, save_image_hash_index
+from .export_utils import build_material_image_index, MaterialRebindCache, get_gltf_export_format, SceneJsonWriter
+from .export_utils import batch_convert_zup_to_yup, transform_records, write_json_file
+from .export_utils import sort_by_chunk, get_chunk_filepath, get_chunk_bounds
+from .export_utils import parse_lod_ratios, get_lod_path, export_lod_chain
+from .export_utils import get_robust_relpath, resolve_path, PathResolver, set_active_resolver, get_image_usages
+from .export_worker import BlenderWorkerPool, BlenderWorkerError
+from .export_cache import ExportCache, compute_fingerprint
+from .export_core import PathMapper
+from .export_textures import TextureProcessor, load_texture_rules, is_texture_processing_available
+from .export_textures import DEFAULT_TEXTURE_RULES, TEXTURE_CACHE_DIR
+from .export_geometry import optimize_gltf_file
+from .godot_variant import SceneDbinWriter, write_variant_file
+from .export_profiler import ExportProfiler, set_active_profiler, profile_stage
 from bpy_extras.io_utils import ExportHelper
 
-def get_robust_relpath(target_path, base_path):
-	"""
-	Calculate relative path from base_path to target_path.
-	Ensures both paths are absolute and resolves symlinks before calculation.
-	"""
-	if not target_path or not base_path: return target_path
-	# Convert paths to resolved absolute paths
-	abs_target = os.path.realpath(bpy.path.abspath(target_path))
-	abs_base = os.path.realpath(bpy.path.abspath(base_path))
-	#
-	try:
-		# Attempt to find relative path
-		return os.path.relpath(abs_target, abs_base)
-	except (ValueError, Exception):
-		# If paths are on different drives (Windows) or other error occurs, return original absolute path
-		return abs_target
+# Image content hashes are persisted here (in the scene destination folder) between sessions
+_IMAGE_HASH_INDEX = ".mavhod_image_hashes.json"
+
+# Images are staged here (in the scene destination folder) during a run: on the output
+# volume, so the staged copies can be reflinked and moved instead of copied
+_STAGING_DIR = ".mavhod_staging"
+
+# Local meshes are only sharded across processes when there are at least this many to export
+_SHARD_MIN_MESHES = 8
+
+# Background Blender workers are kept alive between export runs so library files stay open
+_worker_pool = None
+
+def get_worker_pool(max_workers):
+	global _worker_pool
+	if _worker_pool is None:
+		script_path = os.path.join(os.path.dirname(__file__), "export_bg.py")
+		_worker_pool = BlenderWorkerPool(bpy.app.binary_path, script_path, max_workers)
+	_worker_pool.max_workers = max(1, max_workers)
+	return _worker_pool
+
+def shutdown_worker_pool():
+	global _worker_pool
+	if _worker_pool is not None:
+		_worker_pool.shutdown()
+		_worker_pool = None
+
+def _count_datablocks():
+	"""bpy.data counts recorded by the export profiler after every stage"""
+	return {
+		'objects': len(bpy.data.objects),
+		'meshes': len(bpy.data.meshes),
+		'materials': len(bpy.data.materials),
+		'images': len(bpy.data.images)
+	}
 
 class MavhodExportSettings(bpy.types.Operator, ExportHelper):
 	bl_idname = "mavhod_tool.export_settings"
@@ -53,6 +87,8 @@ class MavhodExportExecute(bpy.types.Operator):
 	bl_options = set()
 
 	filepath: bpy.props.StringProperty(options={'HIDDEN'})
+	# Watch mode: export and patch the assets of the selected objects, keep the scene file as is
+	assets_only: bpy.props.BoolProperty(options={'HIDDEN'}, default=False)
 	_timer = None
 	_current_index = 0
 	_objects = []
@@ -60,35 +96,30 @@ class MavhodExportExecute(bpy.types.Operator):
 	_original_selected = []
 	_original_active = None
 	_path_pairs = []
+	_shards = []
 	
 	# src_path e.g. '/d/wander/leftway2/model/buildingNurseOffice/nurseOffice.gltf'
 	# dst_path e.g. '/d/wander/leftway2/level/New Folder/model/buildingNurseOffice/nurseOffice.gltf',
 	def _get_dst_path(self, src_path):
-		for pair in self.path_pairs:
-			if pair['source_path'] in src_path:
-				rel_source = get_robust_relpath(src_path, pair['source_path'])
-				dest_path = pair['dest_path']
-				# Resolve Blender-relative paths or ensure absolute paths are clean
-				if dest_path.startswith("//") or dest_path.startswith("/"):
-					dest_path = bpy.path.abspath(dest_path)
-				return os.path.realpath(os.path.join(self._export_scene_path, dest_path, rel_source))
-		return None
+		return self._path_mapper.map(src_path)
 
 	def _get_export_path(self, obj):
 		"""Calculate source folder, link status, and all relevant export paths"""
 		props = bpy.context.scene.MavhodToolProps
 		is_linked = False
+		# Binary GLB is exported directly with its final extension
+		export_ext = ".glb" if get_gltf_export_format(self._get_object_ext()) == 'GLB' else ".gltf"
 		# Check if object is linked from a library file
 		lib = obj.library or (obj.data.library if obj.data else None)
 		if lib and lib.filepath: # Linked Object case
 			is_linked = True
 			# filepath e.g. "/d/wander/leftway2/model/buildingNurseOffice/nurseOffice.gltf"
-			blend_filepath = os.path.realpath(bpy.path.abspath(lib.filepath))
-			filepath = os.path.dirname(blend_filepath) + "/" + obj.data.name + ".gltf"
+			blend_filepath = resolve_path(lib.filepath)
+			filepath = os.path.dirname(blend_filepath) + "/" + obj.data.name + export_ext
 			dst_path = self._get_dst_path(filepath)
 		else:
 			blend_filepath = os.path.realpath(bpy.data.filepath)
-			dst_path = f"{self._export_scene_path}/{self._blend_filename}/{obj.data.name}.gltf"
+			dst_path = f"{self._export_scene_path}/{self._blend_filename}/{obj.data.name}{export_ext}"
 		#	
 		return {
 			'is_linked': is_linked,
@@ -96,195 +127,652 @@ class MavhodExportExecute(bpy.types.Operator):
 			'dst_path': dst_path
 		}
 
+	def _get_image_src_path(self, img):
+		"""Resolve the original source path of an image (relative to its library if linked)"""
+		if not img.filepath: return None
+		if img.library and img.library.filepath:
+			lib_dir = os.path.dirname(resolve_path(img.library.filepath))
+			return resolve_path(img.filepath, start=lib_dir)
+		return resolve_path(img.filepath)
+
+	def _prefetch_image_hashes(self):
+		"""Hash every image in the material index up front, large files in parallel"""
+		src_paths = set()
+		for images in self._material_images.values():
+			for img in images:
+				src_path = self._get_image_src_path(img)
+				if src_path and os.path.isfile(src_path): src_paths.add(src_path)
+		hash_image_files(src_paths)
+
 	def _collect_images(self, obj):
 		"""
 		Collect texture metadata from object materials.
-		Returns image_metadata: dict mapping sha256 hash to metadata.
+		Returns image_metadata: dict mapping sha256 content hash to metadata.
+		Identical images at different source paths share the destination of the first one
+		seen in the run, so they are written as a single file.
 		"""
 		image_metadata = {} # hash sha256 -> {src_path, dst_path}
 		for slot in obj.material_slots:
-			if not (slot.material and slot.material.use_nodes): continue
-			nodes = slot.material.node_tree.nodes
-			for node in nodes:
-				if not (node.type == 'TEX_IMAGE' and node.image): continue
-				img = node.image
-				if img in image_metadata: continue
+			if not slot.material: continue
+			# Images per material come from the run-wide index built in invoke
+			for img in self._material_images.get(slot.material, ()):
 				# Resolve original source path
-				if img.library and img.library.filepath:
-					lib_dir = os.path.dirname(os.path.realpath(bpy.path.abspath(img.library.filepath)))
-					src_path = os.path.realpath(bpy.path.abspath(img.filepath, start=lib_dir)) if img.filepath else None
-				else:
-					src_path = os.path.realpath(bpy.path.abspath(img.filepath)) if img.filepath else None
-				# Create SHA256 Hash
-				hash_obj = hashlib.sha256(src_path.encode('utf-8'))
-				hash_name = hash_obj.hexdigest()
-				#
+				src_path = self._get_image_src_path(img)
+				if not (src_path and os.path.isfile(src_path)): continue
+				# SHA256 of the file content, identical images share one entry
+				hash_name = hash_image_file(src_path)
+				if hash_name in image_metadata: continue
+				dst_path = self._texture_destinations.get(hash_name) or self._get_dst_path(src_path)
+				if dst_path: self._texture_destinations.setdefault(hash_name, dst_path)
 				image_metadata[hash_name] = {
 					'src_path': src_path,
-					'dst_path': self._get_dst_path(src_path),
+					'dst_path': dst_path,
+					'usage': self._image_usages.get(img, 'data'),
 				}
 		return image_metadata
 
-	def _export_and_patch_gltf(self, context, obj, path_info, image_metadata):
-		"""
-		Export GLTF and patch the file using utility functions.
-		"""
-		dst_path = path_info['dst_path']
+	def _get_texture_processor(self):
+		"""TextureProcessor for this run, or None if texture processing is off or unavailable"""
+		props = bpy.context.scene.MavhodToolProps
+		if not props.export_texture_processing: return None
+		if not is_texture_processing_available():
+			self.report({'WARNING'}, "Texture processing needs Pillow in Blender's Python, copying textures unchanged")
+			return None
+		rules = DEFAULT_TEXTURE_RULES
+		if props.export_texture_rules:
+			try:
+				rules = load_texture_rules(bpy.path.abspath(props.export_texture_rules))
+			except (OSError, ValueError) as e:
+				self.report({'WARNING'}, f"Could not read texture rules, copying textures unchanged: {str(e)}")
+				return None
+		cache_dir = os.path.join(self._export_scene_path, TEXTURE_CACHE_DIR)
+		return TextureProcessor(cache_dir, rules, props.export_texture_max_size)
+
+	def _process_textures(self):
+		"""Process the textures of every asset to export once, then point their metadata at the outputs"""
+		textures = {}
+		for image_metadata in self._image_metadata.values():
+			for hash_name, meta in image_metadata.items():
+				textures.setdefault(hash_name, dict(meta))
+		self._texture_processor.process(textures)
+		for image_metadata in self._image_metadata.values():
+			for hash_name, meta in image_metadata.items():
+				if 'processed_path' in textures[hash_name]:
+					meta['processed_path'] = textures[hash_name]['processed_path']
+		print(self._texture_processor.report())
+
+	def _get_object_ext(self):
 		props = bpy.context.scene.MavhodToolProps
 		object_ext = props.object_extension
 		if not object_ext.startswith("."):
 			object_ext = "." + object_ext
-			
-		# Ensure destination directory exists
-		dst_dir = os.path.dirname(dst_path)
-		os.makedirs(dst_dir, exist_ok=True)
-		
-		if path_info['is_linked']:
-			# Use subprocess to export linked mesh data
-			blender_bin = bpy.app.binary_path
-			script_path = os.path.join(os.path.dirname(__file__), "export_bg.py")
-			blend_file = path_info['blend_filepath']
-			mesh_name = obj.data.name
-			
+		return object_ext
+
+	def _get_final_path(self, path_info):
+		"""Exported asset path with the configured object extension"""
+		return os.path.splitext(path_info['dst_path'])[0] + self._get_object_ext()
+
+	def _get_lod_ratios(self):
+		props = bpy.context.scene.MavhodToolProps
+		return parse_lod_ratios(props.export_lod_ratios)
+
+	def _get_lod_final_paths(self, path_info):
+		"""Final paths of the LOD files of an asset (empty when LODs are disabled)"""
+		return [
+			os.path.splitext(get_lod_path(path_info['dst_path'], level))[0] + self._get_object_ext()
+			for level in range(1, len(self._lod_ratios) + 1)
+		]
+
+	def _get_metadata_settings(self):
+		props = bpy.context.scene.MavhodToolProps
+		return {
+			'node': props.export_metadata_node,
+			'mesh': props.export_metadata_mesh,
+			'material': props.export_metadata_material,
+			'scene': props.export_metadata_scene
+		}
+
+	def _patch_output(self, dst_path, image_metadata):
+		"""Patch and filter an exported GLTF and its LOD files with the current settings, then optimize their geometry"""
+		props = bpy.context.scene.MavhodToolProps
+		for level in range(1, len(self._lod_ratios) + 1):
+			self._optimize_geometry(patch_gltf_output(
+				get_lod_path(dst_path, level), self._get_metadata_settings(), image_metadata,
+				self._get_object_ext(), compact=props.export_compact_json
+			))
+		final_path = patch_gltf_output(
+			dst_path, self._get_metadata_settings(), image_metadata, self._get_object_ext(), compact=props.export_compact_json
+		)
+		self._optimize_geometry(final_path)
+		return final_path
+
+	def _get_geometry_setting(self):
+		props = bpy.context.scene.MavhodToolProps
+		if not props.export_optimize_geometry: return None
+		return 'quantized' if props.export_quantize_geometry else 'optimized'
+
+	def _optimize_geometry(self, path):
+		"""Run the geometry pass (export_geometry.py) on a patched asset file and print its size report"""
+		props = bpy.context.scene.MavhodToolProps
+		if not path or not props.export_optimize_geometry: return
+		try:
+			report = optimize_gltf_file(path, props.export_quantize_geometry, props.export_compact_json)
+		except (OSError, ValueError, KeyError) as e:
+			print(f"Error optimizing geometry of {path}: {str(e)}")
+			return
+		if report is None: return
+		self._geometry_sizes[0] += report['before']
+		self._geometry_sizes[1] += report['after']
+		print(
+			f"Optimized {os.path.basename(path)}: {report['before'] / 1024:.1f} -> {report['after'] / 1024:.1f} KiB, "
+			f"{report['vertices_before']} -> {report['vertices_after']} vertices"
+		)
+
+	def _plan_exports(self):
+		"""
+		Resolve export paths for every object up front, skip unique meshes whose cached
+		fingerprint is unchanged, and group the remaining linked meshes by library file,
+		so each library is opened and exported in a single background run.
+		"""
+		props = bpy.context.scene.MavhodToolProps
+		self._lod_ratios = self._get_lod_ratios()
+		settings = dict(
+			self._get_metadata_settings(), object_ext=self._get_object_ext(), compact=props.export_compact_json,
+			lod_ratios=self._lod_ratios,
+			textures=self._texture_processor.get_rules_key() if self._texture_processor else None,
+			geometry=self._get_geometry_setting()
+		)
+		self._path_infos = []
+		self._linked_jobs = {} # blend_filepath -> { export_key: (representative object, path_info) }
+		self._local_jobs = {} # export_key -> (representative object, path_info)
+		self._fingerprints = {} # export_key -> fingerprint
+		self._image_metadata = {} # export_key -> image_metadata from _collect_images
+		self._skipped_meshes = 0
+		for obj in self._objects:
+			path_info = self._get_export_path(obj)
+			self._path_infos.append(path_info)
+			if path_info['dst_path'] == None: continue
+			export_key = f"{path_info['blend_filepath']}|{obj.data.name}"
+			if export_key in self._fingerprints or export_key in self._exported_meshes: continue
+			image_metadata = self._collect_images(obj)
+			fingerprint = compute_fingerprint(obj, path_info, image_metadata, settings)
+			lods_exist = all(os.path.isfile(lod_path) for lod_path in self._get_lod_final_paths(path_info))
+			if props.export_incremental and lods_exist and self._export_cache.is_fresh(self._get_final_path(path_info), fingerprint):
+				# Unchanged since the last export (LODs included): only the instance transform is rewritten
+				self._exported_meshes.add(export_key)
+				self._skipped_meshes += 1
+				continue
+			self._fingerprints[export_key] = fingerprint
+			self._image_metadata[export_key] = image_metadata
+			if path_info['is_linked']:
+				self._linked_jobs.setdefault(path_info['blend_filepath'], {})[export_key] = (obj, path_info)
+			else:
+				self._local_jobs[export_key] = (obj, path_info)
+		self._plan_multimeshes()
+
+	def _plan_multimeshes(self):
+		"""
+		Pick the assets that get a packed MultiMesh transform array instead of one record
+		per instance: those with at least export_multimesh_threshold plain instances (per
+		cell in chunked mode). Objects carrying instance metadata are always written as
+		individual records.
+		"""
+		props = bpy.context.scene.MavhodToolProps
+		self._multimeshes = {} # (cell or None, asset_path) -> array('f') of 12 floats per instance
+		threshold = props.export_multimesh_threshold
+		if threshold <= 0: return
+		counts = {}
+		for index, (obj, path_info) in enumerate(zip(self._objects, self._path_infos)):
+			if path_info['dst_path'] == None or self._get_instance_extras(obj): continue
+			key = (self._get_cell(index), self._get_asset_path(path_info))
+			counts[key] = counts.get(key, 0) + 1
+		for key, count in counts.items():
+			if count >= threshold:
+				self._multimeshes[key] = array('f')
+
+	def _get_multimesh_section(self, cell):
+		"""Scene "multimeshes" section for one cell (None when not chunked)"""
+		return [
+			{"asset_path": asset_path, "instance_count": len(transforms) // 12, "transforms": transforms}
+			for (transforms_cell, asset_path), transforms in self._multimeshes.items() if transforms_cell == cell
+		]
+
+	def _get_lods_section(self):
+		"""Scene "lods" section: { asset_path: [LOD asset paths, highest detail first] }"""
+		if not self._lod_ratios: return {}
+		lods = {}
+		for path_info in self._path_infos:
+			if path_info['dst_path'] == None: continue
+			asset_path = self._get_asset_path(path_info)
+			if asset_path in lods: continue
+			lods[asset_path] = [
+				get_robust_relpath(lod_path, self._export_scene_path) for lod_path in self._get_lod_final_paths(path_info)
+			]
+		return lods
+
+	def _get_cell(self, index):
+		"""Grid cell of object index in chunked mode, else None"""
+		return self._cells[index] if self._cells else None
+
+	def _open_scene_writer(self, filepath):
+		"""Streaming scene writer: .dbin scenes as Godot Variant binary (DbinResource), everything else as JSON"""
+		props = bpy.context.scene.MavhodToolProps
+		writer_class = SceneDbinWriter if filepath.lower().endswith(".dbin") else SceneJsonWriter
+		return writer_class(filepath, compact=props.export_compact_json)
+
+	def _write_data_file(self, filepath, data):
+		"""Write a non-streamed data file (chunk index) in the scene file format"""
+		props = bpy.context.scene.MavhodToolProps
+		if filepath.lower().endswith(".dbin"):
+			write_variant_file(filepath, data)
+		else:
+			write_json_file(filepath, data, compact=props.export_compact_json)
+
+	def _start_chunk(self, cell):
+		"""Finish the current cell file and start streaming the one for cell"""
+		if self._chunk: self._commit_chunk()
+		self._scene_writer = self._open_scene_writer(get_chunk_filepath(self.filepath, cell))
+		self._chunk = {'cell': cell, 'assets': set(), 'y_min': None, 'y_max': None, 'count': 0}
+
+	def _commit_chunk(self):
+		"""
+		Finish the current cell file and add its entry to the chunk index. The file keeps its
+		temporary name until _publish_chunks, so a cancelled export leaves the previous cells
+		and index consistent.
+		"""
+		chunk = self._chunk
+		multimeshes = self._get_multimesh_section(chunk['cell'])
+		self._scene_writer.commit({"multimeshes": multimeshes} if multimeshes else None, publish=False)
+		self._chunk_writers.append(self._scene_writer)
+		self._chunks.append({
+			"cell": list(chunk['cell']),
+			"path": os.path.basename(self._scene_writer.filepath),
+			"bounds": get_chunk_bounds(chunk['cell'], self._chunk_size, chunk['y_min'], chunk['y_max']),
+			"assets": sorted(chunk['assets']),
+			"instance_count": chunk['count']
+		})
+		self._scene_writer = None
+		self._chunk = None
+
+	def _publish_chunks(self):
+		"""Rename every finished cell file over its target, right before the index is written"""
+		for writer in self._chunk_writers:
+			writer.publish()
+		self._chunk_writers = []
+
+	def _abort_chunks(self):
+		"""Drop the finished but unpublished cell files and the cell being written"""
+		for writer in self._chunk_writers:
+			writer.abort()
+		self._chunk_writers = []
+
+	def _add_to_chunk(self, index, asset_path):
+		chunk = self._chunk
+		y = self._transforms[index]["location"]["y"]
+		chunk['assets'].add(asset_path)
+		chunk['y_min'] = y if chunk['y_min'] is None else min(chunk['y_min'], y)
+		chunk['y_max'] = y if chunk['y_max'] is None else max(chunk['y_max'], y)
+		chunk['count'] += 1
+
+	def _record_export(self, export_key, obj, path_info, image_metadata, final_path):
+		"""
+		Store the fingerprint of an exported asset in the export cache once final_path (the
+		result of _patch_output) exists. A failed patch is reported and left out of the cache,
+		so the unpatched file is exported again by the next run instead of counting as fresh.
+		"""
+		if not final_path or not os.path.isfile(final_path):
+			self.report({'ERROR'}, f"Could not patch the exported file of {obj.data.name}: {path_info['dst_path']}")
+			return
+		self._export_cache.record(
+			self._get_final_path(path_info),
+			self._fingerprints[export_key],
+			blend_filepath=path_info['blend_filepath'],
+			mesh=obj.data.name,
+			is_linked=path_info['is_linked'],
+			images=sorted(meta['src_path'] for meta in image_metadata.values() if meta['src_path']),
+			lods=[os.path.basename(lod_path) for lod_path in self._get_lod_final_paths(path_info)]
+		)
+
+	def _start_linked_libraries(self):
+		"""
+		Export the planned linked meshes with one job manifest per library, sent to the
+		library's background worker. Up to Worker Count libraries export at the same time
+		while the modal loop goes on; _collect_linked_libraries patches the results.
+		"""
+		self._library_queue = list(self._linked_jobs.keys())
+		self._running_libraries = {} # blend_filepath -> (export_keys, jobs, start time, started processes)
+		if not self._library_queue: return
+		props = bpy.context.scene.MavhodToolProps
+		self._worker_pool = get_worker_pool(props.export_worker_count)
+		# Linked meshes are skipped by the modal loop
+		for planned in self._linked_jobs.values():
+			self._exported_meshes.update(planned.keys())
+		self._submit_libraries()
+
+	def _submit_libraries(self):
+		"""Send queued library manifests to the workers while the pool has room"""
+		metadata_settings = self._get_metadata_settings()
+		while self._library_queue and self._worker_pool.can_submit():
+			blend_filepath = self._library_queue.pop(0)
+			planned = self._linked_jobs[blend_filepath]
+			export_keys = list(planned.keys())
+			jobs = []
+			for export_key in export_keys:
+				obj, path_info = planned[export_key]
+				os.makedirs(os.path.dirname(path_info['dst_path']), exist_ok=True)
+				jobs.append({
+					'output': path_info['dst_path'],
+					'mesh': obj.data.name,
+					'lod_ratios': self._lod_ratios,
+					'metadata': metadata_settings
+				})
+			started = self._worker_pool.started
+			try:
+				self._worker_pool.submit(blend_filepath, {'jobs': jobs, 'staging_dir': self._staging_root})
+			except BlenderWorkerError as e:
+				self.report({'ERROR'}, f"Worker failed for {blend_filepath}: {str(e)}")
+				continue
+			self._running_libraries[blend_filepath] = (export_keys, jobs, time.perf_counter(), self._worker_pool.started - started)
+
+	def _collect_linked_libraries(self):
+		"""
+		Patch the outputs of libraries whose worker replied and submit the queued ones.
+		Returns False while any library is still exporting.
+		"""
+		if not self._running_libraries and not self._library_queue: return True
+		for blend_filepath, reply, error in self._worker_pool.poll():
+			export_keys, jobs, started, subprocesses = self._running_libraries.pop(blend_filepath)
+			if self._profiler:
+				self._profiler.record(
+					"worker_export", started, time.perf_counter(),
+					asset=os.path.basename(blend_filepath), subprocesses=subprocesses
+				)
+			if error is not None:
+				self.report({'ERROR'}, f"Worker failed for {blend_filepath}: {str(error)}")
+				continue
+			if 'error' in reply:
+				self.report({'ERROR'}, f"Export failed for {blend_filepath}: {reply['error']}")
+			planned = self._linked_jobs[blend_filepath]
+			for export_key, job, result in zip(export_keys, jobs, reply.get('results', [])):
+				if not result.get('ok'):
+					self.report({'ERROR'}, f"Export failed for {job['mesh']}: {result.get('error', 'unknown error')}")
+					continue
+				obj, path_info = planned[export_key]
+				image_metadata = self._image_metadata[export_key]
+				final_path = self._patch_output(job['output'], image_metadata)
+				self._record_export(export_key, obj, path_info, image_metadata, final_path)
+		self._submit_libraries()
+		return not self._running_libraries and not self._library_queue
+
+	def _start_local_shards(self):
+		"""
+		Export the planned local meshes in parallel: save a temporary copy of the .blend and
+		split the meshes across N background Blender processes running export_bg.py.
+		The processes run while the modal loop goes on; _collect_local_shards patches the results.
+		"""
+		self._shards = []
+		props = bpy.context.scene.MavhodToolProps
+		shard_count = min(props.export_local_shards, len(self._local_jobs))
+		if shard_count < 2 or len(self._local_jobs) < _SHARD_MIN_MESHES: return
+		#
+		self._shard_dir = tempfile.mkdtemp(prefix="mavhod_shards_")
+		self._shards_started = time.perf_counter()
+		blend_copy = os.path.join(self._shard_dir, "shard_source.blend")
+		bpy.ops.wm.save_as_mainfile(filepath=blend_copy, copy=True)
+		script_path = os.path.join(os.path.dirname(__file__), "export_bg.py")
+		metadata_settings = self._get_metadata_settings()
+		export_keys = list(self._local_jobs.keys())
+		for shard_index in range(shard_count):
+			shard_keys = export_keys[shard_index::shard_count]
+			jobs = []
+			for export_key in shard_keys:
+				obj, path_info = self._local_jobs[export_key]
+				os.makedirs(os.path.dirname(path_info['dst_path']), exist_ok=True)
+				jobs.append({
+					'output': path_info['dst_path'],
+					'object': obj.name,
+					'apply_modifiers': True,
+					'lod_ratios': self._lod_ratios,
+					'metadata': metadata_settings
+				})
+			manifest_path = os.path.join(self._shard_dir, f"shard_{shard_index}.json")
+			results_path = os.path.join(self._shard_dir, f"shard_{shard_index}_results.json")
+			with open(manifest_path, 'w', encoding='utf-8') as f:
+				json.dump(jobs, f)
 			cmd = [
-				blender_bin,
+				bpy.app.binary_path,
 				"--factory-startup",
-				"-b", blend_file,
+				"-b", blend_copy,
 				"-P", script_path,
 				"--",
-				"--output", dst_path,
-				"--mesh", mesh_name,
-				"--object_ext", object_ext
+				"--manifest", manifest_path,
+				"--results", results_path,
+				"--staging-dir", self._staging_root
 			]
-			# Pass metadata flags
-			if props.export_metadata_node: cmd.append("--metadata_node")
-			if props.export_metadata_mesh: cmd.append("--metadata_mesh")
-			if props.export_metadata_material: cmd.append("--metadata_material")
-			if props.export_metadata_scene: cmd.append("--metadata_scene")
+			print(f"Running shard {shard_index + 1}/{shard_count}: {' '.join(cmd)}")
+			with profile_stage("start_shard") as stage:
+				self._shards.append((subprocess.Popen(cmd), shard_keys, results_path))
+				stage['subprocesses'] += 1
+			# Sharded meshes are skipped by the modal loop
+			self._exported_meshes.update(shard_keys)
+
+	def _collect_local_shards(self):
+		"""
+		Patch the outputs of finished shard processes.
+		Returns False while any shard is still running.
+		"""
+		if any(process.poll() is None for process, _, _ in self._shards): return False
+		if self._profiler:
+			self._profiler.record("local_shards", self._shards_started, time.perf_counter(), subprocesses=len(self._shards))
+		for process, shard_keys, results_path in self._shards:
+			results = []
+			if os.path.isfile(results_path):
+				with open(results_path, 'r', encoding='utf-8') as f:
+					results = json.load(f)
+			if len(results) != len(shard_keys):
+				self.report({'ERROR'}, f"Shard process failed with code {process.returncode}")
+			for export_key, result in zip(shard_keys, results):
+				obj, path_info = self._local_jobs[export_key]
+				if not result.get('ok'):
+					self.report({'ERROR'}, f"Export failed for {obj.name}: {result.get('error', 'unknown error')}")
+					continue
+				image_metadata = self._image_metadata[export_key]
+				final_path = self._patch_output(path_info['dst_path'], image_metadata)
+				self._record_export(export_key, obj, path_info, image_metadata, final_path)
+		self._shards = []
+		shutil.rmtree(self._shard_dir, ignore_errors=True)
+		return True
+
+	def _export_and_patch_gltf(self, context, obj, path_info, image_metadata):
+		"""
+		Export a local object as GLTF and patch the file using utility functions.
+		Linked objects are exported per library by the workers (_start_linked_libraries).
+		Returns the patched file's path, or None if it could not be patched.
+		"""
+		dst_path = path_info['dst_path']
+		props = bpy.context.scene.MavhodToolProps
 			
-			print(f"Running subprocess: {' '.join(cmd)}")
-			try:
-				subprocess.run(cmd, check=True)
-			except subprocess.CalledProcessError as e:
-				self.report({'ERROR'}, f"Subprocess failed for {obj.name}")
-				return
-		else:
-			# Local object export
-			# Isolate Object
-			bpy.ops.object.select_all(action='DESELECT')
-			obj.select_set(True)
-			context.view_layer.objects.active = obj
+		# Ensure destination directory exists
+		dst_dir = os.path.dirname(dst_path)
+		os.makedirs(dst_dir, exist_ok=True)
+		
+		# Isolate Object
+		bpy.ops.object.select_all(action='DESELECT')
+		obj.select_set(True)
+		context.view_layer.objects.active = obj
+		
+		# 1. Copy and Hash Image + Re-bind Material for Local Object
+		# Images are staged once per run, so rebound materials stay valid for later exports
+		image_mapping = copy_and_hash_images(self._staging_dir, [obj], self._material_images)
+		
+		# Keep original materials to restore after export
+		original_materials = list(obj.data.materials)
+		try:
+			# Re-bind materials to use hashed image paths before export
+			rebind_materials_to_hashed_images(image_mapping, self._rebind_cache, [obj])
 			
-			# 1. Copy and Hash Image + Re-bind Material for Local Object
-			output_dir = os.path.dirname(dst_path)
-			image_mapping = copy_and_hash_images(output_dir)
+			# Export extras if any glTF-related metadata is enabled
+			use_extras = props.export_metadata_node or props.export_metadata_mesh or \
+						 props.export_metadata_material or props.export_metadata_scene
 			
-			# Keep original materials to restore after export
-			original_materials = list(obj.data.materials)
-			try:
-				# Re-bind materials to use hashed image paths before export
-				rebind_materials_to_hashed_images(image_mapping)
-				
-				# Export extras if any glTF-related metadata is enabled
-				use_extras = props.export_metadata_node or props.export_metadata_mesh or \
-							 props.export_metadata_material or props.export_metadata_scene
-				
+			with profile_stage("gltf_export") as stage:
 				bpy.ops.export_scene.gltf(
 					filepath=dst_path,
 					use_selection=True,
-					export_format='GLTF_SEPARATE',
+					export_format=get_gltf_export_format(os.path.splitext(dst_path)[1]),
 					export_image_format='AUTO',
 					export_apply=True,
 					export_extras=use_extras
 				)
-			finally:
-				# Restore original materials to object
-				for i, mat in enumerate(original_materials):
-					obj.data.materials[i] = mat
+				if os.path.isfile(dst_path): stage['bytes'] += os.path.getsize(dst_path)
+			# Decimated LOD files next to the asset, sharing the rebound materials
+			if self._lod_ratios:
+				with profile_stage("lod_export"):
+					export_lod_chain(obj, dst_path, self._lod_ratios, use_extras)
+		finally:
+			# Restore original materials to object
+			for i, mat in enumerate(original_materials):
+				obj.data.materials[i] = mat
 			
-		# 2. Patch and Filter output using utility (for both Local and Linked)
-		from .export_utils import patch_gltf_output
-		metadata_settings = {
-			'node': props.export_metadata_node,
-			'mesh': props.export_metadata_mesh,
-			'material': props.export_metadata_material,
-			'scene': props.export_metadata_scene
-		}
-		patch_gltf_output(dst_path, metadata_settings, image_metadata, object_ext)
+		# 2. Patch and Filter output using utility
+		return self._patch_output(dst_path, image_metadata)
 
 
-	def _get_mesh_instance_data(self, obj, path_info):
+	def _get_mesh_instance_data(self, obj, path_info, index):
 		"""Prepare instance data for writing to the final JSON result file"""
-		props = bpy.context.scene.MavhodToolProps
-		object_ext = props.object_extension
-		if not object_ext.startswith("."):
-			object_ext = "." + object_ext
-			
-		# Determine the final path with the correct extension
-		final_path = os.path.splitext(path_info['dst_path'])[0] + object_ext
-		
-		world_matrix = obj.matrix_world
-		loc, rot_quat, scale = world_matrix.decompose()
-		loc_G, rot_quat_G, scale_G = convert_zup_to_yup(loc, rot_quat, scale)
-		
 		data = {
 			"name": obj.name,
-			"asset_path": get_robust_relpath(final_path, self._export_scene_path),
-			"location": {"x": loc_G.x, "y": loc_G.y, "z": loc_G.z},
-			"rotation": {"x": rot_quat_G.x, "y": rot_quat_G.y, "z": rot_quat_G.z, "w": rot_quat_G.w},
-			"scale": {"x": scale_G.x, "y": scale_G.y, "z": scale_G.z}
+			"asset_path": self._get_asset_path(path_info),
+			**self._transforms[index]
 		}
 		
+		extras = self._get_instance_extras(obj)
+		if extras:
+			data["metadata"] = extras
+				
+		return data
+
+	def _get_asset_path(self, path_info):
+		"""Exported asset path (with the correct extension) relative to the scene file"""
+		return get_robust_relpath(self._get_final_path(path_info), self._export_scene_path)
+
+	def _get_instance_extras(self, obj):
+		"""Custom properties of obj written as instance metadata (empty if disabled)"""
+		props = bpy.context.scene.MavhodToolProps
+		extras = {}
 		if props.export_metadata_instance:
-			extras = {}
 			for key in obj.keys():
 				if key == "_RNA_UI": continue
 				val = obj[key]
 				if hasattr(val, "to_list"):
 					val = val.to_list()
 				extras[key] = val
-			if extras:
-				data["metadata"] = extras
-				
-		return data
+		return extras
 
-	def modal(self, context, event):
-		if event.type != 'TIMER': return {'PASS_THROUGH'};
-		if self._current_index >= len(self._objects): return self._finish(context);
-		current_index = self._current_index
-		self._current_index += 1
-		obj = self._objects[current_index]
-		# 1. Calculate export paths and check link status (Linked Data)
-		path_info = self._get_export_path(obj)
-		if path_info['dst_path'] == None: return {'PASS_THROUGH'};
-		is_linked = path_info['is_linked']
-		# Update status message in Blender header
-		status_msg = f"Exporting {'(Linked)' if is_linked else '(Local)'} {current_index + 1}/{len(self._objects)}: {obj.name}"
-		context.workspace.status_text_set(status_msg)
-		# Update progress bar
-		wm = context.window_manager
-		wm.progress_update(current_index)
+	def _process_object(self, context, index):
+		"""
+		Export (if needed) and record one object.
+		Returns True if an expensive GLTF export ran for it.
+		"""
+		obj = self._objects[index]
+		# 1. Export paths and link status were resolved by _plan_exports
+		path_info = self._path_infos[index]
+		if path_info['dst_path'] == None: return False
+		exported = False
 		# Check if this model has already been exported (to avoid duplicate export if Mesh is reused)
 		export_key = f"{path_info['blend_filepath']}|{obj.data.name}" # e.g. "/d/wander/leftway2/level/theme1.blend:Cube.049"
+		# Linked meshes are exported by the library workers (_start_linked_libraries)
 		if export_key not in self._exported_meshes:
-			# 2. Collect image data (Textures) used in Material
-			image_metadata = self._collect_images(obj)
+			# 2. Image data (Textures) used in Material was collected by _plan_exports
+			image_metadata = self._image_metadata[export_key]
 			# 3. Export model as GLTF and Patch file to fix image paths and Filters
-			self._export_and_patch_gltf(context, obj, path_info, image_metadata)
+			with profile_stage("export_asset", asset=obj.data.name):
+				final_path = self._export_and_patch_gltf(context, obj, path_info, image_metadata)
 			self._exported_meshes.add(export_key)
+			self._record_export(export_key, obj, path_info, image_metadata, final_path)
+			exported = True
+		if self.assets_only: return exported
+
+		# 4. Stream instance data into the scene aggregate JSON file (for every instance!),
+		# or append it to the asset's MultiMesh transform array
+		cell = self._get_cell(index)
+		if self._cells and (self._chunk is None or self._chunk['cell'] != cell):
+			# Objects are sorted by cell, so each cell file is written in one go
+			self._start_chunk(cell)
+		asset_path = self._get_asset_path(path_info)
+		transforms = self._multimeshes.get((cell, asset_path)) if self._multimeshes else None
+		if transforms is not None and not self._get_instance_extras(obj):
+			# Top 3 rows of the Y-up matrix: MultiMesh buffer order
+			transforms.extend(self._yup_matrices[index, :3].ravel().tolist())
+		else:
+			self._scene_writer.write_instance(self._get_mesh_instance_data(obj, path_info, index))
+		if self._chunk: self._add_to_chunk(index, asset_path)
+		return exported
 
-		# 4. Record instance data for the final scene aggregate JSON file (for every instance!)
-		self._mesh_data_for_json.append(self._get_mesh_instance_data(obj, path_info))
+	def modal(self, context, event):
+		if event.type == 'ESC': return self._cancel(context);
+		if event.type != 'TIMER': return {'PASS_THROUGH'};
+		libraries_done = self._collect_linked_libraries()
+		if self._current_index >= len(self._objects):
+			if self._shards and not self._collect_local_shards():
+				context.workspace.status_text_set(f"Waiting for {len(self._shards)} local export processes...")
+				return {'PASS_THROUGH'}
+			if not libraries_done:
+				waiting = len(self._running_libraries) + len(self._library_queue)
+				context.workspace.status_text_set(f"Waiting for {waiting} library export(s)...")
+				return {'PASS_THROUGH'}
+			return self._finish(context)
+		props = context.scene.MavhodToolProps
+		budget = props.export_frame_budget_ms / 1000.0
+		start_time = time.perf_counter()
+		# Process as many objects as fit in the frame budget. Instance-only records are cheap and
+		# get batched; after a GLTF export we yield so the UI can redraw between exports.
+		while self._current_index < len(self._objects):
+			current_index = self._current_index
+			self._current_index += 1
+			if self._process_object(context, current_index): break
+			if time.perf_counter() - start_time >= budget: break
+		# Update status message in Blender header and progress bar once per tick
+		obj = self._objects[self._current_index - 1]
+		is_linked = self._path_infos[self._current_index - 1]['is_linked']
+		status_msg = f"Exporting {'(Linked)' if is_linked else '(Local)'} {self._current_index}/{len(self._objects)}: {obj.name}"
+		context.workspace.status_text_set(status_msg)
+		context.window_manager.progress_update(self._current_index)
 
 		return {'PASS_THROUGH'}
 		
 	def invoke(self, context, event):
 		# Initial function when export process starts
+		result = self._start(context)
+		if result: return result
+		# Start Progress Bar and Timer
+		wm = context.window_manager
+		wm.progress_begin(0, len(self._objects))
+		self._timer = wm.event_timer_add(0.01, window=context.window)
+		wm.modal_handler_add(self)
+		#
+		return {'RUNNING_MODAL'}
+
+	def execute(self, context):
+		"""
+		Export synchronously without the modal timer, e.g. from background Blender
+		(blender -b ... --python) where there is no window to drive the modal loop.
+		"""
+		result = self._start(context)
+		if result: return result
+		while self._current_index < len(self._objects):
+			self._current_index += 1
+			self._process_object(context, self._current_index - 1)
+		while (self._shards and not self._collect_local_shards()) or not self._collect_linked_libraries():
+			time.sleep(0.1)
+		return self._finish(context)
+
+	def _start(self, context):
+		"""Shared setup of invoke/execute. Returns a result set if the export cannot start, else None."""
 		props = context.scene.MavhodToolProps
 		# Initialize status for Modal processing
 		self._exported_meshes = set()
 		self._current_index = 0
-		self._mesh_data_for_json = []
 		# Store original selection to restore after work completion
 		self._original_selected = list(context.selected_objects)
 		self._original_active = context.view_layer.objects.active
@@ -305,37 +793,126 @@ class MavhodExportExecute(bpy.types.Operator):
 			self.path_pairs.append({'source_path': source_path, 'dest_path': dest_path})
 		# Sort self.path_pairs by source_path in reverse (Z-A)
 		self.path_pairs.sort(key=lambda x: x['source_path'], reverse=True)
+		# Longest-prefix lookup of the pairs, built once per run
+		self._path_mapper = PathMapper(self.path_pairs, self._export_scene_path)
 		# Collect only selected Mesh objects
 		self._objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
 		if not self._objects:
 			self.report({'WARNING'}, "No Mesh or models selected!")
 			return {'CANCELLED'}
-		# Start Progress Bar and Timer
-		wm = context.window_manager
-		wm.progress_begin(0, len(self._objects))
-		self._timer = wm.event_timer_add(0.01, window=context.window)
-		wm.modal_handler_add(self)
-		#
-		return {'RUNNING_MODAL'}
+		# Library, texture and asset paths are resolved once per run (see _cleanup for the report)
+		self._path_resolver = PathResolver()
+		set_active_resolver(self._path_resolver)
+		self._geometry_sizes = [0, 0] # file bytes before/after the geometry pass
+		# Optional per-stage profile of this run (see _write_profile)
+		self._profiler = ExportProfiler(_count_datablocks) if props.export_profile else None
+		set_active_profiler(self._profiler)
+		# Convert every world transform to Y-up in one vectorized pass
+		with profile_stage("convert_transforms"):
+			self._yup_matrices, *yup_transform = batch_convert_zup_to_yup(self._objects)
+		self._chunk_size = props.export_chunk_size
+		self._cells = None # grid cell of every object in chunked mode
+		if self._chunk_size > 0:
+			# Chunked export: process objects cell by cell, so only one cell file is open at a time
+			order, self._cells = sort_by_chunk(yup_transform[0], self._chunk_size)
+			self._objects = [self._objects[i] for i in order]
+			self._yup_matrices = self._yup_matrices[order]
+			yup_transform = [values[order] for values in yup_transform]
+		self._transforms = transform_records(*yup_transform)
+		self._chunk = None
+		self._chunks = [] # index entries of the finished cell files
+		self._chunk_writers = [] # writers of the finished cell files, published with the index
+		# Create Save folder if it doesn't exist
+		os.makedirs(self._export_scene_path, exist_ok=True)
+		self._export_cache = ExportCache(self._export_scene_path)
+		load_image_hash_index(os.path.join(self._export_scene_path, _IMAGE_HASH_INDEX))
+		with profile_stage("index_materials"):
+			self._material_images = build_material_image_index(self._objects)
+			self._image_usages = get_image_usages(self._material_images)
+		self._texture_destinations = {} # sha256 -> destination of the first source path seen with that content
+		self._texture_processor = self._get_texture_processor()
+		self._rebind_cache = MaterialRebindCache()
+		self._staging_root = os.path.join(self._export_scene_path, _STAGING_DIR)
+		os.makedirs(self._staging_root, exist_ok=True)
+		self._staging_dir = tempfile.mkdtemp(prefix="mavhod_images_", dir=self._staging_root)
+		with profile_stage("prefetch_image_hashes"):
+			self._prefetch_image_hashes()
+		with profile_stage("plan_exports"):
+			self._plan_exports()
+		if self._texture_processor: self._process_textures()
+		# Start streaming the scene file last: a failed setup step must not leave its .tmp behind
+		self._scene_writer = None if (self._cells or self.assets_only) else self._open_scene_writer(self.filepath)
+		try:
+			self._start_local_shards()
+			self._start_linked_libraries()
+		except Exception:
+			if self._scene_writer: self._scene_writer.abort()
+			self._abort_chunks()
+			raise
+		return None
 
-	def _finish(self, context):
-		"""Cleanup and summary after all processing is complete"""
+	def _cleanup(self, context):
+		"""Stop the timer, restore the UI state and purge temporary datablocks. Returns the number reclaimed."""
 		wm = context.window_manager
-		wm.event_timer_remove(self._timer)
-		wm.progress_end()
+		if self._timer:
+			wm.event_timer_remove(self._timer)
+			wm.progress_end()
+			self._timer = None
 		# Clear status message in Header
-		context.workspace.status_text_set(None)
+		if context.workspace: context.workspace.status_text_set(None)
 		# Restore original selection
 		bpy.ops.object.select_all(action='DESELECT')
 		for obj in self._original_selected:
 			obj.select_set(True)
 		context.view_layer.objects.active = self._original_active
-		# Save all scene aggregate data to JSON
+		# Remove rebound materials and hashed images created during the run
+		reclaimed = self._rebind_cache.purge()
+		# Workers and shards have finished (or were stopped): drop their staging folders too
+		shutil.rmtree(self._staging_root, ignore_errors=True)
+		print(f"Reclaimed {reclaimed} temporary datablock(s)")
+		set_active_resolver(None)
+		print(self._path_resolver.report())
+		if self._geometry_sizes[0]:
+			before, after = self._geometry_sizes
+			print(f"Geometry optimization: {before / 1048576:.2f} MiB -> {after / 1048576:.2f} MiB ({100 * (before - after) / before:.0f}% smaller)")
+		return reclaimed
+
+	def _write_profile(self):
+		"""Stop profiling and write the summary table and Chrome trace next to the scene file"""
+		set_active_profiler(None)
+		if not self._profiler: return
 		try:
-			# Create Save folder if it doesn't exist
-			os.makedirs(self._export_scene_path, exist_ok=True)
+			trace_path, summary_path = self._profiler.write(os.path.splitext(self.filepath)[0])
+			print(self._profiler.summary())
+			self.report({'INFO'}, f"Export profile written to {summary_path} and {trace_path}")
+		except OSError as e:
+			self.report({'WARNING'}, f"Could not write export profile: {str(e)}")
+
+	def _cancel(self, context):
+		"""Abort the export (ESC): stop shard processes and library exports in progress, and clean up"""
+		for process, _, _ in self._shards:
+			if process.poll() is None: process.kill()
+		if self._shards:
+			self._shards = []
+			shutil.rmtree(self._shard_dir, ignore_errors=True)
+		if self._running_libraries:
+			self._worker_pool.cancel()
+			self._running_libraries = {}
+		self._library_queue = []
+		reclaimed = self._cleanup(context)
+		# Keep the previous scene file instead of a truncated one
+		if self._scene_writer: self._scene_writer.abort()
+		self._abort_chunks()
+		set_active_profiler(None)
+		self.report({'WARNING'}, f"Export cancelled, reclaimed {reclaimed} temporary datablock(s)")
+		return {'CANCELLED'}
 
-			scene_data = {"instances": self._mesh_data_for_json}
+	def _finish(self, context):
+		"""Cleanup and summary after all processing is complete"""
+		self._reclaimed = self._cleanup(context)
+		# Finish the streamed scene aggregate JSON file
+		try:
+			scene_data = {}
 
 			props = context.scene.MavhodToolProps
 			if props.export_metadata_level:
@@ -348,16 +925,41 @@ class MavhodExportExecute(bpy.types.Operator):
 					level_extras[key] = val
 				if level_extras:
 					scene_data["metadata"] = level_extras
+			lods = self._get_lods_section()
+			if lods:
+				scene_data["lods"] = lods
 
-			with open(self.filepath, 'w', encoding='utf-8') as f:
-				json.dump(scene_data, f, indent=4)
+			# Watch mode (assets_only) leaves the instances in the scene file unchanged
+			if not self.assets_only:
+				with profile_stage("write_scene") as stage:
+					if self._cells:
+						# Chunked: finish the last cell file, then write the index in place of the scene file
+						if self._chunk: self._commit_chunk()
+						self._publish_chunks()
+						self._write_data_file(self.filepath, dict(chunk_size=self._chunk_size, cells=self._chunks, **scene_data))
+					else:
+						multimeshes = self._get_multimesh_section(None)
+						if multimeshes:
+							scene_data["multimeshes"] = multimeshes
+						self._scene_writer.commit(scene_data)
+					stage['bytes'] += os.path.getsize(self.filepath)
+			with profile_stage("save_caches"):
+				self._export_cache.save()
+				save_image_hash_index(os.path.join(self._export_scene_path, _IMAGE_HASH_INDEX))
 		except Exception as e:
+			if self._scene_writer: self._scene_writer.abort()
+			self._abort_chunks()
+			set_active_profiler(None)
 			self.report({'ERROR'}, f"Could not save JSON file: {str(e)}")
 			return {'CANCELLED'}
 
 		print("_finish")
+		self._write_profile()
+		if self._cells:
+			print(f"Wrote {len(self._chunks)} cell file(s) and the chunk index {self.filepath}")
 		self.report(
 			{'INFO'},
-			f"Completed! Exported {len(self._objects)} items, with {len(self._exported_meshes)} unique GLTF model files"
+			f"Completed! Exported {len(self._objects)} items, with {len(self._exported_meshes)} unique GLTF model files "
+			f"({self._skipped_meshes} unchanged, skipped), reclaimed {self._reclaimed} temporary datablock(s)"
 		)
 		return {'FINISHED'}
@@ -3,6 +3,72 @@ import os
 import json
 from bpy_extras.io_utils import ExportHelper, ImportHelper
 
+def apply_settings(props, data):
+    """Apply settings saved by MavhodSaveSettingsJSON to MavhodToolProps (missing keys keep their value)"""
+    # 1. Load path pairs
+    props.path_pairs.clear()
+    path_pairs_data = data.get("path_pairs", [])
+    for item in path_pairs_data:
+        pair = props.path_pairs.add()
+        pair.source_path = item.get("source_path", "")
+        pair.dest_path = item.get("dest_path", "")
+    
+    # 2. Load extensions
+    if "scene_extension" in data:
+        props.scene_extension = data["scene_extension"]
+    if "object_extension" in data:
+        props.object_extension = data["object_extension"]
+    if "light_extension" in data:
+        props.light_extension = data["light_extension"]
+    if "export_worker_count" in data:
+        props.export_worker_count = data["export_worker_count"]
+    if "export_local_shards" in data:
+        props.export_local_shards = data["export_local_shards"]
+    if "export_frame_budget_ms" in data:
+        props.export_frame_budget_ms = data["export_frame_budget_ms"]
+    if "export_compact_json" in data:
+        props.export_compact_json = data["export_compact_json"]
+    if "export_incremental" in data:
+        props.export_incremental = data["export_incremental"]
+    if "export_multimesh_threshold" in data:
+        props.export_multimesh_threshold = data["export_multimesh_threshold"]
+    if "export_chunk_size" in data:
+        props.export_chunk_size = data["export_chunk_size"]
+    if "export_lod_ratios" in data:
+        props.export_lod_ratios = data["export_lod_ratios"]
+    if "export_profile" in data:
+        props.export_profile = data["export_profile"]
+    if "export_light_cell_size" in data:
+        props.export_light_cell_size = data["export_light_cell_size"]
+    if "export_light_cell_limit" in data:
+        props.export_light_cell_limit = data["export_light_cell_limit"]
+    if "export_light_threshold" in data:
+        props.export_light_threshold = data["export_light_threshold"]
+    if "export_watch_interval" in data:
+        props.export_watch_interval = data["export_watch_interval"]
+    if "export_watch_debounce" in data:
+        props.export_watch_debounce = data["export_watch_debounce"]
+    if "export_texture_processing" in data:
+        props.export_texture_processing = data["export_texture_processing"]
+    if "export_texture_max_size" in data:
+        props.export_texture_max_size = data["export_texture_max_size"]
+    if "export_texture_rules" in data:
+        props.export_texture_rules = data["export_texture_rules"]
+    if "export_optimize_geometry" in data:
+        props.export_optimize_geometry = data["export_optimize_geometry"]
+    if "export_quantize_geometry" in data:
+        props.export_quantize_geometry = data["export_quantize_geometry"]
+    
+    if "export_metadata" in data:
+        tex_data = data["export_metadata"]
+        props.export_metadata_node = tex_data.get("metadata_node", True)
+        props.export_metadata_mesh = tex_data.get("metadata_mesh", True)
+        props.export_metadata_material = tex_data.get("metadata_material", True)
+        props.export_metadata_scene = tex_data.get("metadata_scene", True)
+        props.export_metadata_instance = tex_data.get("metadata_instance", True)
+        props.export_metadata_level = tex_data.get("metadata_level", True)
+        props.export_metadata_light = tex_data.get("metadata_light", True)
+
 class MavhodAddPathPair(bpy.types.Operator):
     """Add a new source/destination path pair"""
     bl_idname = "mavhod_tool.add_path_pair"
@@ -45,6 +111,25 @@ class MavhodSaveSettingsJSON(bpy.types.Operator, ExportHelper):
             "scene_extension": props.scene_extension,
             "object_extension": props.object_extension,
             "light_extension": props.light_extension,
+            "export_worker_count": props.export_worker_count,
+            "export_local_shards": props.export_local_shards,
+            "export_frame_budget_ms": props.export_frame_budget_ms,
+            "export_compact_json": props.export_compact_json,
+            "export_incremental": props.export_incremental,
+            "export_multimesh_threshold": props.export_multimesh_threshold,
+            "export_chunk_size": props.export_chunk_size,
+            "export_lod_ratios": props.export_lod_ratios,
+            "export_profile": props.export_profile,
+            "export_light_cell_size": props.export_light_cell_size,
+            "export_light_cell_limit": props.export_light_cell_limit,
+            "export_light_threshold": props.export_light_threshold,
+            "export_watch_interval": props.export_watch_interval,
+            "export_watch_debounce": props.export_watch_debounce,
+            "export_texture_processing": props.export_texture_processing,
+            "export_texture_max_size": props.export_texture_max_size,
+            "export_texture_rules": props.export_texture_rules,
+            "export_optimize_geometry": props.export_optimize_geometry,
+            "export_quantize_geometry": props.export_quantize_geometry,
             "path_pairs": [],
             "export_metadata": {
                 "metadata_node": props.export_metadata_node,
@@ -93,32 +178,7 @@ class MavhodLoadSettingsJSON(bpy.types.Operator, ImportHelper):
             with open(self.filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            # 1. Load path pairs
-            props.path_pairs.clear()
-            path_pairs_data = data.get("path_pairs", [])
-            for item in path_pairs_data:
-                pair = props.path_pairs.add()
-                pair.source_path = item.get("source_path", "")
-                pair.dest_path = item.get("dest_path", "")
-            
-            # 2. Load extensions
-            if "scene_extension" in data:
-                props.scene_extension = data["scene_extension"]
-            if "object_extension" in data:
-                props.object_extension = data["object_extension"]
-            if "light_extension" in data:
-                props.light_extension = data["light_extension"]
-            
-            if "export_metadata" in data:
-                tex_data = data["export_metadata"]
-                props.export_metadata_node = tex_data.get("metadata_node", True)
-                props.export_metadata_mesh = tex_data.get("metadata_mesh", True)
-                props.export_metadata_material = tex_data.get("metadata_material", True)
-                props.export_metadata_scene = tex_data.get("metadata_scene", True)
-                props.export_metadata_instance = tex_data.get("metadata_instance", True)
-                props.export_metadata_level = tex_data.get("metadata_level", True)
-                props.export_metadata_light = tex_data.get("metadata_light", True)
-            
+            apply_settings(props, data)
             self.report({'INFO'}, f"Loaded settings from {self.filepath}")
         except Exception as e:
             self.report({'ERROR'}, f"Failed to load settings: {str(e)}")
@@ -145,6 +205,25 @@ class MavhodExportSetting(bpy.types.Operator):
         col_ext.prop(props, "scene_extension", text="Scene Extension")
         col_ext.prop(props, "object_extension", text="Object Extension")
         col_ext.prop(props, "light_extension", text="Light Extension")
+        col_ext.prop(props, "export_worker_count", text="Background Workers")
+        col_ext.prop(props, "export_local_shards", text="Local Export Processes")
+        col_ext.prop(props, "export_frame_budget_ms", text="Frame Budget (ms)")
+        col_ext.prop(props, "export_compact_json", text="Compact JSON")
+        col_ext.prop(props, "export_incremental", text="Incremental Export")
+        col_ext.prop(props, "export_multimesh_threshold", text="MultiMesh Threshold")
+        col_ext.prop(props, "export_chunk_size", text="Chunk Size")
+        col_ext.prop(props, "export_lod_ratios", text="LOD Ratios")
+        col_ext.prop(props, "export_profile", text="Profile Export")
+        col_ext.prop(props, "export_light_cell_size", text="Light Cell Size")
+        col_ext.prop(props, "export_light_cell_limit", text="Lights per Cell")
+        col_ext.prop(props, "export_light_threshold", text="Light Threshold")
+        col_ext.prop(props, "export_watch_interval", text="Watch Interval")
+        col_ext.prop(props, "export_watch_debounce", text="Watch Debounce")
+        col_ext.prop(props, "export_texture_processing", text="Process Textures")
+        col_ext.prop(props, "export_texture_max_size", text="Max Texture Size")
+        col_ext.prop(props, "export_texture_rules", text="Texture Rules")
+        col_ext.prop(props, "export_optimize_geometry", text="Optimize Geometry")
+        col_ext.prop(props, "export_quantize_geometry", text="Quantize Geometry")
         
         layout.label(text="Export Metadata:")
         box_meta = layout.box()
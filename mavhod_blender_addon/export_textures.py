@@ -0,0 +1,204 @@
+import os
+import json
+import fnmatch
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from .export_core import clone_or_copy
+    from .export_profiler import profiled, profile_bytes
+except ImportError:
+    # Imported as a top-level module by export_bg.py in background Blender and by the benchmarks
+    from export_core import clone_or_copy
+    from export_profiler import profiled, profile_bytes
+
+# Optional texture processing stage (resize, power-of-two for mipmaps, format conversion).
+# Needs Pillow, which Blender does not bundle: install it into Blender's Python to enable
+# the stage, without it textures are copied unchanged as before. Does not import Blender.
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Used when no rules file is set: lossless normal maps, WebP albedo, other textures
+# keep their format. The "Max Texture Size" setting applies to every rule without max_size.
+DEFAULT_TEXTURE_RULES = [
+    {"usage": "normal", "format": "png"},
+    {"usage": "albedo", "format": "webp", "quality": 90},
+    {"format": "keep"},
+]
+
+_FORMAT_EXTENSIONS = {'png': ".png", 'jpeg': ".jpg", 'webp': ".webp"}
+_EXTENSION_FORMATS = {".png": 'png', ".jpg": 'jpeg', ".jpeg": 'jpeg', ".webp": 'webp'}
+_RULE_KEYS = {'match', 'usage', 'max_size', 'format', 'quality', 'lossless', 'power_of_two'}
+
+# Processed textures are kept here (in the scene destination folder) between sessions
+TEXTURE_CACHE_DIR = ".mavhod_texture_cache"
+
+def is_texture_processing_available():
+    return Image is not None
+
+def load_texture_rules(path):
+    """
+    Read a JSON list of texture rules. Each rule may hold:
+    match (glob on the destination path, default "*"), usage ("albedo", "normal" or "data"),
+    max_size (pixels, 0 keeps the size), format ("keep", "png", "jpeg" or "webp"),
+    quality (1-100), lossless (WebP) and power_of_two (round the size for mipmaps).
+    The first matching rule applies to a texture.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    if not isinstance(rules, list):
+        raise ValueError("texture rules must be a JSON list")
+    for rule in rules:
+        unknown = set(rule) - _RULE_KEYS
+        if unknown:
+            raise ValueError(f"unknown texture rule key(s): {', '.join(sorted(unknown))}")
+        if rule.get('format', 'keep') not in {'keep'} | set(_FORMAT_EXTENSIONS):
+            raise ValueError(f"unknown texture format '{rule['format']}'")
+    return rules
+
+def match_texture_rule(rules, dst_path, usage, max_size=0):
+    """First rule matching the destination path and usage, completed with the defaults. None if no rule matches."""
+    normalized = dst_path.replace("\\", "/")
+    for rule in rules:
+        if rule.get('usage') not in (None, usage): continue
+        if not fnmatch.fnmatch(normalized, rule.get('match', "*")): continue
+        return {
+            'format': rule.get('format', 'keep'),
+            'max_size': rule.get('max_size', max_size),
+            'quality': rule.get('quality', 90),
+            'lossless': rule.get('lossless', False),
+            'power_of_two': rule.get('power_of_two', False),
+        }
+    return None
+
+def get_rule_key(rule):
+    """Short stable digest of a completed rule, part of the texture cache key"""
+    return hashlib.sha256(json.dumps(rule, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+def get_output_format(rule, src_path):
+    if rule['format'] != 'keep':
+        return rule['format']
+    return _EXTENSION_FORMATS.get(os.path.splitext(src_path)[1].lower(), 'png')
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    except OSError:
+        return None
+
+def _fit_size(width, height, rule):
+    scale = 1.0
+    if rule['max_size'] and max(width, height) > rule['max_size']:
+        scale = rule['max_size'] / max(width, height)
+    new_width = max(1, round(width * scale))
+    new_height = max(1, round(height * scale))
+    if rule['power_of_two']:
+        # Largest power of two not above the fitted size
+        new_width = 1 << (new_width.bit_length() - 1)
+        new_height = 1 << (new_height.bit_length() - 1)
+    return new_width, new_height
+
+def process_texture(src_path, out_path, rule):
+    """Resize and re-encode one texture with Pillow, writing out_path through a temporary file"""
+    output_format = get_output_format(rule, out_path)
+    with Image.open(src_path) as img:
+        img.load()
+        size = _fit_size(img.width, img.height, rule)
+        if size != img.size:
+            img = img.resize(size, Image.LANCZOS)
+        has_alpha = img.mode in {'RGBA', 'LA', 'PA'} or (img.mode == 'P' and 'transparency' in img.info)
+        if output_format == 'jpeg':
+            img = img.convert('RGB')
+        elif img.mode not in {'RGB', 'RGBA', 'L', 'LA'}:
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+        tmp_path = out_path + ".tmp"
+        if output_format == 'png':
+            img.save(tmp_path, 'PNG', optimize=True)
+        elif output_format == 'jpeg':
+            img.save(tmp_path, 'JPEG', quality=rule['quality'], optimize=True)
+        else:
+            img.save(tmp_path, 'WEBP', quality=rule['quality'], lossless=rule['lossless'], method=4)
+    os.replace(tmp_path, out_path)
+
+class TextureProcessor:
+    """
+    Processes textures by rule into a content-addressed cache and places the results at
+    their destinations. Cache entries are named <source sha256>_<rule key>.<ext>, so an
+    unchanged texture under an unchanged rule costs a stat. Pillow releases the GIL while
+    decoding, resizing and encoding, so textures are processed on a thread pool.
+    """
+
+    def __init__(self, cache_dir, rules, max_size=0, max_workers=None):
+        self.cache_dir = cache_dir
+        self.rules = rules
+        self.max_size = max_size
+        self.max_workers = max_workers
+        self.hits = 0
+        self.misses = 0
+        self.failed = 0
+
+    def get_rules_key(self):
+        """Digest of the rule set, for export fingerprints"""
+        return get_rule_key({'rules': self.rules, 'max_size': self.max_size})
+
+    def _plan(self, hash_name, meta):
+        rule = match_texture_rule(self.rules, meta['dst_path'], meta.get('usage', 'data'), self.max_size)
+        if rule is None: return None
+        ext = _FORMAT_EXTENSIONS[get_output_format(rule, meta['src_path'])]
+        cache_path = os.path.join(self.cache_dir, f"{hash_name}_{get_rule_key(rule)}{ext}")
+        return rule, cache_path, os.path.splitext(meta['dst_path'])[0] + ext
+
+    def _run(self, task):
+        src_path, cache_path, rule = task
+        try:
+            process_texture(src_path, cache_path, rule)
+            return True
+        except Exception as e:
+            print(f"Error processing texture {src_path}: {str(e)}")
+            return False
+
+    @profiled("process_textures")
+    def process(self, image_metadata):
+        """
+        Process every texture of image_metadata ({ sha256: {src_path, dst_path, usage} })
+        that has a destination and a matching rule. Sets meta['processed_path'] to the
+        placed output. Returns the number of textures placed.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        planned = {} # sha256 -> (meta, cache_path, final_path)
+        tasks = {} # cache_path -> (src_path, cache_path, rule)
+        for hash_name, meta in image_metadata.items():
+            if not meta.get('dst_path'): continue
+            plan = self._plan(hash_name, meta)
+            if plan is None: continue
+            rule, cache_path, final_path = plan
+            planned[hash_name] = (meta, cache_path, final_path)
+            if os.path.isfile(cache_path):
+                self.hits += 1
+            elif cache_path not in tasks:
+                self.misses += 1
+                tasks[cache_path] = (meta['src_path'], cache_path, rule)
+        if tasks:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for ok in executor.map(self._run, tasks.values()):
+                    if not ok: self.failed += 1
+        placed = 0
+        for meta, cache_path, final_path in planned.values():
+            cache_key = _stat_key(cache_path)
+            if cache_key is None: continue
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            # clone_or_copy keeps the mtime: same size and mtime as the cache entry means already placed
+            if _stat_key(final_path) != cache_key:
+                clone_or_copy(cache_path, final_path)
+                profile_bytes(os.path.getsize(final_path))
+            meta['processed_path'] = final_path
+            placed += 1
+        return placed
+
+    def report(self):
+        return (
+            f"Texture processing: {self.hits} cached, {self.misses} processed"
+            + (f", {self.failed} failed" if self.failed else "")
+        )
@@ -1,15 +1,37 @@
 import bpy
 import os
-import shutil
-import hashlib
-import json
-import re
+import math
 import mathutils
+import numpy as np
+from array import array
+try:
+    from .export_profiler import profiled, profile_bytes
+    from .export_core import (
+        get_robust_relpath, resolve_path, PathResolver, set_active_resolver, get_active_resolver,
+        patch_gltf_data, patch_gltf_output, patch_glb_output, dump_json_bytes,
+        get_gltf_export_format, is_glb_file, read_glb_json, write_glb_json, parse_lod_ratios, get_lod_path,
+        SceneJsonWriter, write_json_file, hash_image_file, hash_image_files, load_image_hash_index,
+        save_image_hash_index, clone_or_copy
+    )
+    from .godot_variant import PackedStringArray
+except ImportError:
+    # Imported as a top-level module by export_bg.py in background Blender
+    from export_profiler import profiled, profile_bytes
+    from export_core import (
+        get_robust_relpath, resolve_path, PathResolver, set_active_resolver, get_active_resolver,
+        patch_gltf_data, patch_gltf_output, patch_glb_output, dump_json_bytes,
+        get_gltf_export_format, is_glb_file, read_glb_json, write_glb_json, parse_lod_ratios, get_lod_path,
+        SceneJsonWriter, write_json_file, hash_image_file, hash_image_files, load_image_hash_index,
+        save_image_hash_index, clone_or_copy
+    )
+    from godot_variant import PackedStringArray
 
 # Z-up to Y-up conversion matrix:
 # X_B = X_G, Y_B = -Z_G, Z_B = Y_G
 _YUP_MATRIX = mathutils.Matrix(((1, 0, 0, 0), (0, 0, -1, 0), (0, 1, 0, 0), (0, 0, 0, 1)))
 _YUP_MATRIX_INV = _YUP_MATRIX.inverted()
+_YUP_MATRIX_NP = np.array(_YUP_MATRIX, dtype=np.float64)
+_YUP_MATRIX_INV_NP = np.array(_YUP_MATRIX_INV, dtype=np.float64)
 
 def convert_zup_to_yup(loc, rot_quat, scale):
 	"""Convert Blender Z-up transform to Y-up (Godot-style).
@@ -21,137 +43,317 @@ def convert_zup_to_yup(loc, rot_quat, scale):
 	scale_G = mathutils.Vector((scale.x, scale.z, scale.y))
 	return loc_G, rot_quat_G, scale_G
 
-def get_robust_relpath(target_path, base_path):
-    """
-    Calculate relative path from base_path to target_path.
-    Ensures both paths are absolute and resolves symlinks before calculation.
-    """
-    if not target_path or not base_path: return target_path
-    abs_target = os.path.realpath(bpy.path.abspath(target_path))
-    abs_base = os.path.realpath(bpy.path.abspath(base_path))
-    try:
-        return os.path.relpath(abs_target, abs_base)
-    except (ValueError, Exception):
-        return abs_target
-
-def patch_gltf_output(dst_path, metadata_settings, image_metadata=None, object_ext=".gltf"):
-    """
-    Post-process GLTF output:
-    1. Strip node transformations (identity).
-    2. Patch image URIs using image_metadata.
-    3. Remove hashed suffixes from material names.
-    4. Filter metadata (extras) from nodes, meshes, materials, and scenes.
-    5. Handle file extension renaming.
-    """
-    if not os.path.isfile(dst_path):
-        return
-
-    try:
-        with open(dst_path, 'r', encoding='utf-8') as f:
-            gltf_data = json.load(f)
-
-        gltf_dir = os.path.dirname(dst_path)
-        modified = False
-
-        # 1. Strip Node transformations
-        if 'nodes' in gltf_data:
-            for node in gltf_data['nodes']:
-                for key in ['translation', 'rotation', 'scale', 'matrix']:
-                    if key in node:
-                        del node[key]
-                        modified = True
-                # Filter Node Metadata
-                if not metadata_settings.get('node', True) and 'extras' in node:
-                    del node['extras']
-                    modified = True
-
-        # 2. Patch image URIs
-        if image_metadata and 'images' in gltf_data:
-            for img in gltf_data['images']:
-                uri = img.get('uri')
-                if not uri: continue
-                file_basename = os.path.basename(uri)
-                hash_name, ext = os.path.splitext(file_basename)
-                
-                if hash_name in image_metadata:
-                    meta = image_metadata[hash_name]
-                    final_image_dst = meta.get('dst_path')
-                    if final_image_dst:
-                        current_image_path = os.path.join(gltf_dir, uri)
-                        if os.path.exists(current_image_path):
-                            os.makedirs(os.path.dirname(final_image_dst), exist_ok=True)
-                            shutil.move(current_image_path, final_image_dst)
-                            rel_uri = get_robust_relpath(final_image_dst, gltf_dir)
-                            img['uri'] = rel_uri.replace("\\", "/")
-                            img['name'] = os.path.splitext(os.path.basename(final_image_dst))[0]
-                            modified = True
-
-        # 3. Clean Material Names and Filter Material Metadata
-        if 'materials' in gltf_data:
-            for mat in gltf_data['materials']:
-                if not metadata_settings.get('material', True) and 'extras' in mat:
-                    del mat['extras']
-                    modified = True
-                name = mat.get('name', '')
-                clean = re.sub(r'_hashed(\.\d+)?$', '', name)
-                if clean != name:
-                    mat['name'] = clean
-                    modified = True
-
-        # 4. Filter Mesh Metadata
-        if not metadata_settings.get('mesh', True) and 'meshes' in gltf_data:
-            for mesh in gltf_data['meshes']:
-                if 'extras' in mesh:
-                    del mesh['extras']
-                    modified = True
-                for primitive in mesh.get('primitives', []):
-                    if 'extras' in primitive:
-                        del primitive['extras']
-                        modified = True
-
-        # 5. Filter Scene Metadata
-        if not metadata_settings.get('scene', True) and 'scenes' in gltf_data:
-            for scene in gltf_data['scenes']:
-                if 'extras' in scene:
-                    del scene['extras']
-                    modified = True
-
-        # Determine final output path
-        dst_ext = os.path.splitext(dst_path)[1]
-        if dst_ext.lower() != object_ext.lower():
-            final_path = os.path.splitext(dst_path)[0] + object_ext
-        else:
-            final_path = dst_path
-
-        if modified or final_path != dst_path:
-            with open(final_path, 'w', encoding='utf-8') as f:
-                json.dump(gltf_data, f, indent=4)
-            if final_path != dst_path and os.path.isfile(dst_path):
-                os.remove(dst_path)
-
-    except Exception as e:
-        print(f"Error patching GLTF {dst_path}: {str(e)}")
-
-def get_images_from_materials():
-    """Find all images used in materials of currently selected objects."""
+def read_world_matrices(objects):
+    """
+    World matrices of objects as an (n, 4, 4) row-major array.
+    Every matrix in the file is read with a single foreach_get and the requested
+    objects are picked out by session_uid, instead of one matrix_world access each.
+    """
+    if not objects:
+        return np.empty((0, 4, 4), dtype=np.float64)
+    all_objects = bpy.data.objects
+    count = len(all_objects)
+    buffer = np.empty(count * 16, dtype=np.float32)
+    all_objects.foreach_get('matrix_world', buffer)
+    uids = np.empty(count, dtype=np.int32)
+    all_objects.foreach_get('session_uid', uids)
+    order = np.argsort(uids)
+    wanted = np.fromiter((obj.session_uid for obj in objects), dtype=np.int64, count=len(objects)).astype(np.int32)
+    indices = order[np.searchsorted(uids[order], wanted)]
+    # foreach_get returns Blender's column-major storage
+    return buffer.reshape(count, 4, 4)[indices].transpose(0, 2, 1).astype(np.float64)
+
+def world_matrices_to_yup(matrices):
+    """Z-up to Y-up change of basis for an (n, 4, 4) array of world matrices"""
+    return _YUP_MATRIX_INV_NP @ matrices @ _YUP_MATRIX_NP
+
+def _matrices_to_quats(rot):
+    """
+    Quaternions (n, 4) as (w, x, y, z) of normalized (n, 3, 3) rotation matrices, using the
+    same branches as Blender's mat3_normalized_to_quat so results match Matrix.to_quaternion().
+    """
+    # Blender indexes mat[column][row]
+    c = lambda i, j: rot[:, j, i]
+    case_a = (c(2, 2) < 0) & (c(0, 0) > c(1, 1))
+    case_b = (c(2, 2) < 0) & ~case_a
+    case_c = (c(2, 2) >= 0) & (c(0, 0) < -c(1, 1))
+    quats = np.empty((len(rot), 4))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # (w >= 0 is kept by flipping s, as Blender does)
+        s = 2.0 * np.sqrt(np.maximum(1.0 + c(0, 0) - c(1, 1) - c(2, 2), 0.0))
+        s = np.where(c(1, 2) < c(2, 1), -s, s)
+        qa = np.stack([(c(1, 2) - c(2, 1)) / s, 0.25 * s, (c(0, 1) + c(1, 0)) / s, (c(2, 0) + c(0, 2)) / s], axis=1)
+        s = 2.0 * np.sqrt(np.maximum(1.0 - c(0, 0) + c(1, 1) - c(2, 2), 0.0))
+        s = np.where(c(2, 0) < c(0, 2), -s, s)
+        qb = np.stack([(c(2, 0) - c(0, 2)) / s, (c(0, 1) + c(1, 0)) / s, 0.25 * s, (c(1, 2) + c(2, 1)) / s], axis=1)
+        s = 2.0 * np.sqrt(np.maximum(1.0 - c(0, 0) - c(1, 1) + c(2, 2), 0.0))
+        s = np.where(c(0, 1) < c(1, 0), -s, s)
+        qc = np.stack([(c(0, 1) - c(1, 0)) / s, (c(2, 0) + c(0, 2)) / s, (c(1, 2) + c(2, 1)) / s, 0.25 * s], axis=1)
+        s = 2.0 * np.sqrt(np.maximum(1.0 + c(0, 0) + c(1, 1) + c(2, 2), 0.0))
+        qd = np.stack([0.25 * s, (c(1, 2) - c(2, 1)) / s, (c(2, 0) - c(0, 2)) / s, (c(0, 1) - c(1, 0)) / s], axis=1)
+    quats[:] = np.where(case_a[:, None], qa, np.where(case_b[:, None], qb, np.where(case_c[:, None], qc, qd)))
+    length = np.linalg.norm(quats, axis=1)
+    degenerate = ~(length > 0)
+    quats[degenerate] = (1.0, 0.0, 0.0, 0.0)
+    length[degenerate] = 1.0
+    return quats / length[:, None]
+
+def decompose_matrices(matrices):
+    """
+    Vectorized Matrix.decompose() for an (n, 4, 4) array.
+    Returns (loc (n, 3), quat (n, 4) as (w, x, y, z), scale (n, 3)); like Blender, a negative
+    determinant negates both the scale and the rotation matrix.
+    """
+    loc = matrices[:, :3, 3]
+    basis = matrices[:, :3, :3]
+    scale = np.linalg.norm(basis, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rot = np.where(scale[:, None, :] > 0, basis / scale[:, None, :], 0.0)
+    negative = np.linalg.det(basis) < 0
+    rot[negative] *= -1.0
+    scale[negative] *= -1.0
+    return loc, _matrices_to_quats(rot), scale
+
+def batch_convert_zup_to_yup(objects):
+    """
+    Batched equivalent of convert_zup_to_yup(*obj.matrix_world.decompose()) for many objects.
+    Returns (matrices, loc, quat, scale) arrays in Y-up space, quat as (w, x, y, z).
+    """
+    matrices = world_matrices_to_yup(read_world_matrices(objects))
+    return (matrices, *decompose_matrices(matrices))
+
+def transform_records(loc, quat, scale):
+    """Per-row {"location", "rotation", "scale"} dicts in the scene/light file layout"""
+    # Round through float32 so values print exactly like the mathutils based records
+    loc, quat, scale = (a.astype(np.float32).tolist() for a in (loc, quat, scale))
+    return [
+        {
+            "location": {"x": l[0], "y": l[1], "z": l[2]},
+            "rotation": {"x": q[1], "y": q[2], "z": q[3], "w": q[0]},
+            "scale": {"x": s[0], "y": s[1], "z": s[2]}
+        }
+        for l, q, s in zip(loc, quat, scale)
+    ]
+
+def sort_by_chunk(loc, chunk_size):
+    """
+    Assign Y-up positions loc (n, 3) to square grid cells (ix, iz) of chunk_size on the
+    horizontal X/Z plane. Returns (order, cells): the stable permutation grouping the
+    positions cell by cell, and the cell of each position in that order.
+    """
+    cells = np.floor(loc[:, [0, 2]] / chunk_size).astype(np.int64)
+    order = np.lexsort((cells[:, 1], cells[:, 0]))
+    return order, [tuple(cell) for cell in cells[order].tolist()]
+
+def get_chunk_cell(x, z, chunk_size):
+    """Grid cell (ix, iz) of a single Y-up position, matching sort_by_chunk"""
+    return (math.floor(x / chunk_size), math.floor(z / chunk_size))
+
+def get_chunk_filepath(filepath, cell):
+    """Per-cell file next to the index file: level.json -> level_<ix>_<iz>.json"""
+    base, ext = os.path.splitext(filepath)
+    return f"{base}_{cell[0]}_{cell[1]}{ext}"
+
+def get_chunk_bounds(cell, chunk_size, y_min, y_max):
+    """Cell bounds: the grid square on X/Z and the height range of its content on Y"""
+    return {
+        "min": {"x": cell[0] * chunk_size, "y": y_min, "z": cell[1] * chunk_size},
+        "max": {"x": (cell[0] + 1) * chunk_size, "y": y_max, "z": (cell[1] + 1) * chunk_size}
+    }
+
+def get_light_range(energy, color, threshold, cutoff_distance=0.0):
+    """
+    Influence radius of a point, spot or area light: the distance at which its inverse-square
+    irradiance energy * max(color) / (4 pi d^2) falls to threshold (W/m^2). A positive
+    custom distance (Blender's light cutoff) caps the radius.
+    """
+    intensity = energy * max(color)
+    if intensity <= 0 or threshold <= 0:
+        return 0.0
+    radius = math.sqrt(intensity / (4 * math.pi * threshold))
+    if cutoff_distance > 0:
+        radius = min(radius, cutoff_distance)
+    return radius
+
+def get_light_bounding_sphere(position, direction, radius, spot_size=None):
+    """
+    (center, radius) of a sphere enclosing the lit volume. Spot cones with a half angle
+    below 45 degrees get the sphere around the cone of height radius instead of the
+    sphere around the light.
+    """
+    if spot_size is not None and spot_size < math.pi / 2:
+        sphere_radius = radius / (2 * math.cos(spot_size / 2) ** 2)
+        return tuple(p + d * sphere_radius for p, d in zip(position, direction)), sphere_radius
+    return tuple(position), radius
+
+def build_light_cell_table(names, lights, cell_size, max_lights):
+    """
+    Precomputed per-cell light lists on the chunk grid (cells (ix, iz) as in get_chunk_cell).
+    lights holds one dict per name: {"position", "range", "center", "radius", "intensity"}
+    for local lights, or None for lights reaching everywhere (sun), listed once as global.
+    Every cell touched by a bounding sphere (center, radius) lists at most max_lights
+    lights, most important first. Importance is the light's irradiance at the nearest
+    point of the cell, windowed to zero at its range (the distance from position, which
+    for a spot light is larger than the radius of the sphere around its cone).
+    Returns (table, dropped): the table with flat packed arrays (cells: ix, iz, start,
+    count per cell; indices into lights) and the number of light/cell pairs left out by
+    the limit.
+    """
+    global_lights = array('i')
+    candidates = {} # cell -> [(importance, light index)]
+    for index, light in enumerate(lights):
+        if light is None:
+            global_lights.append(index)
+            continue
+        if light["radius"] <= 0:
+            continue
+        cx, _, cz = light["center"]
+        reach = light["radius"]
+        ixs = np.arange(math.floor((cx - reach) / cell_size), math.floor((cx + reach) / cell_size) + 1)
+        izs = np.arange(math.floor((cz - reach) / cell_size), math.floor((cz + reach) / cell_size) + 1)
+        ix, iz = (grid.ravel() for grid in np.meshgrid(ixs, izs, indexing='ij'))
+        # Keep the cells whose square intersects the bounding sphere's footprint
+        nearest_x = np.clip(cx, ix * cell_size, (ix + 1) * cell_size)
+        nearest_z = np.clip(cz, iz * cell_size, (iz + 1) * cell_size)
+        touched = (nearest_x - cx) ** 2 + (nearest_z - cz) ** 2 <= reach * reach
+        ix, iz = ix[touched], iz[touched]
+        # Irradiance from the light position with a smooth window reaching zero at its range
+        lx, _, lz = light["position"]
+        dist_sq = (np.clip(lx, ix * cell_size, (ix + 1) * cell_size) - lx) ** 2 + \
+                  (np.clip(lz, iz * cell_size, (iz + 1) * cell_size) - lz) ** 2
+        window = np.clip(1.0 - (dist_sq / (light["range"] ** 2)) ** 2, 0.0, 1.0) ** 2
+        importance = light["intensity"] / np.maximum(dist_sq, 1.0) * window
+        for cell_x, cell_z, value in zip(ix.tolist(), iz.tolist(), importance.tolist()):
+            candidates.setdefault((cell_x, cell_z), []).append((value, index))
+    cells = array('i')
+    indices = array('i')
+    dropped = 0
+    for cell in sorted(candidates):
+        ranked = sorted(candidates[cell], key=lambda item: (-item[0], item[1]))
+        dropped += max(0, len(ranked) - max_lights)
+        cells.extend((cell[0], cell[1], len(indices), min(len(ranked), max_lights)))
+        indices.extend(index for _, index in ranked[:max_lights])
+    table = {
+        "cell_size": cell_size,
+        "max_lights": max_lights,
+        "lights": PackedStringArray(names),
+        "global": global_lights,
+        "cells": cells,
+        "indices": indices
+    }
+    return table, dropped
+
+def get_light_table_path(filepath):
+    """Light cell table next to the light file: lights.json -> lights_cells.json"""
+    base, ext = os.path.splitext(filepath)
+    return f"{base}_cells{ext}"
+
+def export_lod_chain(obj, output_path, lod_ratios, use_extras=False, apply_modifiers=True):
+    """
+    Export one decimated version of obj per ratio next to output_path (see get_lod_path).
+    Each LOD is a temporary copy of obj sharing its mesh and materials, with a COLLAPSE
+    Decimate modifier added after its own modifiers; the copy is removed after export.
+    With apply_modifiers=False the copy's own modifiers are dropped first, so the LODs
+    decimate the same base mesh as an export made without applying modifiers.
+    obj is selected and active again afterwards. Returns the written paths.
+    """
+    paths = []
+    for level, ratio in enumerate(lod_ratios, start=1):
+        lod_obj = obj.copy()
+        lod_obj.name = f"{obj.name}_lod{level}"
+        bpy.context.scene.collection.objects.link(lod_obj)
+        try:
+            if not apply_modifiers:
+                lod_obj.modifiers.clear()
+            mod = lod_obj.modifiers.new(name="LOD Decimate", type='DECIMATE')
+            mod.decimate_type = 'COLLAPSE'
+            mod.ratio = ratio
+            bpy.ops.object.select_all(action='DESELECT')
+            lod_obj.select_set(True)
+            bpy.context.view_layer.objects.active = lod_obj
+            path = get_lod_path(output_path, level)
+            bpy.ops.export_scene.gltf(
+                filepath=path,
+                use_selection=True,
+                export_format=get_gltf_export_format(os.path.splitext(path)[1]),
+                export_image_format='AUTO',
+                export_apply=True,
+                export_extras=use_extras
+            )
+            paths.append(path)
+        finally:
+            bpy.data.objects.remove(lod_obj, do_unlink=True)
+    bpy.ops.object.select_all(action='DESELECT')
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+    return paths
+
+def build_material_image_index(objects):
+    """
+    Walk the node tree of every material used by objects once.
+    Returns Mapping: { material: [images used by its Image Texture nodes] }.
+    """
+    material_index = {}
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        for slot in obj.material_slots:
+            mat = slot.material
+            if not mat or mat in material_index:
+                continue
+            images = []
+            if mat.use_nodes:
+                for node in mat.node_tree.nodes:
+                    if node.type == 'TEX_IMAGE' and node.image and node.image not in images:
+                        images.append(node.image)
+            material_index[mat] = images
+    return material_index
+
+def get_image_usages(material_index):
+    """
+    Classify the images of a material index for the texture stage:
+    { image: "normal" | "albedo" | "data" }. Images feeding a Normal Map node are normal
+    maps, other color-managed (non "Non-Color") images are albedo, the rest is data.
+    """
+    usages = {}
+    for mat in material_index:
+        if not (mat.use_nodes and mat.node_tree): continue
+        for link in mat.node_tree.links:
+            node = link.from_node
+            if node.type == 'TEX_IMAGE' and node.image and link.to_node.type == 'NORMAL_MAP':
+                usages[node.image] = 'normal'
+    for images in material_index.values():
+        for img in images:
+            if img not in usages:
+                usages[img] = 'data' if img.colorspace_settings.name == 'Non-Color' else 'albedo'
+    return usages
+
+def get_images_from_materials(objects=None, material_index=None):
+    """
+    Find all images used in materials of objects (default: currently selected objects).
+    With a material_index from build_material_image_index no node tree is walked again.
+    """
+    if objects is None:
+        objects = bpy.context.selected_objects
+    if material_index is None:
+        material_index = build_material_image_index(objects)
     images = set()
-    for obj in bpy.context.selected_objects:
+    for obj in objects:
         if obj.type == 'MESH':
             for slot in obj.material_slots:
-                mat = slot.material
-                if mat and mat.use_nodes:
-                    for node in mat.node_tree.nodes:
-                        if node.type == 'TEX_IMAGE' and node.image:
-                            images.add(node.image)
+                if slot.material:
+                    images.update(material_index.get(slot.material, ()))
     return images
 
-def copy_and_hash_images(output_dir):
+@profiled("copy_and_hash_images")
+def copy_and_hash_images(output_dir, objects=None, material_index=None):
     """
-    Copy images to output_dir and rename them to the hash of their real path.
+    Stage images in output_dir, named by the SHA-256 of their content, so identical
+    images collapse to one file. Images already staged are not copied again.
     Returns Mapping: { image_name: hashed_full_path }.
     """
     os.makedirs(output_dir, exist_ok=True)
-    images = get_images_from_materials()
+    images = get_images_from_materials(objects, material_index)
     image_mapping = {}
     
     for img in images:
@@ -159,42 +361,79 @@ def copy_and_hash_images(output_dir):
             continue
             
         # Get real file path
-        abs_path = bpy.path.abspath(img.filepath)
-        real_path = os.path.realpath(abs_path)
+        real_path = resolve_path(img.filepath)
         
         if not os.path.isfile(real_path):
             print(f"Warning: Image file not found: {real_path}")
             continue
             
-        # Create SHA256 Hash from real path
-        hash_obj = hashlib.sha256(real_path.encode('utf-8'))
-        hash_name = hash_obj.hexdigest()
-        
-        # Get file extension
-        ext = os.path.splitext(real_path)[1]
-        new_filename = hash_name + ext
-        dst_path = os.path.join(output_dir, new_filename)
-        
-        # Copy file
         try:
-            shutil.copy2(real_path, dst_path)
-            print(f"Copied image: {real_path} -> {dst_path}")
+            # Create SHA256 Hash from file content
+            hash_name = hash_image_file(real_path)
+            
+            # Get file extension
+            ext = os.path.splitext(real_path)[1]
+            new_filename = hash_name + ext
+            dst_path = os.path.join(output_dir, new_filename)
+            
+            # Content-addressed name: an existing file of the same size is the same image
+            if not (os.path.isfile(dst_path) and os.path.getsize(dst_path) == os.path.getsize(real_path)):
+                clone_or_copy(real_path, dst_path)
+                profile_bytes(os.path.getsize(dst_path))
+                print(f"Copied image: {real_path} -> {dst_path}")
             image_mapping[img.name] = dst_path
         except Exception as e:
             print(f"Error copying image {real_path}: {str(e)}")
             
     return image_mapping
 
-def rebind_materials_to_hashed_images(image_mapping):
+class MaterialRebindCache:
+    """
+    Run-scoped record of rebound material copies and the hashed images they load.
+    Each source material maps to exactly one rebound copy for the whole run;
+    purge() removes every temporary datablock again.
+    """
+
+    def __init__(self):
+        self.materials = {} # Mapping: { source_material: rebound_material }
+        self.images = set()
+
+    def purge(self):
+        """Remove all rebound materials and loaded hashed images. Returns the number reclaimed."""
+        reclaimed = 0
+        for mat in self.materials.values():
+            try:
+                bpy.data.materials.remove(mat)
+                reclaimed += 1
+            except ReferenceError:
+                pass
+        for img in self.images:
+            try:
+                bpy.data.images.remove(img)
+                reclaimed += 1
+            except ReferenceError:
+                pass
+        self.materials.clear()
+        self.images.clear()
+        return reclaimed
+
+def rebind_materials_to_hashed_images(image_mapping, rebind_cache=None, objects=None):
     """
-    Duplicate materials and update them to use new images according to image_mapping.
+    Duplicate materials of objects (default: selected objects) and update them to use new
+    images according to image_mapping. With a MaterialRebindCache, materials already rebound
+    earlier in the run are reused instead of copied again.
     Returns a mapping of { actual_blender_name: original_name } so the caller can
     restore original names in the exported GLTF (Blender may append .001, .002, etc.).
     """
-    material_cache = {} # Mapping: { original_material_name: new_material }
+    if rebind_cache is None:
+        rebind_cache = MaterialRebindCache()
+    if objects is None:
+        objects = bpy.context.selected_objects
+    material_cache = rebind_cache.materials
+    used = {} # Mapping: { original_material_name: new_material } for this call
     
-    # Process selected objects
-    for obj in bpy.context.selected_objects:
+    # Process objects
+    for obj in objects:
         if obj.type != 'MESH' or not obj.data:
             continue
         
@@ -204,11 +443,11 @@ def rebind_materials_to_hashed_images(image_mapping):
             if not mat:
                 continue
                 
-            if mat.name not in material_cache:
+            if mat not in material_cache:
                 # Duplicate material
                 new_mat = mat.copy()
                 new_mat.name = f"{mat.name}_hashed"
-                material_cache[mat.name] = new_mat
+                material_cache[mat] = new_mat
                 
                 # Scan for Image nodes and swap images
                 if new_mat.use_nodes:
@@ -219,12 +458,14 @@ def rebind_materials_to_hashed_images(image_mapping):
                                 hashed_filepath = image_mapping[img_name]
                                 # Load new image into Blender (reuse if existing)
                                 new_img = bpy.data.images.load(hashed_filepath, check_existing=True)
+                                rebind_cache.images.add(new_img)
                                 node.image = new_img
                                 print(f"Material '{new_mat.name}': Swapped image '{img_name}' -> '{new_img.name}'")
             
             # Replace original material with the hashed version
-            mesh.materials[i] = material_cache[mat.name]
+            mesh.materials[i] = material_cache[mat]
+            used[mat.name] = material_cache[mat]
 
     # Return mapping: { actual_blender_assigned_name -> original_name }
     # new_mat.name may differ from f"{original}_hashed" if Blender appended .001, .002, etc.
-    return {new_mat.name: original_name for original_name, new_mat in material_cache.items()}
+    return {new_mat.name: original_name for original_name, new_mat in used.items()}
@@ -0,0 +1,173 @@
+import bpy
+import os
+import time
+from .export_cache import ExportCache
+from .export_core import SourceWatcher
+from .export_utils import resolve_path
+from bpy_extras.io_utils import ExportHelper
+
+def get_watch_targets(scene_dir):
+	"""
+	Source files of the assets recorded in the export cache of scene_dir:
+	{ path: {(blend_filepath, mesh name)} } for library .blend files and textures.
+	The open file itself is not watched, the artist working in it saves it.
+	"""
+	targets = {}
+	for entry in ExportCache(scene_dir).assets.values():
+		asset = (entry.get('blend_filepath'), entry.get('mesh'))
+		sources = list(entry.get('images', []))
+		if entry.get('is_linked'): sources.append(entry['blend_filepath'])
+		for path in sources:
+			targets.setdefault(path, set()).add(asset)
+	return targets
+
+def export_changed(context, scene_path, changed, targets):
+	"""
+	Re-export the assets depending on the changed files through the regular export
+	pipeline (assets_only: assets are exported, patched and cached, the scene file is kept).
+	Changed libraries are reloaded first. Returns (asset count, operator result or None).
+	"""
+	assets = set()
+	for path in changed:
+		assets |= targets.get(path, set())
+	if not assets: return 0, None
+	for lib in bpy.data.libraries:
+		if lib.filepath and resolve_path(lib.filepath) in changed:
+			print(f"Reloading library: {lib.filepath}")
+			lib.reload()
+	# Remember the selection by name, reloading libraries replaces their datablocks
+	view_layer = context.view_layer
+	original_selected = [obj.name for obj in context.selected_objects]
+	original_active = view_layer.objects.active.name if view_layer.objects.active else None
+	local_filepath = os.path.realpath(bpy.data.filepath)
+	selected = 0
+	for obj in view_layer.objects:
+		wanted = False
+		if obj.type == 'MESH' and obj.data:
+			lib = obj.library or obj.data.library
+			blend_filepath = resolve_path(lib.filepath) if lib and lib.filepath else local_filepath
+			wanted = (blend_filepath, obj.data.name) in assets
+		obj.select_set(wanted)
+		selected += wanted
+	try:
+		if not selected: return len(assets), None
+		return len(assets), bpy.ops.mavhod_tool.export_execute('EXEC_DEFAULT', filepath=scene_path, assets_only=True)
+	finally:
+		for obj in view_layer.objects:
+			obj.select_set(obj.name in original_selected)
+		if original_active in view_layer.objects:
+			view_layer.objects.active = view_layer.objects[original_active]
+
+def watch_loop(context, scene_path, interval=1.0, debounce=2.0):
+	"""Headless watch mode (export_cli.py --watch): poll and re-export until interrupted"""
+	scene_dir = os.path.realpath(os.path.dirname(scene_path))
+	watcher = SourceWatcher(debounce)
+	targets = get_watch_targets(scene_dir)
+	watcher.watch(targets)
+	print(f"Watching {len(targets)} source file(s) of {scene_path} (Ctrl+C to stop)")
+	try:
+		while True:
+			time.sleep(interval)
+			changed = watcher.poll()
+			if not changed: continue
+			count, result = export_changed(context, scene_path, changed, targets)
+			print(f"{len(changed)} source file(s) changed, re-exported {count} asset(s): {sorted(result) if result else 'nothing to do'}")
+			# New assets or textures may have been recorded by the export
+			targets = get_watch_targets(scene_dir)
+			watcher.watch(targets)
+	except KeyboardInterrupt:
+		print("Watch stopped")
+
+
+class MavhodWatchSettings(bpy.types.Operator, ExportHelper):
+	bl_idname = "mavhod_tool.watch_settings"
+	bl_label = "Watch Scene"
+	bl_options = {'REGISTER'}
+
+	filename_ext = ".json"
+	filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'}, maxlen=255,)
+
+	def invoke(self, context, event):
+		props = context.scene.MavhodToolProps
+		ext = props.scene_extension
+		if not ext.startswith("."):
+			ext = "." + ext
+		self.filename_ext = ext
+		self.filter_glob = "*" + ext
+		return super().invoke(context, event)
+
+	def execute(self, context):
+		bpy.ops.mavhod_tool.watch_sources('INVOKE_DEFAULT', filepath=self.filepath)
+		return {'FINISHED'}
+
+
+class MavhodWatchSources(bpy.types.Operator):
+	"""Re-export the assets of a scene whose library .blend files or textures change on disk, until stopped"""
+	bl_idname = "mavhod_tool.watch_sources"
+	bl_label = "Watching Sources..."
+	bl_options = set()
+
+	filepath: bpy.props.StringProperty(options={'HIDDEN'})
+	_timer = None
+	# Only one watch runs at a time; MavhodStopWatch asks it to stop
+	is_running = False
+	_stop_requested = False
+
+	def invoke(self, context, event):
+		if MavhodWatchSources.is_running:
+			self.report({'WARNING'}, "Already watching, stop the running watch first")
+			return {'CANCELLED'}
+		if not self.filepath:
+			self.report({'WARNING'}, "Export filepath not defined!")
+			return {'CANCELLED'}
+		props = context.scene.MavhodToolProps
+		self._scene_dir = os.path.realpath(os.path.dirname(self.filepath))
+		self._watcher = SourceWatcher(props.export_watch_debounce)
+		self._targets = get_watch_targets(self._scene_dir)
+		if not self._targets:
+			self.report({'WARNING'}, "Nothing to watch: export the scene to this folder first")
+			return {'CANCELLED'}
+		self._watcher.watch(self._targets)
+		MavhodWatchSources.is_running = True
+		MavhodWatchSources._stop_requested = False
+		wm = context.window_manager
+		self._timer = wm.event_timer_add(props.export_watch_interval, window=context.window)
+		wm.modal_handler_add(self)
+		context.workspace.status_text_set(f"Watching {len(self._targets)} source file(s)")
+		return {'RUNNING_MODAL'}
+
+	def modal(self, context, event):
+		if MavhodWatchSources._stop_requested: return self._stop(context)
+		if event.type != 'TIMER' or event.timer != self._timer: return {'PASS_THROUGH'}
+		changed = self._watcher.poll()
+		if changed:
+			count, result = export_changed(context, self.filepath, changed, self._targets)
+			if result is not None and 'FINISHED' not in result:
+				self.report({'ERROR'}, f"Re-export of {count} asset(s) failed")
+			elif count:
+				self.report({'INFO'}, f"{len(changed)} source file(s) changed, re-exported {count} asset(s)")
+			# New assets or textures may have been recorded by the export
+			self._targets = get_watch_targets(self._scene_dir)
+			self._watcher.watch(self._targets)
+			if context.workspace: context.workspace.status_text_set(f"Watching {len(self._targets)} source file(s)")
+		return {'PASS_THROUGH'}
+
+	def _stop(self, context):
+		context.window_manager.event_timer_remove(self._timer)
+		self._timer = None
+		if context.workspace: context.workspace.status_text_set(None)
+		MavhodWatchSources.is_running = False
+		MavhodWatchSources._stop_requested = False
+		self.report({'INFO'}, "Stopped watching sources")
+		return {'CANCELLED'}
+
+
+class MavhodStopWatch(bpy.types.Operator):
+	"""Stop the running source watch"""
+	bl_idname = "mavhod_tool.stop_watch"
+	bl_label = "Stop Watching"
+	bl_options = set()
+
+	def execute(self, context):
+		MavhodWatchSources._stop_requested = True
+		return {'FINISHED'}
@@ -0,0 +1,165 @@
+import json
+import queue
+import threading
+import subprocess
+from collections import OrderedDict
+
+# Marker written by export_bg.py in front of every job reply, so replies can be told
+# apart from the regular console output Blender prints on the same stdout pipe.
+RESULT_PREFIX = "@@MAVHOD_RESULT@@ "
+
+class BlenderWorkerError(Exception):
+	pass
+
+class BlenderWorker:
+	"""A background Blender process that keeps one .blend open and exports job manifests read from stdin"""
+
+	def __init__(self, blender_bin, script_path, blend_filepath):
+		self.blend_filepath = blend_filepath
+		cmd = [
+			blender_bin,
+			"--factory-startup",
+			"-b", blend_filepath,
+			"-P", script_path,
+			"--",
+			"--serve"
+		]
+		print(f"Starting worker: {' '.join(cmd)}")
+		self._process = subprocess.Popen(
+			cmd,
+			stdin=subprocess.PIPE,
+			stdout=subprocess.PIPE,
+			text=True,
+			encoding='utf-8',
+			bufsize=1
+		)
+		# stdout is read on a thread so replies can be polled without blocking the UI
+		self._lines = queue.Queue()
+		self._reader = threading.Thread(target=self._read_output, daemon=True)
+		self._reader.start()
+		self.busy = False
+
+	def _read_output(self):
+		for line in self._process.stdout:
+			self._lines.put(line)
+		self._lines.put(None)
+
+	def is_alive(self):
+		return self._process.poll() is None
+
+	def send(self, message):
+		"""Send a job manifest ({"jobs": [...]}) to the worker without waiting for the reply"""
+		if not self.is_alive():
+			raise BlenderWorkerError(f"Worker for {self.blend_filepath} is not running")
+		try:
+			self._process.stdin.write(json.dumps(message) + "\n")
+			self._process.stdin.flush()
+		except OSError as e:
+			raise BlenderWorkerError(f"Worker for {self.blend_filepath} stopped accepting jobs: {str(e)}")
+		self.busy = True
+
+	def poll(self):
+		"""Forward the worker console output received so far. Returns the reply once it has arrived, else None."""
+		while True:
+			try:
+				line = self._lines.get_nowait()
+			except queue.Empty:
+				return None
+			if line is None:
+				self.busy = False
+				raise BlenderWorkerError(f"Worker for {self.blend_filepath} exited with code {self._process.wait()}")
+			if line.startswith(RESULT_PREFIX):
+				self.busy = False
+				return json.loads(line[len(RESULT_PREFIX):])
+			print(line, end="")
+
+	def close(self):
+		if self.busy:
+			# Abandoned job (cancelled export): its reply would be mistaken for the next one's
+			self.kill()
+			return
+		if self.is_alive():
+			try:
+				self._process.stdin.close()
+				self._process.wait(timeout=10)
+			except (OSError, subprocess.TimeoutExpired):
+				self._process.kill()
+				self._process.wait()
+
+	def kill(self):
+		if self.is_alive():
+			self._process.kill()
+			self._process.wait()
+		self.busy = False
+
+class BlenderWorkerPool:
+	"""
+	Long-lived background Blender workers, one per library .blend.
+	At most max_workers processes are kept; the least recently used one is closed first.
+	"""
+
+	def __init__(self, blender_bin, script_path, max_workers=4):
+		self.blender_bin = blender_bin
+		self.script_path = script_path
+		self.max_workers = max(1, max_workers)
+		self.started = 0
+		self._workers = OrderedDict() # blend_filepath -> BlenderWorker
+
+	def _get_worker(self, blend_filepath):
+		worker = self._workers.pop(blend_filepath, None)
+		if worker is not None and not worker.is_alive():
+			worker = None
+		if worker is None:
+			# Close the least recently used idle workers, busy ones are still exporting
+			while len(self._workers) >= self.max_workers:
+				idle = next((path for path, other in self._workers.items() if not other.busy), None)
+				if idle is None: break
+				self._workers.pop(idle).close()
+			worker = BlenderWorker(self.blender_bin, self.script_path, blend_filepath)
+			self.started += 1
+		self._workers[blend_filepath] = worker
+		return worker
+
+	def can_submit(self):
+		"""True while fewer than max_workers workers are exporting"""
+		return sum(1 for worker in self._workers.values() if worker.busy) < self.max_workers
+
+	def submit(self, blend_filepath, message):
+		"""Send a job manifest to the worker owning blend_filepath; poll() returns its reply"""
+		worker = self._get_worker(blend_filepath)
+		try:
+			worker.send(message)
+		except BlenderWorkerError:
+			self._workers.pop(blend_filepath, None)
+			worker.close()
+			raise
+
+	def poll(self):
+		"""
+		Replies of the workers that finished their manifest since the last call, without
+		blocking: a list of (blend_filepath, reply dict or None, BlenderWorkerError or None).
+		"""
+		finished = []
+		for blend_filepath, worker in list(self._workers.items()):
+			if not worker.busy: continue
+			try:
+				reply = worker.poll()
+			except BlenderWorkerError as e:
+				self._workers.pop(blend_filepath, None)
+				worker.close()
+				finished.append((blend_filepath, None, e))
+				continue
+			if reply is not None:
+				finished.append((blend_filepath, reply, None))
+		return finished
+
+	def cancel(self):
+		"""Stop the workers with a job in progress, the idle ones keep their library open"""
+		for blend_filepath, worker in list(self._workers.items()):
+			if worker.busy:
+				self._workers.pop(blend_filepath).kill()
+
+	def shutdown(self):
+		for worker in self._workers.values():
+			worker.close()
+		self._workers.clear()
@@ -0,0 +1,224 @@
+import os
+import sys
+import struct
+from array import array
+
+# Encoder/decoder for Godot 4's Variant binary serialization (var_to_bytes / bytes_to_var),
+# limited to the types the exporters produce. Everything is little-endian and padded to 4 bytes.
+
+NIL = 0
+BOOL = 1
+INT = 2
+FLOAT = 3
+STRING = 4
+DICTIONARY = 27
+ARRAY = 28
+PACKED_BYTE_ARRAY = 29
+PACKED_INT32_ARRAY = 30
+PACKED_INT64_ARRAY = 31
+PACKED_FLOAT32_ARRAY = 32
+PACKED_FLOAT64_ARRAY = 33
+PACKED_STRING_ARRAY = 34
+
+ENCODE_FLAG_64 = 1 << 16
+
+_U32 = struct.Struct('<I')
+_I32 = struct.Struct('<i')
+_I64 = struct.Struct('<q')
+_F32 = struct.Struct('<f')
+_F64 = struct.Struct('<d')
+
+# array typecode -> (Packed*Array type, item size)
+_PACKED_ARRAY_TYPES = {
+	'b': (PACKED_BYTE_ARRAY, 1),
+	'B': (PACKED_BYTE_ARRAY, 1),
+	'i': (PACKED_INT32_ARRAY, 4),
+	'l': (PACKED_INT32_ARRAY, 4),
+	'q': (PACKED_INT64_ARRAY, 8),
+	'f': (PACKED_FLOAT32_ARRAY, 4),
+	'd': (PACKED_FLOAT64_ARRAY, 8),
+}
+
+class PackedStringArray(tuple):
+	"""Marks a sequence of strings to be encoded as PackedStringArray instead of Array"""
+	pass
+
+def _pad(length):
+	return b'\0' * (-length % 4)
+
+def _encode_string(text):
+	data = text.encode('utf-8')
+	return _U32.pack(len(data)) + data + _pad(len(data))
+
+def _encode_packed_array(values):
+	variant_type, item_size = _PACKED_ARRAY_TYPES.get(values.typecode, (None, 0))
+	if variant_type is None or values.itemsize != item_size:
+		raise TypeError(f"Unsupported array typecode '{values.typecode}' (itemsize {values.itemsize})")
+	if sys.byteorder != 'little' and item_size > 1:
+		values = array(values.typecode, values)
+		values.byteswap()
+	data = values.tobytes()
+	return _U32.pack(variant_type) + _U32.pack(len(values)) + data + _pad(len(data))
+
+def encode_variant(value, out):
+	"""Append the Variant encoding of value to the bytearray out"""
+	if value is None:
+		out += _U32.pack(NIL)
+	elif isinstance(value, bool):
+		out += _U32.pack(BOOL) + _U32.pack(1 if value else 0)
+	elif isinstance(value, int):
+		if -0x80000000 <= value <= 0x7FFFFFFF:
+			out += _U32.pack(INT) + _I32.pack(value)
+		else:
+			out += _U32.pack(INT | ENCODE_FLAG_64) + _I64.pack(value)
+	elif isinstance(value, float):
+		# Like Godot, use 32 bits when the value survives the round trip through float32
+		single = _F32.pack(value)
+		if _F32.unpack(single)[0] == value or value != value:
+			out += _U32.pack(FLOAT) + single
+		else:
+			out += _U32.pack(FLOAT | ENCODE_FLAG_64) + _F64.pack(value)
+	elif isinstance(value, str):
+		out += _U32.pack(STRING) + _encode_string(value)
+	elif isinstance(value, dict):
+		out += _U32.pack(DICTIONARY) + _U32.pack(len(value))
+		for key, item in value.items():
+			encode_variant(key, out)
+			encode_variant(item, out)
+	elif isinstance(value, PackedStringArray):
+		# Entries are NUL-terminated and the terminator counts towards the length
+		out += _U32.pack(PACKED_STRING_ARRAY) + _U32.pack(len(value))
+		for item in value:
+			data = item.encode('utf-8') + b'\0'
+			out += _U32.pack(len(data)) + data + _pad(len(data))
+	elif isinstance(value, (list, tuple)):
+		out += _U32.pack(ARRAY) + _U32.pack(len(value))
+		for item in value:
+			encode_variant(item, out)
+	elif isinstance(value, (bytes, bytearray)):
+		out += _U32.pack(PACKED_BYTE_ARRAY) + _U32.pack(len(value)) + bytes(value) + _pad(len(value))
+	elif isinstance(value, array):
+		out += _encode_packed_array(value)
+	else:
+		raise TypeError(f"Cannot encode {type(value).__name__} as a Godot Variant")
+	return out
+
+def var_to_bytes(value):
+	"""Python equivalent of Godot's var_to_bytes() for dict/list/str/int/float/bool/None/array/bytes"""
+	return bytes(encode_variant(value, bytearray()))
+
+def _decode(data, offset):
+	header = _U32.unpack_from(data, offset)[0]
+	variant_type = header & 0xFFFF
+	offset += 4
+	if variant_type == NIL:
+		return None, offset
+	if variant_type == BOOL:
+		return _U32.unpack_from(data, offset)[0] != 0, offset + 4
+	if variant_type == INT:
+		if header & ENCODE_FLAG_64:
+			return _I64.unpack_from(data, offset)[0], offset + 8
+		return _I32.unpack_from(data, offset)[0], offset + 4
+	if variant_type == FLOAT:
+		if header & ENCODE_FLAG_64:
+			return _F64.unpack_from(data, offset)[0], offset + 8
+		return _F32.unpack_from(data, offset)[0], offset + 4
+	if variant_type == STRING:
+		length = _U32.unpack_from(data, offset)[0]
+		offset += 4
+		return data[offset:offset + length].decode('utf-8'), offset + length + (-length % 4)
+	if variant_type == DICTIONARY:
+		count = _U32.unpack_from(data, offset)[0] & 0x7FFFFFFF
+		offset += 4
+		result = {}
+		for _ in range(count):
+			key, offset = _decode(data, offset)
+			result[key], offset = _decode(data, offset)
+		return result, offset
+	if variant_type == ARRAY:
+		count = _U32.unpack_from(data, offset)[0] & 0x7FFFFFFF
+		offset += 4
+		result = []
+		for _ in range(count):
+			item, offset = _decode(data, offset)
+			result.append(item)
+		return result, offset
+	if variant_type == PACKED_STRING_ARRAY:
+		count = _U32.unpack_from(data, offset)[0]
+		offset += 4
+		result = []
+		for _ in range(count):
+			length = _U32.unpack_from(data, offset)[0]
+			offset += 4
+			result.append(data[offset:offset + length].rstrip(b'\0').decode('utf-8'))
+			offset += length + (-length % 4)
+		return PackedStringArray(result), offset
+	for typecode, (packed_type, item_size) in _PACKED_ARRAY_TYPES.items():
+		if packed_type == variant_type and array(typecode).itemsize == item_size:
+			count = _U32.unpack_from(data, offset)[0]
+			offset += 4
+			length = count * item_size
+			if packed_type == PACKED_BYTE_ARRAY:
+				return bytes(data[offset:offset + length]), offset + length + (-length % 4)
+			values = array(typecode, bytes(data[offset:offset + length]))
+			if sys.byteorder != 'little':
+				values.byteswap()
+			return values, offset + length + (-length % 4)
+	raise ValueError(f"Unsupported Variant type {variant_type} at offset {offset - 4}")
+
+def bytes_to_var(data):
+	"""Decode bytes produced by var_to_bytes() (or Godot) back into Python values"""
+	value, _ = _decode(bytes(data), 0)
+	return value
+
+def write_variant_file(filepath, value):
+	"""Write value as a .dbin file (raw var_to_bytes payload), replacing filepath atomically"""
+	tmp_path = filepath + ".tmp"
+	with open(tmp_path, 'wb') as f:
+		f.write(var_to_bytes(value))
+	os.replace(tmp_path, filepath)
+
+class SceneDbinWriter:
+	"""
+	Streaming writer producing the same scene layout as SceneJsonWriter, encoded as a
+	Godot Variant Dictionary for DbinResource / bytes_to_var(). The element counts of the
+	Dictionary and the instances Array are patched in on commit(). Output goes to a
+	temporary file that is renamed over the target, like the JSON writer.
+	"""
+
+	def __init__(self, filepath, compact=False):
+		self.filepath = filepath
+		self.count = 0
+		self._tmp_path = filepath + ".tmp"
+		self._file = open(self._tmp_path, 'wb')
+		self._file.write(_U32.pack(DICTIONARY))
+		self._dict_count_offset = self._file.tell()
+		self._file.write(_U32.pack(0))
+		self._file.write(var_to_bytes("instances") + _U32.pack(ARRAY))
+		self._array_count_offset = self._file.tell()
+		self._file.write(_U32.pack(0))
+
+	def write_instance(self, record):
+		self._file.write(var_to_bytes(record))
+		self.count += 1
+
+	def commit(self, sections=None, publish=True):
+		sections = sections or {}
+		for key, value in sections.items():
+			self._file.write(var_to_bytes(key) + var_to_bytes(value))
+		self._file.seek(self._array_count_offset)
+		self._file.write(_U32.pack(self.count))
+		self._file.seek(self._dict_count_offset)
+		self._file.write(_U32.pack(1 + len(sections)))
+		self._file.close()
+		if publish:
+			self.publish()
+
+	def publish(self):
+		os.replace(self._tmp_path, self.filepath)
+
+	def abort(self):
+		if not self._file.closed:
+			self._file.close()
+		if os.path.isfile(self._tmp_path):
+			os.remove(self._tmp_path)
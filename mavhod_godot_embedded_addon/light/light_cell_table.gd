@@ -0,0 +1,45 @@
+class_name LightCellTable
+extends RefCounted
+
+## Per-cell light lists exported next to a light file (<name>_cells.json / .dbin).
+## Every cell of the grid lists at most max_lights light names, most important first;
+## global lights (sun) apply everywhere. Lookups are a single Dictionary access.
+
+var cell_size: float = 0.0
+var max_lights: int = 0
+var lights: PackedStringArray = PackedStringArray()
+var global_lights: PackedStringArray = PackedStringArray()
+var _cells: Dictionary = {} # Vector2i(ix, iz) -> PackedStringArray
+
+static func from_data(table_data: Dictionary) -> LightCellTable:
+	var table := LightCellTable.new()
+	table.cell_size = table_data["cell_size"]
+	table.max_lights = table_data["max_lights"]
+	table.lights = PackedStringArray(table_data["lights"])
+	for index in table_data["global"]:
+		table.global_lights.append(table.lights[index])
+	var cells := PackedInt32Array(table_data["cells"])
+	var indices := PackedInt32Array(table_data["indices"])
+	# cells holds (ix, iz, start, count) per cell, start/count index into indices
+	for i in range(0, cells.size(), 4):
+		var names := PackedStringArray()
+		for j in range(cells[i + 2], cells[i + 2] + cells[i + 3]):
+			names.append(table.lights[indices[j]])
+		table._cells[Vector2i(cells[i], cells[i + 1])] = names
+	return table
+
+## Cell (ix, iz) of a world position, matching the exporter's grid
+func get_cell(position: Vector3) -> Vector2i:
+	return Vector2i(floori(position.x / cell_size), floori(position.z / cell_size))
+
+## Names of the lights to enable around position: global lights, then the cell's ranked lights
+func get_lights(position: Vector3) -> PackedStringArray:
+	var names := global_lights.duplicate()
+	names.append_array(_cells.get(get_cell(position), PackedStringArray()))
+	return names
+
+# example
+#var table = LightCellTable.from_data(await DbinResource.load_from_file_async("res://level/lights_cells.dbin"))
+#var enabled := table.get_lights(camera.global_position)
+#for light in $Lights.get_children():
+#	light.visible = light.name in enabled
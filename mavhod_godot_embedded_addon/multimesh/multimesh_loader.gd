@@ -0,0 +1,63 @@
+class_name MultiMeshLoader
+extends RefCounted
+
+## Build MultiMeshInstance3D nodes from the "multimeshes" section of an exported scene
+## (JSON or .dbin). Every entry holds an asset_path and a flat float array with 12 floats
+## per instance, already in MultiMesh.buffer order (3x4 basis + origin, Y-up).
+## One MultiMeshInstance3D is created per MeshInstance3D found in the asset scene.
+static func build(scene_data: Dictionary, base_dir: String) -> Array[MultiMeshInstance3D]:
+	var result: Array[MultiMeshInstance3D] = []
+	for entry in scene_data.get("multimeshes", []):
+		var asset_path: String = base_dir.path_join(entry["asset_path"])
+		var asset = load(asset_path)
+		if not asset is PackedScene:
+			push_error("MultiMesh asset is not a scene: " + asset_path)
+			continue
+		var transforms := PackedFloat32Array(entry["transforms"])
+		var instance_count: int = transforms.size() / 12
+		var root: Node = asset.instantiate()
+		for mesh_node in root.find_children("*", "MeshInstance3D", true, false):
+			if mesh_node.mesh == null: continue
+			var multimesh := MultiMesh.new()
+			multimesh.transform_format = MultiMesh.TRANSFORM_3D
+			multimesh.mesh = mesh_node.mesh
+			multimesh.instance_count = instance_count
+			multimesh.buffer = _apply_local_transform(transforms, _get_transform_in_root(mesh_node, root))
+			var instance := MultiMeshInstance3D.new()
+			instance.name = "%s_%s" % [asset_path.get_file().get_basename(), mesh_node.name]
+			instance.multimesh = multimesh
+			result.append(instance)
+		root.free()
+	return result
+
+## Transform of node relative to root (the asset scene origin)
+static func _get_transform_in_root(node: Node3D, root: Node) -> Transform3D:
+	var xform := Transform3D.IDENTITY
+	var current: Node = node
+	while current != root and current is Node3D:
+		xform = current.transform * xform
+		current = current.get_parent()
+	return xform
+
+## Multiply every instance transform by the mesh node's local transform in the asset
+static func _apply_local_transform(transforms: PackedFloat32Array, local: Transform3D) -> PackedFloat32Array:
+	if local.is_equal_approx(Transform3D.IDENTITY):
+		return transforms
+	var buffer := PackedFloat32Array()
+	buffer.resize(transforms.size())
+	for i in range(0, transforms.size(), 12):
+		var t := Transform3D(
+			Vector3(transforms[i], transforms[i + 4], transforms[i + 8]),
+			Vector3(transforms[i + 1], transforms[i + 5], transforms[i + 9]),
+			Vector3(transforms[i + 2], transforms[i + 6], transforms[i + 10]),
+			Vector3(transforms[i + 3], transforms[i + 7], transforms[i + 11])
+		) * local
+		buffer[i] = t.basis.x.x; buffer[i + 1] = t.basis.y.x; buffer[i + 2] = t.basis.z.x; buffer[i + 3] = t.origin.x
+		buffer[i + 4] = t.basis.x.y; buffer[i + 5] = t.basis.y.y; buffer[i + 6] = t.basis.z.y; buffer[i + 7] = t.origin.y
+		buffer[i + 8] = t.basis.x.z; buffer[i + 9] = t.basis.y.z; buffer[i + 10] = t.basis.z.z; buffer[i + 11] = t.origin.z
+	return buffer
+
+# example
+#var data = await DbinResource.load_from_file_async("res://level/level1.dbin")
+#for instance in MultiMeshLoader.build(data, "res://level"):
+#	add_child(instance)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The export helpers are imported as top-level modules, like the benchmarks do:
+# the addon package itself imports Blender
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mavhod_blender_addon"))
@@ -0,0 +1,185 @@
+import hashlib
+
+import pytest
+
+import export_cache
+
+
+class FakeProperty:
+    def __init__(self, identifier, type='FLOAT', is_readonly=False):
+        self.identifier = identifier
+        self.type = type
+        self.is_readonly = is_readonly
+
+
+class FakeRNA:
+    def __init__(self, identifier, properties, base=None):
+        self.identifier = identifier
+        self.properties = properties
+        self.base = base
+
+
+class FakeStruct:
+    def __init__(self, bl_rna, **values):
+        self.bl_rna = bl_rna
+        self.__dict__.update(values)
+
+
+ID_RNA = FakeRNA("ID", [
+    FakeProperty('name', 'STRING'),
+    FakeProperty('name_full', 'STRING', is_readonly=True),
+    FakeProperty('session_uid', 'INT', is_readonly=True),
+    FakeProperty('users', 'INT', is_readonly=True),
+    FakeProperty('use_fake_user', 'BOOLEAN'),
+    FakeProperty('tag', 'BOOLEAN'),
+])
+MATERIAL_RNA = FakeRNA("TestMaterial", ID_RNA.properties + [
+    FakeProperty('roughness'),
+    FakeProperty('blend_method', 'ENUM'),
+    FakeProperty('preview_render_type', 'ENUM'),
+], base=ID_RNA)
+NODE_RNA = FakeRNA("Node", [
+    FakeProperty('width'),
+    FakeProperty('hide', 'BOOLEAN'),
+    FakeProperty('mute', 'BOOLEAN'),
+    FakeProperty('dimensions', is_readonly=True),
+])
+IMAGE_NODE_RNA = FakeRNA("TestNodeTexImage", NODE_RNA.properties + [
+    FakeProperty('interpolation', 'ENUM'),
+    FakeProperty('flags', 'ENUM'),
+], base=FakeRNA("ShaderNode", NODE_RNA.properties, base=NODE_RNA))
+
+
+def digest(struct):
+    h = hashlib.sha256()
+    export_cache._hash_rna(h, struct)
+    return h.hexdigest()
+
+
+def make_material(**values):
+    defaults = dict(
+        name="Mat", name_full="Mat", session_uid=1, users=1, use_fake_user=False, tag=False,
+        roughness=0.5, blend_method='OPAQUE', preview_render_type='SPHERE'
+    )
+    defaults.update(values)
+    return FakeStruct(MATERIAL_RNA, **defaults)
+
+
+def test_content_properties_skip_readonly_base_and_ui():
+    material = [prop.identifier for prop in export_cache._get_content_properties(MATERIAL_RNA)]
+    assert material == ['roughness', 'blend_method']
+    node = [prop.identifier for prop in export_cache._get_content_properties(IMAGE_NODE_RNA)]
+    assert node == ['mute', 'interpolation', 'flags']
+
+
+def test_bookkeeping_does_not_change_the_digest():
+    # What differs between two sessions of the same file, or after a reload
+    assert digest(make_material()) == digest(make_material(session_uid=982, users=3, tag=True, name_full="Mat [lib]"))
+    assert digest(make_material()) != digest(make_material(roughness=0.25))
+
+
+def test_node_layout_does_not_change_the_digest():
+    def node(**values):
+        defaults = dict(width=140.0, hide=False, mute=False, dimensions=(0.0, 0.0), interpolation='Linear', flags={'A'})
+        defaults.update(values)
+        return FakeStruct(IMAGE_NODE_RNA, **defaults)
+    # dimensions is computed when the node editor draws
+    assert digest(node()) == digest(node(width=300.0, hide=True, dimensions=(280.0, 120.0)))
+    assert digest(node()) != digest(node(mute=True))
+    assert digest(node(flags={'A', 'B', 'C'})) == digest(node(flags={'C', 'B', 'A'}))
+
+
+def test_same_file_opened_twice_gives_identical_fingerprints(tmp_path):
+    bpy = pytest.importorskip("bpy")
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_cube_add()
+    obj = bpy.context.active_object
+    obj_name = obj.name
+    obj.modifiers.new("Bevel", 'BEVEL')
+    material = bpy.data.materials.new("Mat")
+    material.use_nodes = True
+    obj.data.materials.append(material)
+    blend_path = str(tmp_path / "level.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=blend_path)
+
+    fingerprints = []
+    for _ in range(2):
+        bpy.ops.wm.open_mainfile(filepath=blend_path)
+        obj = bpy.data.objects[obj_name]
+        path_info = {'is_linked': False, 'blend_filepath': blend_path}
+        fingerprints.append(export_cache.compute_fingerprint(obj, path_info, {}, {'object_ext': ".gltf"}))
+    assert fingerprints[0] == fingerprints[1]
+
+
+def fingerprint(obj):
+    path_info = {'is_linked': False, 'blend_filepath': ""}
+    return export_cache.compute_fingerprint(obj, path_info, {}, {'object_ext': ".gltf"})
+
+
+def test_node_group_edits_change_the_fingerprint():
+    bpy = pytest.importorskip("bpy")
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_cube_add()
+    obj = bpy.context.active_object
+    material = bpy.data.materials.new("Mat")
+    material.use_nodes = True
+    obj.data.materials.append(material)
+    group = bpy.data.node_groups.new("Group", 'ShaderNodeTree')
+    math_node = group.nodes.new('ShaderNodeMath')
+    material.node_tree.nodes.new('ShaderNodeGroup').node_tree = group
+    before = fingerprint(obj)
+    assert fingerprint(obj) == before
+    math_node.inputs[1].default_value = 3.0
+    assert fingerprint(obj) != before
+
+
+def test_geometry_nodes_edits_change_the_fingerprint():
+    bpy = pytest.importorskip("bpy")
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_cube_add()
+    obj = bpy.context.active_object
+    group = bpy.data.node_groups.new("Geometry", 'GeometryNodeTree')
+    group.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    group.interface.new_socket("Offset", in_out='INPUT', socket_type='NodeSocketFloat')
+    group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    set_position = group.nodes.new('GeometryNodeSetPosition')
+    modifier = obj.modifiers.new("GeometryNodes", 'NODES')
+    modifier.node_group = group
+    before = fingerprint(obj)
+    # An input value of the modifier, stored as an ID property
+    socket_id = next(item.identifier for item in group.interface.items_tree if item.name == "Offset")
+    modifier[socket_id] = 2.5
+    after_input = fingerprint(obj)
+    assert after_input != before
+    # A node inside the group
+    set_position.inputs['Offset'].default_value = (0.0, 0.0, 1.0)
+    assert fingerprint(obj) != after_input
+
+
+def test_modifier_object_edits_change_the_fingerprint():
+    bpy = pytest.importorskip("bpy")
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_cube_add()
+    obj = bpy.context.active_object
+    bpy.ops.mesh.primitive_cube_add(location=(1.0, 0.0, 0.0))
+    cutter = bpy.context.active_object
+    boolean = obj.modifiers.new("Boolean", 'BOOLEAN')
+    boolean.object = cutter
+    before = fingerprint(obj)
+    cutter.location.x = 0.5
+    bpy.context.view_layer.update()
+    moved = fingerprint(obj)
+    assert moved != before
+    cutter.data.vertices[0].co.z += 0.25
+    assert fingerprint(obj) != moved
+
+
+def test_unhashed_modifier_objects_are_not_cached():
+    bpy = pytest.importorskip("bpy")
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_cube_add()
+    obj = bpy.context.active_object
+    bpy.ops.curve.primitive_bezier_curve_add()
+    obj.modifiers.new("Curve", 'CURVE').object = bpy.context.active_object
+    assert fingerprint(obj) is None
+    assert not export_cache.ExportCache("/nonexistent").is_fresh("/nonexistent/a.gltf", None)
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from export_core import PathMapper, PathResolver
+
+
+def make_mapper(tmp_path, pairs):
+    scene_dir = tmp_path / "level"
+    scene_dir.mkdir(exist_ok=True)
+    path_pairs = [{'source_path': str(source), 'dest_path': dest} for source, dest in pairs]
+    return PathMapper(path_pairs, str(scene_dir)), scene_dir
+
+
+def expected(scene_dir, *parts):
+    return os.path.realpath(os.path.join(str(scene_dir), *parts))
+
+
+def test_maps_relative_to_pair_source(tmp_path):
+    lib = tmp_path / "lib"
+    mapper, scene_dir = make_mapper(tmp_path, [(lib, "model")])
+    assert mapper.map(str(lib / "house" / "house.gltf")) == expected(scene_dir, "model", "house", "house.gltf")
+
+
+def test_nested_pairs_use_longest_prefix(tmp_path):
+    lib = tmp_path / "lib"
+    # The outer pair comes first: the match must not depend on the pair order
+    mapper, scene_dir = make_mapper(tmp_path, [(lib / "a", "outer"), (lib / "a" / "b", "inner")])
+    assert mapper.map(str(lib / "a" / "b" / "x.gltf")) == expected(scene_dir, "inner", "x.gltf")
+    assert mapper.map(str(lib / "a" / "c" / "x.gltf")) == expected(scene_dir, "outer", "c", "x.gltf")
+
+
+def test_sibling_prefix_does_not_match(tmp_path):
+    lib = tmp_path / "lib"
+    mapper, _ = make_mapper(tmp_path, [(lib / "a", "model")])
+    assert mapper.map(str(lib / "ab" / "x.gltf")) is None
+
+
+def test_unmatched_path(tmp_path):
+    mapper, _ = make_mapper(tmp_path, [(tmp_path / "lib", "model")])
+    assert mapper.map(str(tmp_path / "other" / "x.gltf")) is None
+    # Memoized misses stay misses
+    assert mapper.map(str(tmp_path / "other" / "x.gltf")) is None
+
+
+def test_duplicate_source_first_pair_wins(tmp_path):
+    lib = tmp_path / "lib"
+    mapper, scene_dir = make_mapper(tmp_path, [(lib, "first"), (lib, "second")])
+    assert mapper.map(str(lib / "x.gltf")) == expected(scene_dir, "first", "x.gltf")
+
+
+def test_symlinked_source(tmp_path):
+    real_lib = tmp_path / "real_lib"
+    real_lib.mkdir()
+    link = tmp_path / "lib"
+    try:
+        os.symlink(real_lib, link, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks are not available")
+    mapper, scene_dir = make_mapper(tmp_path, [(link, "model")])
+    # Library paths are looked up symlink-resolved as well as as given
+    assert mapper.map(str(real_lib / "x.gltf")) == expected(scene_dir, "model", "x.gltf")
+    assert mapper.map(str(link / "x.gltf")) == expected(scene_dir, "model", "x.gltf")
+
+
+def test_resolver_matches_os_path(tmp_path):
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    link = tmp_path / "link"
+    try:
+        os.symlink(real_dir, link, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks are not available")
+    resolver = PathResolver()
+    target = str(link / "model" / "x.gltf")
+    base = str(tmp_path / "level")
+    assert resolver.realpath(target) == os.path.realpath(target)
+    assert resolver.relpath(target, base) == os.path.relpath(os.path.realpath(target), os.path.realpath(base))
+
+
+def test_resolver_memoizes(tmp_path):
+    resolver = PathResolver()
+    target = str(tmp_path / "model" / "x.gltf")
+    base = str(tmp_path / "level")
+    first = resolver.relpath(target, base)
+    misses = resolver.misses
+    assert resolver.relpath(target, base) == first
+    assert resolver.misses == misses
+    assert resolver.hits == 1
@@ -0,0 +1,191 @@
+import json
+import random
+
+import numpy as np
+
+from export_core import read_glb, write_glb
+from export_geometry import (
+    read_accessor, weld_vertices, get_acmr, optimize_gltf_data, optimize_gltf_file,
+)
+
+GRID = 8 # quads per side
+ORIGIN = np.array([10.0, -2.0, 4.0])
+
+
+def make_triangles(seed=1):
+    """Triangles of a GRID x GRID quad grid as position triples, in shuffled order"""
+    triangles = []
+    for i in range(GRID):
+        for j in range(GRID):
+            a, b, c, d = ((i + di, j + dj) for di, dj in ((0, 0), (1, 0), (1, 1), (0, 1)))
+            triangles += [(a, b, c), (a, c, d)]
+    random.Random(seed).shuffle(triangles)
+    return [[ORIGIN + (x, 0.5 * (x + y), y) for x, y in triangle] for triangle in triangles]
+
+
+def make_gltf(seed=1):
+    """
+    Unwelded glTF: every triangle has its own 3 vertices (POSITION, NORMAL, TEXCOORD_0),
+    plus an accessor and a bufferView that nothing uses. Returns (gltf_data, binary).
+    """
+    triangles = make_triangles(seed)
+    positions = np.array([vertex for triangle in triangles for vertex in triangle], np.float32)
+    normals = np.tile(np.array([[0.0, 1.0, 0.0]], np.float32), (len(positions), 1))
+    uvs = ((positions[:, [0, 2]] - ORIGIN[[0, 2]]) / GRID).astype(np.float32)
+    # Reversed indices so the buffer does not simply follow the vertex order
+    indices = np.arange(len(positions), dtype=np.uint16).reshape(-1, 3)[::-1].ravel()
+    unused = np.arange(5, dtype=np.float32)
+    binary = bytearray()
+    views = []
+    accessors = []
+    for values, accessor_type, component, target in (
+        (positions, 'VEC3', 5126, 34962), (normals, 'VEC3', 5126, 34962), (uvs, 'VEC2', 5126, 34962),
+        (unused, 'SCALAR', 5126, None), (indices, 'SCALAR', 5123, 34963),
+    ):
+        # A 2-byte gap keeps the original views unaligned
+        binary += b'\0\0'
+        view = {'buffer': 0, 'byteOffset': len(binary), 'byteLength': values.nbytes}
+        if target: view['target'] = target
+        binary += values.tobytes()
+        views.append(view)
+        accessors.append({'bufferView': len(views) - 1, 'componentType': component, 'count': len(values), 'type': accessor_type})
+    gltf_data = {
+        'asset': {'version': "2.0"},
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'name': "Grid", 'mesh': 0}],
+        'meshes': [{'primitives': [{'attributes': {'POSITION': 0, 'NORMAL': 1, 'TEXCOORD_0': 2}, 'indices': 4}]}],
+        'accessors': accessors,
+        'bufferViews': views,
+        'buffers': [{'byteLength': len(binary)}],
+    }
+    return gltf_data, bytes(binary)
+
+
+def read_attribute(gltf_data, binary, name):
+    accessor = gltf_data['meshes'][0]['primitives'][0]['attributes'][name]
+    values = read_accessor(gltf_data, binary, accessor).astype(np.float64)
+    if gltf_data['accessors'][accessor].get('normalized'):
+        values = np.maximum(values / 32767.0, -1.0)
+    return values
+
+
+def read_indices(gltf_data, binary):
+    return read_accessor(gltf_data, binary, gltf_data['meshes'][0]['primitives'][0]['indices'])[:, 0]
+
+
+def triangle_set(positions, indices, decimals=3):
+    """Triangles as position tuples, rotated to start at their smallest vertex (winding kept)"""
+    result = set()
+    for triangle in indices.reshape(-1, 3):
+        corners = [tuple(np.round(positions[i], decimals)) for i in triangle]
+        start = corners.index(min(corners))
+        result.add(tuple(corners[start:] + corners[:start]))
+    return result
+
+
+def world_positions(gltf_data, binary):
+    positions = read_attribute(gltf_data, binary, 'POSITION')
+    node = gltf_data['nodes'][0]
+    return positions * node.get('scale', [1.0, 1.0, 1.0]) + node.get('translation', [0.0, 0.0, 0.0])
+
+
+def test_preserves_triangles_and_welds_vertices():
+    gltf_data, binary = make_gltf()
+    expected = triangle_set(read_attribute(gltf_data, binary, 'POSITION'), read_indices(gltf_data, binary))
+    new_binary, vertices_before, vertices_after = optimize_gltf_data(gltf_data, binary)
+    assert vertices_before == GRID * GRID * 6
+    assert vertices_after == (GRID + 1) ** 2
+    positions = read_attribute(gltf_data, new_binary, 'POSITION')
+    assert len(positions) == (GRID + 1) ** 2
+    assert len(np.unique(positions, axis=0)) == len(positions)
+    indices = read_indices(gltf_data, new_binary)
+    assert len(indices) == GRID * GRID * 6
+    assert triangle_set(positions, indices) == expected
+
+
+def test_acmr_does_not_increase():
+    gltf_data, binary = make_gltf()
+    primitive = gltf_data['meshes'][0]['primitives'][0]
+    attributes = {
+        name: (read_accessor(gltf_data, binary, index), False) for name, index in primitive['attributes'].items()
+    }
+    # Baseline: the same welded vertices in the input triangle order
+    _, welded_indices = weld_vertices(attributes, read_indices(gltf_data, binary).astype(np.uint32))
+    new_binary, _, _ = optimize_gltf_data(gltf_data, binary)
+    assert get_acmr(read_indices(gltf_data, new_binary)) <= get_acmr(welded_indices)
+
+
+def test_quantized_positions_dequantize_through_the_node_transform():
+    gltf_data, binary = make_gltf()
+    expected = read_attribute(gltf_data, binary, 'POSITION')
+    expected_triangles = triangle_set(expected, read_indices(gltf_data, binary), 2)
+    new_binary, _, _ = optimize_gltf_data(gltf_data, binary, quantize=True)
+    assert 'KHR_mesh_quantization' in gltf_data['extensionsUsed']
+    assert 'KHR_mesh_quantization' in gltf_data['extensionsRequired']
+    position_accessor = gltf_data['accessors'][gltf_data['meshes'][0]['primitives'][0]['attributes']['POSITION']]
+    assert position_accessor['componentType'] == 5122 and position_accessor['normalized']
+    positions = world_positions(gltf_data, new_binary)
+    extent = gltf_data['nodes'][0]['scale'][0]
+    tolerance = extent / 32767 + 1e-6
+    # Every dequantized vertex lies on an original one
+    distances = np.abs(positions[:, None, :] - expected[None, :, :]).max(axis=2).min(axis=1)
+    assert distances.max() <= tolerance
+    assert triangle_set(positions, read_indices(gltf_data, new_binary), 2) == expected_triangles
+
+
+def test_drops_unused_accessors_and_aligns_views():
+    gltf_data, binary = make_gltf()
+    new_binary, _, _ = optimize_gltf_data(gltf_data, binary)
+    primitive = gltf_data['meshes'][0]['primitives'][0]
+    used = set(primitive['attributes'].values()) | {primitive['indices']}
+    assert used == set(range(len(gltf_data['accessors'])))
+    assert {accessor['bufferView'] for accessor in gltf_data['accessors']} == set(range(len(gltf_data['bufferViews'])))
+    for view in gltf_data['bufferViews']:
+        assert view['byteOffset'] % 4 == 0
+        assert view.get('byteStride', 4) % 4 == 0
+        assert view['byteOffset'] + view['byteLength'] <= len(new_binary)
+    assert gltf_data['buffers'][0]['byteLength'] == len(new_binary)
+    assert len(new_binary) % 4 == 0
+
+
+def test_optimize_gltf_file_with_bin(tmp_path):
+    gltf_data, binary = make_gltf()
+    gltf_data['buffers'][0]['uri'] = "grid.bin"
+    (tmp_path / "grid.bin").write_bytes(binary)
+    path = tmp_path / "grid.gltf"
+    path.write_text(json.dumps(gltf_data), encoding='utf-8')
+    report = optimize_gltf_file(str(path))
+    assert report['vertices_before'] == GRID * GRID * 6
+    assert report['vertices_after'] == (GRID + 1) ** 2
+    assert report['after'] < report['before']
+    written = json.loads(path.read_text(encoding='utf-8'))
+    new_binary = (tmp_path / "grid.bin").read_bytes()
+    assert written['buffers'][0] == {'byteLength': len(new_binary), 'uri': "grid.bin"}
+    assert len(read_attribute(written, new_binary, 'POSITION')) == (GRID + 1) ** 2
+    assert not (tmp_path / "grid.bin.tmp").exists()
+    # Nothing left to weld: the second pass still rewrites, without losing triangles
+    expected = triangle_set(read_attribute(written, new_binary, 'POSITION'), read_indices(written, new_binary))
+    optimize_gltf_file(str(path))
+    written = json.loads(path.read_text(encoding='utf-8'))
+    new_binary = (tmp_path / "grid.bin").read_bytes()
+    assert triangle_set(read_attribute(written, new_binary, 'POSITION'), read_indices(written, new_binary)) == expected
+
+
+def test_optimize_gltf_file_glb(tmp_path):
+    gltf_data, binary = make_gltf()
+    expected = triangle_set(read_attribute(gltf_data, binary, 'POSITION'), read_indices(gltf_data, binary), 2)
+    path = tmp_path / "grid.glb"
+    write_glb(str(path), gltf_data, binary)
+    report = optimize_gltf_file(str(path), quantize=True)
+    assert report['after'] < report['before']
+    written, new_binary = read_glb(str(path))
+    assert 'uri' not in written['buffers'][0]
+    assert 'KHR_mesh_quantization' in written['extensionsRequired']
+    positions = world_positions(written, new_binary)
+    assert triangle_set(positions, read_indices(written, new_binary), 2) == expected
+
+
+def test_quantized_files_are_left_alone():
+    gltf_data, binary = make_gltf()
+    gltf_data['extensionsUsed'] = ['KHR_mesh_quantization']
+    assert optimize_gltf_data(gltf_data, binary) is None
@@ -0,0 +1,97 @@
+import struct
+from array import array
+
+import pytest
+
+from godot_variant import PackedStringArray, SceneDbinWriter, bytes_to_var, var_to_bytes
+
+# Golden encodings (hex, little-endian), as produced by Godot 4's var_to_bytes()
+GOLDEN = [
+    (None, "00000000"),
+    (True, "01000000" "01000000"),
+    (1, "02000000" "01000000"),
+    (-2, "02000000" "feffffff"),
+    # Outside int32: the 64-bit flag (1 << 16) is set in the header
+    (2 ** 40, "02000100" "0000000000010000"),
+    (0.5, "03000000" "0000003f"),
+    # Not exact in float32: encoded as a double
+    (0.1, "03000100" "9a9999999999b93f"),
+    ("abc", "04000000" "03000000" "61626300"),
+    ("abcd", "04000000" "04000000" "61626364"),
+    ("", "04000000" "00000000"),
+    ({"a": 1}, "1b000000" "01000000" "04000000" "01000000" "61000000" "02000000" "01000000"),
+    ([True, None], "1c000000" "02000000" "01000000" "01000000" "00000000"),
+    # Entries are NUL-terminated and the NUL counts towards the length
+    (PackedStringArray(["ab"]), "22000000" "01000000" "03000000" "61620000"),
+    (PackedStringArray(["abc", ""]), "22000000" "02000000" "04000000" "61626300" "01000000" "00000000"),
+    (array('f', [1.0, -2.0]), "20000000" "02000000" "0000803f" "000000c0"),
+    (array('i', [7]), "1e000000" "01000000" "07000000"),
+    (b"\x01\x02\x03", "1d000000" "03000000" "01020300"),
+]
+
+
+@pytest.mark.parametrize("value, expected", GOLDEN)
+def test_golden_bytes(value, expected):
+    assert var_to_bytes(value).hex() == expected
+
+
+@pytest.mark.parametrize("value, expected", GOLDEN)
+def test_round_trip(value, expected):
+    decoded = bytes_to_var(bytes.fromhex(expected))
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+def test_nested_round_trip():
+    value = {
+        "name": "Crate",
+        "transform": array('f', [1.0, 0.0, 0.0, 2.5]),
+        "tags": PackedStringArray(["prop", "wood"]),
+        "children": [{"id": 3, "scale": 0.1}, None],
+    }
+    assert bytes_to_var(var_to_bytes(value)) == value
+
+
+def test_scene_dbin_writer_section_counts(tmp_path):
+    path = str(tmp_path / "level.dbin")
+    writer = SceneDbinWriter(path)
+    writer.write_instance({"asset": "a.gltf"})
+    writer.write_instance({"asset": "b.gltf"})
+    writer.commit({"lods": {"a.gltf": 2}, "metadata": {"level": 1}})
+    with open(path, 'rb') as f:
+        data = f.read()
+    # Dictionary header, then 3 sections: instances + the 2 committed ones
+    assert struct.unpack_from('<II', data, 0) == (27, 3)
+    instances_key = var_to_bytes("instances")
+    assert data[8:8 + len(instances_key)] == instances_key
+    # Array header of the instances, with the count patched in on commit
+    assert struct.unpack_from('<II', data, 8 + len(instances_key)) == (28, 2)
+    assert bytes_to_var(data) == {
+        "instances": [{"asset": "a.gltf"}, {"asset": "b.gltf"}],
+        "lods": {"a.gltf": 2},
+        "metadata": {"level": 1},
+    }
+    assert not (tmp_path / "level.dbin.tmp").exists()
+
+
+def test_scene_dbin_writer_abort_keeps_previous_file(tmp_path):
+    path = tmp_path / "level.dbin"
+    path.write_bytes(b"previous")
+    writer = SceneDbinWriter(str(path))
+    writer.write_instance({"asset": "a.gltf"})
+    writer.abort()
+    assert path.read_bytes() == b"previous"
+    assert not (tmp_path / "level.dbin.tmp").exists()
+
+
+def test_scene_dbin_writer_deferred_publish(tmp_path):
+    path = tmp_path / "cell.dbin"
+    path.write_bytes(b"previous")
+    writer = SceneDbinWriter(str(path))
+    writer.write_instance({"asset": "a.gltf"})
+    writer.commit(publish=False)
+    # The finished cell stays under its temporary name until publish()
+    assert path.read_bytes() == b"previous"
+    writer.publish()
+    assert bytes_to_var(path.read_bytes()) == {"instances": [{"asset": "a.gltf"}]}
+    assert not (tmp_path / "cell.dbin.tmp").exists()
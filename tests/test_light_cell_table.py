@@ -0,0 +1,43 @@
+import math
+
+import pytest
+
+pytest.importorskip("bpy")
+from export_utils import get_light_range, get_light_bounding_sphere, build_light_cell_table
+
+
+def spot_light(energy, spot_size, threshold):
+    position = (0.0, 0.0, 0.0)
+    light_range = get_light_range(energy, (1.0, 1.0, 1.0), threshold)
+    center, radius = get_light_bounding_sphere(position, (1.0, 0.0, 0.0), light_range, spot_size)
+    return {"position": position, "range": light_range, "center": center, "radius": radius, "intensity": energy}
+
+
+def cell_lights(table, cell):
+    cells = table["cells"]
+    for i in range(0, len(cells), 4):
+        if (cells[i], cells[i + 1]) == cell:
+            start, count = cells[i + 2], cells[i + 3]
+            return list(table["indices"][start:start + count])
+    return None
+
+
+def test_spot_importance_uses_light_range():
+    # 1000 W, 20 degree spot: range ~39.9, but the sphere around its cone only has radius ~20.6
+    spot = spot_light(1000.0, math.radians(20.0), 0.05)
+    assert spot["range"] == pytest.approx(39.9, abs=0.1)
+    assert spot["radius"] == pytest.approx(20.6, abs=0.1)
+    # A faint point light inside the cell x 30..35, 30 m from the spot
+    point = {"position": (32.5, 0.0, 2.5), "range": 1.0, "center": (32.5, 0.0, 2.5), "radius": 1.0, "intensity": 0.1}
+    table, dropped = build_light_cell_table(["spot", "point"], [spot, point], 5.0, 1)
+    # The spot still lights that cell, so it outranks the faint light
+    assert cell_lights(table, (6, 0)) == [0]
+    assert dropped == 1
+
+
+def test_sun_lights_are_global():
+    spot = spot_light(1000.0, math.radians(20.0), 0.05)
+    table, dropped = build_light_cell_table(["sun", "spot"], [None, spot], 5.0, 4)
+    assert list(table["global"]) == [0]
+    assert all(index == 1 for index in table["indices"])
+    assert dropped == 0
@@ -0,0 +1,64 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+bpy = pytest.importorskip("bpy")
+import mathutils
+import export_utils
+
+
+def random_matrix(rng, negative_scale=False):
+    loc = mathutils.Vector([rng.uniform(-100, 100) for _ in range(3)])
+    rot = mathutils.Euler([rng.uniform(-math.pi, math.pi) for _ in range(3)]).to_quaternion()
+    scale = mathutils.Vector([rng.uniform(0.1, 5.0) for _ in range(3)])
+    if negative_scale:
+        # One or three mirrored axes give a negative determinant
+        for axis in rng.sample(range(3), rng.choice((1, 3))):
+            scale[axis] = -scale[axis]
+    return mathutils.Matrix.LocRotScale(loc, rot, scale)
+
+
+def per_object(matrix):
+    loc, quat, scale = export_utils.convert_zup_to_yup(*matrix.decompose())
+    return np.array(loc), np.array(quat), np.array(scale)
+
+
+def assert_same_transform(batch, single):
+    loc, quat, scale = batch
+    ref_loc, ref_quat, ref_scale = single
+    np.testing.assert_allclose(loc, ref_loc, rtol=1e-5, atol=1e-4)
+    np.testing.assert_allclose(scale, ref_scale, rtol=1e-5, atol=1e-5)
+    # q and -q are the same rotation
+    assert abs(np.dot(quat, ref_quat)) == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.parametrize("negative_scale", [False, True])
+def test_decompose_matches_convert_zup_to_yup(negative_scale):
+    rng = random.Random(14)
+    matrices = [random_matrix(rng, negative_scale) for _ in range(500)]
+    array = np.array([[list(row) for row in matrix] for matrix in matrices])
+    loc, quat, scale = export_utils.decompose_matrices(export_utils.world_matrices_to_yup(array))
+    for i, matrix in enumerate(matrices):
+        assert_same_transform((loc[i], quat[i], scale[i]), per_object(matrix))
+
+
+def test_batch_convert_matches_per_object():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    rng = random.Random(7)
+    objects = []
+    for i in range(200):
+        obj = bpy.data.objects.new(f"Empty{i}", None)
+        bpy.context.scene.collection.objects.link(obj)
+        obj.matrix_world = random_matrix(rng, negative_scale=(i % 3 == 0))
+        objects.append(obj)
+    bpy.context.view_layer.update()
+    # Picked by session_uid in any order, not only the file order
+    rng.shuffle(objects)
+    matrices, loc, quat, scale = export_utils.batch_convert_zup_to_yup(objects)
+    assert matrices.shape == (len(objects), 4, 4)
+    for i, obj in enumerate(objects):
+        assert_same_transform((loc[i], quat[i], scale[i]), per_object(obj.matrix_world))
+    records = export_utils.transform_records(loc, quat, scale)
+    assert set(records[0]) == {"location", "rotation", "scale"}